@@ -0,0 +1,76 @@
+# Compare startup time and throughput of the local_dask and local_pool dispatchers
+# The throughput workflow is shaped like a modelsearch run: a fan out of CPU bound
+# model transformations followed by a reduction.
+# Usage: python benchmark_dispatchers.py [number of candidates]
+
+import sys
+import time
+import warnings
+
+from pharmpy.internals.fs.cwd import chdir
+from pharmpy.internals.fs.tmp import TemporaryDirectory
+from pharmpy.workflows import (
+    NullToolDatabase,
+    Task,
+    Workflow,
+    WorkflowBuilder,
+    execute_workflow,
+    local_dask,
+    local_pool,
+)
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+
+
+def start():
+    from pharmpy.modeling import load_example_model
+
+    return load_example_model('pheno')
+
+
+def transform(i, model):
+    from pharmpy.modeling import (
+        add_peripheral_compartment,
+        convert_model,
+        set_first_order_absorption,
+        set_name,
+    )
+
+    model = set_name(model, f'candidate{i}')
+    if i % 2:
+        model = set_first_order_absorption(model)
+    for _ in range(i % 3):
+        model = add_peripheral_compartment(model)
+    return len(convert_model(model, 'nonmem').model_code)
+
+
+def collect(*sizes):
+    return sum(sizes)
+
+
+def trivial_workflow():
+    wb = WorkflowBuilder(tasks=[Task('results', lambda: None)], name='trivial')
+    return Workflow(wb)
+
+
+def modelsearch_like_workflow():
+    wb = WorkflowBuilder(name='modelsearch-like')
+    start_task = Task('start', start)
+    wb.add_task(start_task)
+    candidates = [Task(f'candidate{i}', transform, i) for i in range(n)]
+    for task in candidates:
+        wb.add_task(task, predecessors=start_task)
+    wb.add_task(Task('results', collect), predecessors=candidates)
+    return Workflow(wb)
+
+
+warnings.filterwarnings('ignore')
+with TemporaryDirectory() as path, chdir(path):
+    for name, dispatcher in [('local_dask', local_dask), ('local_pool', local_pool)]:
+        for wfname, create in [
+            ('startup', trivial_workflow),
+            (f'{n} candidates', modelsearch_like_workflow),
+        ]:
+            t0 = time.perf_counter()
+            execute_workflow(create(), dispatcher=dispatcher, database=NullToolDatabase(wfname))
+            print(f'{name:12} {wfname:15} {time.perf_counter() - t0:.2f}s')
@@ -0,0 +1,55 @@
+# Time expand_additional_doses on pheno with a synthetic dataset of repeated dosing
+# Usage: python benchmark_expand_additional_doses.py [number of subjects]
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from pharmpy.model import ColumnInfo
+from pharmpy.modeling import expand_additional_doses, load_example_model
+
+nsubjects = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+model = load_example_model('pheno')
+rng = np.random.default_rng(1234)
+
+# NOTE Each subject has one dose record with additional doses, a second dose record
+# and four observations placed in between the doses
+nrecords = 6
+ids = np.repeat(np.arange(1, nsubjects + 1), nrecords)
+time_ = np.tile([0.0, 6.0, 30.0, 48.0, 60.0, 90.0], nsubjects)
+amt = np.tile([25.0, 0.0, 0.0, 15.0, 0.0, 0.0], nsubjects)
+addl = np.tile([3.0, 0.0, 0.0, 2.0, 0.0, 0.0], nsubjects)
+ii = np.tile([12.0, 0.0, 0.0, 24.0, 0.0, 0.0], nsubjects)
+n = len(ids)
+df = pd.DataFrame(
+    {
+        'ID': ids,
+        'TIME': time_,
+        'AMT': amt,
+        'WGT': np.repeat(np.round(rng.uniform(0.5, 4, nsubjects), 1), nrecords),
+        'APGR': np.repeat(rng.integers(1, 11, nsubjects).astype(float), nrecords),
+        'DV': np.where(amt > 0, 0.0, np.round(rng.lognormal(3, 0.3, n), 1)),
+        'FA1': np.ones(n),
+        'FA2': np.ones(n),
+        'ADDL': addl,
+        'II': ii,
+    }
+)
+di = (
+    model.datainfo
+    + ColumnInfo.create('ADDL', type='additional')
+    + ColumnInfo.create('II', type='ii')
+)
+model = model.replace(dataset=df, datainfo=di)
+
+for flag in (False, True):
+    start = time.perf_counter()
+    expanded = expand_additional_doses(model, flag=flag)
+    elapsed = time.perf_counter() - start
+    print(
+        f'flag={flag!s:5} {nsubjects} subjects, {len(df)} -> {len(expanded.dataset)} records: '
+        f'{elapsed:.2f}s'
+    )
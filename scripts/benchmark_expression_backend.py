@@ -0,0 +1,63 @@
+# Compare the sympy and symengine backends of full_expression and gradients
+# on pheno_linear with its statements scaled up by a chain of new statements
+# Usage: python benchmark_expression_backend.py [number of added statements]
+
+import sys
+import time
+
+import sympy
+
+from pharmpy.internals.expr.backend import diff, substitute_assignments
+from pharmpy.internals.expr.subs import subs
+from pharmpy.model import Assignment
+from pharmpy.modeling import get_individual_prediction_expression, load_example_model
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+model = load_example_model('pheno_linear')
+ipred = get_individual_prediction_expression(model)
+etas = [sympy.Symbol(name) for name in model.random_variables.etas.names]
+
+# NOTE Each added statement refers to the previous two so the full expression
+# grows with n
+x = [sympy.Symbol(f'X{i}') for i in range(n)]
+chain = [Assignment(x[0], ipred), Assignment(x[1], ipred * 2)]
+for i in range(2, n):
+    chain.append(
+        Assignment(x[i], x[i - 1] + sympy.Rational(1, i) * x[i - 2] * sympy.exp(etas[i % 2]))
+    )
+assignments = [(s.symbol, s.expression) for s in chain]
+expression = x[-1] + x[n // 2]
+
+
+def sympy_full_expression():
+    expr = expression
+    for symbol, value in reversed(assignments):
+        expr = subs(expr, {symbol: value}, simultaneous=True)
+    return expr
+
+
+def symengine_full_expression():
+    return substitute_assignments(expression, assignments)
+
+
+full = symengine_full_expression()
+
+
+def sympy_gradient():
+    return [full.diff(eta) for eta in etas]
+
+
+def symengine_gradient():
+    return diff(full, etas)
+
+
+for name, func in [
+    ('sympy full_expression', sympy_full_expression),
+    ('symengine full_expression', symengine_full_expression),
+    ('sympy gradient', sympy_gradient),
+    ('symengine gradient', symengine_gradient),
+]:
+    start = time.perf_counter()
+    func()
+    print(f'{name:27} {n} statements: {time.perf_counter() - start:.2f}s')
@@ -0,0 +1,57 @@
+# Compare the C engine fast path of read_nonmem_dataset with the python engine path
+# Usage: python benchmark_read_nonmem_dataset.py [number of rows]
+
+import sys
+import time
+from io import StringIO
+
+import numpy as np
+
+from pharmpy.model.external.nonmem.dataset import (
+    NMTRANDataIO,
+    _convert_data_item,
+    _read_table,
+    _read_table_python,
+    read_nonmem_dataset,
+)
+
+nrows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+colnames = ['ID', 'TIME', 'AMT', 'WGT', 'APGR', 'DV', 'MDV', 'EVID']
+
+rng = np.random.default_rng(1234)
+ids = np.repeat(np.arange(1, nrows // 20 + 2), 20)[:nrows]
+time_ = np.tile(np.arange(20) * 1.5, nrows // 20 + 1)[:nrows]
+amt = np.where(time_ == 0, 100, 0)
+wgt = np.round(rng.uniform(40, 120, nrows), 1)
+apgr = rng.integers(1, 11, nrows)
+dv = np.round(rng.lognormal(1, 0.5, nrows), 4)
+mdv = (amt > 0).astype(int)
+lines = [','.join(map(str, row)) for row in zip(ids, time_, amt, wgt, apgr, dv, mdv, mdv)]
+contents = '#' + ','.join(colnames) + '\n' + '\n'.join(lines) + '\n'
+
+
+def old_path():
+    df = _read_table_python(NMTRANDataIO(StringIO(contents)))
+    df.columns = colnames
+    for column in colnames:
+        df[column] = df[column].apply(_convert_data_item, args=('0',))
+    return df
+
+
+def new_path():
+    df = read_nonmem_dataset(StringIO(contents), colnames=colnames)
+    return df
+
+
+def tokenize_only():
+    return _read_table(NMTRANDataIO(StringIO(contents)))
+
+
+for name, func in [
+    ('python engine', old_path),
+    ('fast path', new_path),
+    ('tokenize', tokenize_only),
+]:
+    start = time.perf_counter()
+    func()
+    print(f'{name:15} {nrows} rows: {time.perf_counter() - start:.2f}s')
@@ -0,0 +1,39 @@
+# Measure the cold startup time of importing pharmpy.modeling and reading a model
+# Each measurement is run in a fresh interpreter. The first run of each round uses an
+# empty grammar cache and the following runs use the cache populated by the first.
+# Usage: python benchmark_startup.py [number of rounds]
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+model_path = Path(__file__).resolve().parent.parent / 'tests' / 'testdata' / 'nonmem' / 'pheno.mod'
+
+code = f'''
+import time
+t0 = time.perf_counter()
+from pharmpy.modeling import read_model
+t1 = time.perf_counter()
+read_model({str(model_path)!r})
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1)
+'''
+
+
+def measure(cache_home):
+    # NOTE The user cache directory is taken from XDG_CACHE_HOME on Linux
+    env = dict(os.environ, XDG_CACHE_HOME=cache_home)
+    out = subprocess.run(
+        [sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return tuple(float(x) for x in out.split())
+
+
+for i in range(rounds):
+    with tempfile.TemporaryDirectory() as cache_home:
+        for name in ('empty cache', 'warm cache'):
+            t_import, t_read = measure(cache_home)
+            print(f'{name:12} import {t_import:.2f}s read_model {t_read:.2f}s')
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import weakref
 from hashlib import sha256
-from typing import Iterator, Union
+from typing import Dict, Iterator, Optional, Tuple, Union
 
 from pharmpy.deps import pandas as pd
 
@@ -20,12 +21,63 @@ def _df_hash_values(df: pd.DataFrame) -> Iterator[pd.Series]:
     yield _pd_hash_values(df)
 
 
-def hash_df_runtime(df: pd.DataFrame) -> int:
-    return hash(tuple(map(lambda series: tuple(series.values), _df_hash_values(df))))
-
-
 def hash_df_fs(df: pd.DataFrame) -> str:
     h = sha256()
     for series in _df_hash_values(df):
         h.update(series.to_numpy())
     return h.hexdigest()
+
+
+_hash_df_fs_memo: Dict[int, Tuple[weakref.ref, str]] = {}
+
+
+def _memoized_hash_df_fs(df: pd.DataFrame) -> Optional[str]:
+    entry = _hash_df_fs_memo.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    return None
+
+
+def hash_df_fs_memoized(df: pd.DataFrame) -> str:
+    """Same as hash_df_fs but the hash is remembered for each DataFrame object
+
+    Only use this for DataFrames that are never modified in place, such as
+    model datasets.
+    """
+    h = _memoized_hash_df_fs(df)
+    if h is not None:
+        return h
+
+    key = id(df)
+    h = hash_df_fs(df)
+    ref = weakref.ref(df, lambda _: _hash_df_fs_memo.pop(key, None))
+    _hash_df_fs_memo[key] = (ref, h)
+    return h
+
+
+def hash_df_runtime(df: pd.DataFrame) -> int:
+    """Runtime hash of a DataFrame derived from its memoized sha256 hash
+
+    Same restrictions as for hash_df_fs_memoized apply.
+    """
+    return int(hash_df_fs_memoized(df)[:16], 16)
+
+
+def df_equals(df1: pd.DataFrame, df2: pd.DataFrame) -> bool:
+    """Check if two DataFrames have the same content
+
+    Identical objects and DataFrames of different shapes are handled without
+    comparing contents. DataFrames that both already have a memoized hash are
+    rejected if the hashes differ. The contents are always compared before
+    returning True so that a DataFrame modified in place after having been
+    hashed is never considered equal to one it no longer equals.
+    """
+    if df1 is df2:
+        return True
+    if df1.shape != df2.shape:
+        return False
+    h1 = _memoized_hash_df_fs(df1)
+    h2 = _memoized_hash_df_fs(df2)
+    if h1 is not None and h2 is not None and h1 != h2:
+        return False
+    return df1.equals(df2)
@@ -0,0 +1,74 @@
+"""Symengine backend for hot expression manipulation paths
+
+Expressions are converted to symengine at the boundary, manipulated there,
+and converted back to sympy. Symbols with assumptions are restored after the
+conversion back since symengine does not keep assumptions. If symengine
+cannot represent an expression the sympy implementation is used instead.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from pharmpy.deps import symengine, sympy
+
+from .subs import subs
+
+
+def substitute_assignments(
+    expression: sympy.Expr, assignments: Sequence[Tuple[sympy.Symbol, sympy.Expr]]
+) -> sympy.Expr:
+    """Substitute a sequence of assignments into an expression
+
+    The assignments are substituted last to first, so that the result is the
+    expression expressed in terms of what is not assigned.
+    """
+    try:
+        expr = symengine.sympify(expression)
+        for symbol, value in reversed(assignments):
+            symbol = symengine.sympify(symbol)
+            if symbol in expr.free_symbols:
+                expr = expr.subs({symbol: symengine.sympify(value)})
+        return _to_sympy(expr, _symbols(expression, *(value for _, value in assignments)))
+    except Exception:
+        # NOTE Fall back to sympy for expressions symengine cannot represent
+        pass
+
+    for symbol, value in reversed(assignments):
+        expression = subs(expression, {symbol: value}, simultaneous=True)
+    return expression
+
+
+def diff(expression: sympy.Expr, symbols: Iterable[sympy.Symbol]) -> List[sympy.Expr]:
+    """Derivatives of an expression with respect to each of the symbols"""
+    symbols = list(symbols)
+    try:
+        expr = symengine.sympify(expression)
+        originals = _symbols(expression)
+        return [_to_sympy(expr.diff(symengine.sympify(symbol)), originals) for symbol in symbols]
+    except Exception:
+        # NOTE Fall back to sympy for expressions symengine cannot represent
+        return [expression.diff(symbol) for symbol in symbols]
+
+
+def _symbols(*exprs: sympy.Expr) -> Dict[str, sympy.Symbol]:
+    # NOTE Only symbols that do not survive the roundtrip are needed
+    return {
+        symbol.name: symbol
+        for expr in exprs
+        for symbol in sympy.sympify(expr).free_symbols
+        if isinstance(symbol, sympy.Symbol) and symbol.assumptions0
+    }
+
+
+def _to_sympy(expr, originals: Dict[str, sympy.Symbol]) -> sympy.Expr:
+    converted = sympy.sympify(expr)
+    if not originals:
+        return converted
+    return converted.xreplace(
+        {
+            symbol: originals[symbol.name]
+            for symbol in converted.free_symbols
+            if symbol.name in originals
+        }
+    )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Mapping, Set
+from typing import Callable, Mapping, Set, Union
 
 from pharmpy.deps import numpy as np
 from pharmpy.deps import sympy
@@ -25,6 +25,27 @@ def eval_expr(
     return np.full(datasize, float(expr.evalf()))
 
 
+def compile_expr(
+    expr: sympy.Expr,
+) -> Callable[[int, Mapping[sympy.Symbol, Union[float, np.ndarray]]], np.ndarray]:
+    """Compile an expression once for repeated evaluation
+
+    The returned function takes the same arguments as eval_expr. The values of
+    the datamap can be arrays or scalars that are broadcast to the datasize.
+    """
+    if not _free_symbols(expr):
+        value = float(expr.evalf())
+        return lambda datasize, _: np.full(datasize, value)
+
+    ordered_symbols, fn = _lambdify_canonical(expr)
+
+    def evaluate(datasize, datamap):
+        values = fn(*(datamap[symbol] for symbol in ordered_symbols))
+        return np.broadcast_to(values, (datasize,))
+
+    return evaluate
+
+
 @lru_cache(maxsize=256)
 def _free_symbols(expr: sympy.Expr) -> Set[sympy.Symbol]:
     return expr.free_symbols
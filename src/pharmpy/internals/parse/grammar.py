@@ -0,0 +1,94 @@
+import json
+import os
+import uuid
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Union
+
+import appdirs
+import lark
+from lark import Lark
+
+from pharmpy.config import appname
+
+
+def grammar_cache_path() -> Path:
+    """Path to the directory of cached compiled grammars"""
+    return Path(appdirs.user_cache_dir(appname)) / 'grammars'
+
+
+def load_grammar(
+    grammar_path: Union[str, Path], cache_path: Optional[Path] = None, **options
+) -> Lark:
+    """Create a Lark parser for a grammar file
+
+    The compiled parser is cached on disk keyed on the contents of the grammar,
+    the grammars it can import, the options and the version of lark so that it
+    only has to be compiled once.
+    The parser is compiled without caching if the cache cannot be used.
+
+    Parameters
+    ----------
+    grammar_path : str or Path
+        Path to the grammar file
+    cache_path : Path
+        Path to the cache directory. Default is the user cache directory
+    options
+        Options to Lark
+
+    Returns
+    -------
+    Lark
+        The parser
+    """
+    grammar_path = Path(grammar_path)
+    grammar = grammar_path.read_text()
+    h = sha256()
+    h.update(lark.__version__.encode('utf-8'))
+    h.update(json.dumps(options, sort_keys=True, default=str).encode('utf-8'))
+    h.update(grammar.encode('utf-8'))
+    # NOTE Grammars can import rules from other grammars in the same directory
+    for path in sorted(grammar_path.parent.glob('*.lark')):
+        if path != grammar_path:
+            h.update(path.read_bytes())
+    if cache_path is None:
+        cache_path = grammar_cache_path()
+    path = cache_path / f'{grammar_path.stem}-{h.hexdigest()}.pickle'
+
+    try:
+        with open(path, 'rb') as f:
+            return Lark.load(f)
+    except Exception:
+        # NOTE Missing, unreadable or corrupt entries are recompiled
+        pass
+
+    parser = Lark(grammar, source_path=str(grammar_path), **options)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # NOTE Write to a temporary file first so that concurrent readers never
+        # see a partially written entry
+        tmp_path = path.with_name(f'.{path.name}.{uuid.uuid4().hex}')
+        with open(tmp_path, 'wb') as f:
+            parser.save(f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return parser
+
+
+class LazyGrammar:
+    """Class attribute creating the Lark parser of a grammar on first access"""
+
+    def __init__(self, grammar_path: Union[str, Path], **options):
+        self.grammar_path = grammar_path
+        self.options = options
+        self._lark = None
+        self._lock = Lock()
+
+    def __get__(self, obj, objtype=None) -> Lark:
+        if self._lark is None:
+            with self._lock:
+                if self._lark is None:
+                    self._lark = load_grammar(self.grammar_path, **self.options)
+        return self._lark
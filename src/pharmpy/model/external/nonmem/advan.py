@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import re
 import warnings
-from typing import TYPE_CHECKING, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
 
 from pharmpy.deps import sympy
 from pharmpy.model import (
@@ -19,6 +19,8 @@ from pharmpy.model import (
 )
 
 if TYPE_CHECKING:
+    import pandas as pd
+
     from .model import Model
 
 from .nmtran_parser import NMTranControlStream
@@ -27,12 +29,12 @@ from .nmtran_parser import NMTranControlStream
 def compartmental_model(model: Model, advan: str, trans, des=None):
     di = model.datainfo
     control_stream = model.internals.control_stream
-    return _compartmental_model(di, model.dataset, control_stream, advan, trans, des)
+    return _compartmental_model(di, lambda: model.dataset, control_stream, advan, trans, des)
 
 
 def _compartmental_model(
     di: DataInfo,
-    dataset,
+    dataset: Callable[[], Optional[pd.DataFrame]],
     control_stream: NMTranControlStream,
     advan: str,
     trans,
@@ -589,7 +591,11 @@ def _advan12_trans(trans: str):
         )
 
 
-def dosing(di: DataInfo, dataset, dose_comp: int):
+def dosing(di: DataInfo, dataset: Callable[[], Optional[pd.DataFrame]], dose_comp: int):
+    # NOTE The dataset is only read if the dosing depends on it
+    if not any(name in di.names and not di[name].drop for name in ('CMT', 'RATE')):
+        return ({'comp_number': dose_comp, 'dose': Bolus(sympy.Symbol('AMT'))},)
+    dataset = dataset()
     if 'CMT' not in di.names or di['CMT'].drop or dataset is None:
         return ({'comp_number': dose_comp, 'dose': _dosing(di, dataset, dose_comp)},)
     else:
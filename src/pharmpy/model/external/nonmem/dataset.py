@@ -83,6 +83,25 @@ def convert_fortran_number(number_string):
     raise ValueError(f"Could not convert the fortran number {number_string} to float")
 
 
+def _convert_data_column(column, null_value):
+    """Vectorized version of _convert_data_item for a whole column of strings
+
+    Columns with all items in ordinary decimal notation are converted in one go by NumPy.
+    Only columns having items in the special fortran format (or items that cannot be
+    converted at all) will be converted item by item.
+    """
+    column = column.mask(column.isna() | column.isin(('', '.')), null_value)
+    strings = column.to_numpy(dtype=object)
+    if len(strings) > 0 and max(map(len, strings)) > 24:
+        raise DatasetError("The dataset contains an item that is longer than 24 characters")
+    try:
+        converted = strings.astype(np.float64)
+    except ValueError:
+        return column.apply(_convert_data_item, args=(null_value,))
+    converted[np.isin(converted, data.conf.na_values)] = np.nan
+    return pd.Series(converted, index=column.index, name=column.name)
+
+
 def _convert_data_item(x, null_value):
     if x is None or x == '.' or x == '':
         x = null_value
@@ -97,6 +116,53 @@ def _convert_data_item(x, null_value):
     return converted
 
 
+_separator = r' *, *| *[\t] *| +'
+_separator_regexp = re.compile(_separator)
+_line_padding_regexp = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
+
+
+def _read_table_python(file_io):
+    file_io.seek(0)
+    return pd.read_table(
+        file_io,
+        sep=_separator,
+        na_filter=False,
+        header=None,
+        engine='python',
+        quoting=3,
+        dtype=object,
+        index_col=False,
+    )
+
+
+def _read_table(file_io):
+    """Split the prefiltered dataset into a DataFrame of strings
+
+    All NM-TRAN separators are first normalized into single commas so that the
+    C engine of pandas can be used for the tokenization. Exotic files, for example
+    having rows with more items than the first row, will fall back to the regular
+    expression separator of the much slower python engine.
+    """
+    contents = file_io.getvalue()
+    if ' ' in contents or '\t' in contents:
+        contents = _line_padding_regexp.sub('', contents)
+        contents = _separator_regexp.sub(',', contents)
+    try:
+        df = pd.read_csv(
+            StringIO(contents),
+            sep=',',
+            na_filter=False,
+            header=None,
+            engine='c',
+            quoting=3,
+            dtype=object,
+            index_col=False,
+        )
+    except pd.errors.ParserError:
+        df = _read_table_python(file_io)
+    return df
+
+
 def _make_ids_unique(df, columns):
     """Check if id numbers are reused and make renumber. If not simply pass through the dataset."""
     if 'ID' in df.columns:
@@ -211,7 +277,7 @@ def _filter_ignore_accept(df, ignore, accept, null_value):
             # for further information.
             # Using a name with spaces since this cannot collide with other NONMEM names
             magic_colname = 'a a'
-            df[magic_colname] = df[column].apply(_convert_data_item, args=(str(null_value),))
+            df[magic_colname] = _convert_data_column(df[column], str(null_value))
             expression = f'`{magic_colname}` {operator} {expr}'
             if ignore:
                 expression = 'not(' + expression + ')'
@@ -260,16 +326,7 @@ def read_nonmem_dataset(
         raise KeyError('Column names are not unique')
 
     file_io = NMTRANDataIO(path_or_io, ignore_character)
-    df = pd.read_table(
-        file_io,
-        sep=r' *, *| *[\t] *| +',
-        na_filter=False,
-        header=None,
-        engine='python',
-        quoting=3,
-        dtype=object,
-        index_col=False,
-    )
+    df = _read_table(file_io)
 
     diff_cols = len(df.columns) - len(colnames)
     if diff_cols > 0:
@@ -296,7 +353,7 @@ def read_nonmem_dataset(
             x for x in parse_columns if x not in ['TIME', 'DATE', 'DAT1', 'DAT2', 'DAT3']
         ]
     for column in parse_columns:
-        df[column] = df[column].apply(_convert_data_item, args=(str(null_value),))
+        df[column] = _convert_data_column(df[column], str(null_value))
     df = _make_ids_unique(df, parse_columns)
 
     if not raw:
@@ -316,7 +373,7 @@ def read_nonmem_dataset(
             item in df.columns for item in ['DATE', 'DAT1', 'DAT2', 'DAT3']
         ):
             try:
-                df['TIME'] = df['TIME'].apply(_convert_data_item, args=(str(null_value),))
+                df['TIME'] = _convert_data_column(df['TIME'], str(null_value))
             except DatasetError:
                 pass
 
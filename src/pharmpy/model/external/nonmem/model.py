@@ -15,7 +15,7 @@ from pharmpy.internals.immutable import frozenmapping
 from pharmpy.model import Assignment, DataInfo, EstimationSteps
 from pharmpy.model import Model as BaseModel
 from pharmpy.model import NormalDistribution, Parameter, Parameters, RandomVariables, Statements
-from pharmpy.model.model import compare_before_after_params, update_datainfo
+from pharmpy.model.model import LazyDataset, compare_before_after_params, update_datainfo
 from pharmpy.modeling.write_csv import write_csv
 
 from .nmtran_parser import NMTranControlStream, NMTranParser
@@ -24,6 +24,7 @@ from .parsing import (
     parse_datainfo,
     parse_dataset,
     parse_description,
+    parse_dosing_dataset,
     parse_estimation_steps,
     parse_initial_individual_estimates,
     parse_parameters,
@@ -159,58 +160,78 @@ class Model(BaseModel):
                 parameters=Parameters.create(list(model.parameters) + [omega]),
             )
 
-        control_stream = update_random_variables(
-            model, model.internals.old_random_variables, model._random_variables
+        # NOTE Only regenerate the records of components that changed since the
+        # last update. Unchanged components are usually the same objects.
+        parameters_changed = _changed(model.internals.old_parameters, model._parameters)
+        random_variables_changed = _changed(
+            model.internals.old_random_variables, model._random_variables
         )
+        statements_changed = _changed(model.internals.old_statements, model._statements) or _solver(
+            model.internals.old_estimation_steps
+        ) != _solver(model._estimation_steps)
+
+        if parameters_changed or random_variables_changed:
+            if random_variables_changed or _parameters_changed(
+                model.internals.old_parameters,
+                model._parameters,
+                model._random_variables.parameter_names,
+            ):
+                control_stream = update_random_variables(
+                    model, model.internals.old_random_variables, model._random_variables
+                )
+            else:
+                control_stream = model.internals.control_stream
 
-        control_stream = update_thetas(
-            model, control_stream, model.internals.old_parameters, model._parameters
-        )
+            control_stream = update_thetas(
+                model, control_stream, model.internals.old_parameters, model._parameters
+            )
 
-        model = model.replace(
-            internals=model.internals.replace(
-                old_parameters=model._parameters,
-                old_random_variables=model._random_variables,
-                control_stream=control_stream,
+            model = model.replace(
+                internals=model.internals.replace(
+                    old_parameters=model._parameters,
+                    old_random_variables=model._random_variables,
+                    control_stream=control_stream,
+                )
             )
-        )
 
-        # Parameters that needs to be renamed in statements
-        trans = create_name_map(model)
-
-        # RVs that need $ABBR (either has proper names or have been renumbered
-        rv_trans = {}
-        i = 1
-        for dist in model._random_variables.etas:
-            for name in dist.names:
-                nonmem_pattern = re.match(r'ETA[_(]([0-9]+)\)*', name)
-                if not nonmem_pattern:
-                    rv_trans[name] = f'ETA({i})'
-                elif nonmem_pattern.group(1) != str(i):
-                    rv_trans[name] = f'ETA({i})'
-                i += 1
-
-        if model._random_variables.etas.names != ['eta_dummy']:
-            model, abbr_map = abbr_translation(model, rv_trans)
-            trans = {key: value for key, value in trans.items() if key not in abbr_map.values()}
-
-        trans = {sympy.Symbol(key): sympy.Symbol(value) for key, value in trans.items()}
-        model, updated_dataset = update_statements(
-            model, model.internals.old_statements, model._statements, trans
-        )
+        if random_variables_changed or statements_changed:
+            # Parameters that needs to be renamed in statements
+            trans = create_name_map(model)
+
+            # RVs that need $ABBR (either has proper names or have been renumbered
+            rv_trans = {}
+            i = 1
+            for dist in model._random_variables.etas:
+                for name in dist.names:
+                    nonmem_pattern = re.match(r'ETA[_(]([0-9]+)\)*', name)
+                    if not nonmem_pattern:
+                        rv_trans[name] = f'ETA({i})'
+                    elif nonmem_pattern.group(1) != str(i):
+                        rv_trans[name] = f'ETA({i})'
+                    i += 1
+
+            if model._random_variables.etas.names != ['eta_dummy']:
+                model, abbr_map = abbr_translation(model, rv_trans)
+                trans = {key: value for key, value in trans.items() if key not in abbr_map.values()}
+
+            trans = {sympy.Symbol(key): sympy.Symbol(value) for key, value in trans.items()}
+            model, updated_dataset = update_statements(
+                model, model.internals.old_statements, model._statements, trans
+            )
+        else:
+            updated_dataset = False
         # model = update_dependent_variables(model, trans)
 
         cs = model.internals.control_stream
 
-        if model.dataset is None:
-            pass
-        elif (
+        # NOTE Check the dataset last to avoid reading a lazily loaded dataset
+        if (
             updated_dataset
-            or (model.datainfo.path is None and model.dataset is not None)
+            or model.datainfo.path is None
             or model.datainfo != model.internals.old_datainfo
             or model.datainfo.path != model.internals.old_datainfo.path
-        ):
-            data_record = control_stream.get_records('DATA')[0]
+        ) and model.dataset is not None:
+            data_record = cs.get_records('DATA')[0]
             label = model.datainfo.names[0]
             newdata = data_record.set_ignore_character_from_header(label)
             cs = update_input(cs, model)
@@ -227,7 +248,8 @@ class Model(BaseModel):
 
             cs = cs.replace_records([data_record], [newdata])
 
-        cs = update_sizes(cs, model)
+        if parameters_changed or random_variables_changed or statements_changed:
+            cs = update_sizes(cs, model)
         cs = update_estimation(cs, model)
         cs = update_description(cs, model.internals.old_description, model.description)
 
@@ -299,6 +321,67 @@ class Model(BaseModel):
         )
 
 
+def _changed(old, new) -> bool:
+    return old is not new and old != new
+
+
+def _parameters_changed(old: Parameters, new: Parameters, names) -> bool:
+    return any(name not in old or old[name] != new[name] for name in names)
+
+
+def _solver(estimation_steps: EstimationSteps):
+    return estimation_steps[0].solver if len(estimation_steps) > 0 else None
+
+
+def _dataset_loader(di: DataInfo, control_stream: NMTranControlStream):
+    di, missing = _resolve_dataset_path(di)
+
+    def load():
+        if missing:
+            return None
+        try:
+            return parse_dataset(di, control_stream, raw=False)
+        except FileNotFoundError as e:
+            return _dataset_disappeared(e)
+
+    return load
+
+
+def _dosing_dataset_loader(di: DataInfo, control_stream: NMTranControlStream, dataset: LazyDataset):
+    di, missing = _resolve_dataset_path(di)
+    cache = []
+
+    def load():
+        if dataset.is_loaded:
+            return dataset.load()
+        if not cache:
+            if missing:
+                cache.append(None)
+            else:
+                try:
+                    cache.append(parse_dosing_dataset(di, control_stream))
+                except FileNotFoundError as e:
+                    cache.append(_dataset_disappeared(e))
+        return cache[0]
+
+    return load
+
+
+def _resolve_dataset_path(di: DataInfo):
+    # NOTE The path is made absolute and checked when the model is parsed so that
+    # reading the dataset later does not depend on the working directory. Only a
+    # dataset that is missing when parsing gives a model without a dataset.
+    if di.path is None:
+        return di, False
+    di = di.replace(path=path_absolute(di.path))
+    return di, not di.path.is_file()
+
+
+def _dataset_disappeared(e: FileNotFoundError):
+    warnings.warn(f'Dataset could not be read although it existed when the model was parsed: {e}')
+    return None
+
+
 def parse_model(
     code: str, path: Optional[Path] = None, dataset: Optional[pd.DataFrame] = None, **_
 ):
@@ -319,12 +402,16 @@ def parse_model(
     if dataset is not None:
         di = update_datainfo(di.replace(path=None), dataset)
 
-    try:
-        dataset = parse_dataset(di, control_stream, raw=False)
-    except FileNotFoundError:
-        pass
+    if dataset is None:
+        # NOTE The dataset is only read when first needed. Parsing the statements
+        # only needs the dosing columns.
+        dataset = LazyDataset(_dataset_loader(di, control_stream))
+        dosing_dataset = _dosing_dataset_loader(di, control_stream, dataset)
+    else:
+        df = dataset
+        dosing_dataset = lambda: df  # noqa: E731
 
-    statements, comp_map = parse_statements(di, dataset, control_stream)
+    statements, comp_map = parse_statements(di, dosing_dataset, control_stream)
     statements, dependent_variables, obs_trans = convert_dvs(statements, control_stream)
 
     parameters, rvs, name_map = parse_parameters(control_stream, statements)
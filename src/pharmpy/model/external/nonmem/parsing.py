@@ -778,6 +778,47 @@ def parse_dataset(
     return df
 
 
+def parse_dosing_dataset(di: DataInfo, control_stream: NMTranControlStream):
+    """Read only the dataset columns needed to determine the dosing
+
+    Returns None if the dosing does not depend on the dataset.
+    """
+    dosing_columns = [name for name in ('RATE', 'CMT') if name in di.names and not di[name].drop]
+    data_records = control_stream.get_records('DATA')
+    if not dosing_columns or not data_records:
+        return None
+
+    have_pk = control_stream.get_pk_record()
+    # NOTE Columns needed to remove individuals without observations
+    filter_columns = [name for name in ('ID', 'EVID', 'MDV', 'AMT') if have_pk and name in di.names]
+    (colnames, drop, replacements, _) = parse_column_info(control_stream)
+    ignore = data_records[0].ignore
+    accept = data_records[0].accept
+    if ignore:
+        ignore = replace_synonym_in_filters(ignore, replacements)
+    else:
+        accept = replace_synonym_in_filters(accept, replacements)
+
+    parse_columns = dosing_columns + [name for name in filter_columns if name not in dosing_columns]
+    df = read_nonmem_dataset(
+        di.path,
+        True,
+        data_records[0].ignore_character,
+        colnames,
+        drop,
+        null_value=data_records[0].null_value,
+        parse_columns=tuple(parse_columns),
+        ignore=ignore,
+        accept=accept,
+    )
+    df = df[parse_columns]
+    dtype = di.get_dtype_dict()
+    df = df.astype({name: dtype[name] for name in parse_columns if name in dtype})
+    if have_pk:
+        df = filter_observations(df, parse_columns)
+    return df[dosing_columns]
+
+
 def filter_observations(df, col_names):
     if 'EVID' in col_names:
         df_obs = df.astype({'EVID': 'float'}).query('EVID == 0')
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import re
-from io import StringIO
+from io import BytesIO, StringIO
 from pathlib import Path
 from typing import List, Optional, Union
 
@@ -9,9 +9,17 @@ from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
 from pharmpy.internals.math import flattened_to_symmetric
 
+_table_start_regexp = re.compile(rb'^TABLE NO\.', re.MULTILINE)
+_header_line_regexp = re.compile(rb'^[^\S\n][A-Za-z_]', re.MULTILINE)
+
 
 class NONMEMTableFile:
-    """A NONMEM table file that can contain multiple tables"""
+    """A NONMEM table file that can contain multiple tables
+
+    The file is read once and the boundaries of the tables are located by byte offsets.
+    Each table keeps a view of its part of the file contents and will only be parsed
+    when first needed, and then possibly only for some of its columns.
+    """
 
     def __init__(
         self,
@@ -26,23 +34,20 @@ class NONMEMTableFile:
             tables = []
             if path.stat().st_size == 0:
                 raise OSError("Empty table file")
-            with open(str(path), 'r') as tablefile:
-                if notitle:
-                    table = self._parse_table(
-                        tablefile.read().splitlines(keepends=True), notitle=notitle, nolabel=nolabel
-                    )
-                    tables.append(table)
-                else:
-                    current = []
-                    for line in tablefile:
-                        if line.startswith("TABLE NO."):
-                            if current:
-                                table = self._parse_table(current, suffix)
-                                tables.append(table)
-                            current = [line]
-                        else:
-                            current.append(line)
-                    table = self._parse_table(current, suffix)
+            # NOTE The whole file is kept in memory as bytes, which is much smaller than
+            # the parsed tables. It is not memory mapped since a map of a file that is
+            # later truncated, e.g. by a rerun of the model, crashes the process when read.
+            data = path.read_bytes()
+            if notitle:
+                table = self._parse_table(data, 0, len(data), notitle=notitle)
+                tables.append(table)
+            else:
+                starts = [m.start() for m in _table_start_regexp.finditer(data)]
+                if not starts or starts[0] != 0:
+                    starts.insert(0, 0)
+                ends = starts[1:] + [len(data)]
+                for start, end in zip(starts, ends):
+                    table = self._parse_table(data, start, end, suffix)
                     tables.append(table)
             self.tables = tables
         elif tables is not None:
@@ -52,49 +57,38 @@ class NONMEMTableFile:
 
     def _parse_table(
         self,
-        content: List[str],
+        data: bytes,
+        start: int,
+        end: int,
         suffix: Optional[str] = None,
         notitle: bool = False,
-        nolabel: bool = False,
     ) -> NONMEMTable:
-        # NOTE Content lines must contain endlines!
-
-        table_line = None if notitle else content.pop(0)
-
+        if notitle:
+            table_line = None
+        else:
+            newline = data.find(b'\n', start, end)
+            body_start = end if newline == -1 else newline + 1
+            table_line = data[start:body_start].decode()
+            start = body_start
+
+        # NOTE A view does not copy the contents of the table
+        content = memoryview(data)[start:end]
+        source = _TableSource(content)
         if suffix == '.ext':
-            table = ExtTable(''.join(content))
+            table = ExtTable(source=source)
         elif suffix == '.phi':
-            table = PhiTable(''.join(content))
+            table = PhiTable(source=source)
         elif suffix == '.cov' or suffix == '.cor' or suffix == '.coi':
-            table = CovTable(''.join(content))
+            table = CovTable(source=source)
         else:
             # Remove repeated header lines, but not the first
-            content[1:] = [line for line in content[1:] if not re.match(r'\s[A-Za-z_]', line)]
-            table = NONMEMTable(''.join(content))  # Fallback to non-specific table type
+            header_end = data.find(b'\n', start, end)
+            if header_end != -1 and _header_line_regexp.search(data, header_end, end):
+                source = _TableSource(content, remove_repeated_headers=True)
+            table = NONMEMTable(source=source)  # Fallback to non-specific table type
 
         if table_line is not None:
-            m = re.match(r'TABLE NO.\s+(\d+)', table_line)
-            if not m:
-                raise ValueError(f"Illegal {suffix}-file: missing TABLE NO.")
-            table.number = int(m.group(1))
-            table.is_evaluation = False
-            if re.search(r'(Evaluation)', table_line):
-                table.is_evaluation = True  # No estimation step was run
-            m = re.match(
-                r'TABLE NO.\s+\d+: (.*?): (?:Goal Function=(.*): )?Problem=(\d+) '
-                r'Subproblem=(\d+) Superproblem1=(\d+) Iteration1=(\d+) Superproblem2=(\d+) '
-                r'Iteration2=(\d+)',
-                table_line,
-            )
-            if m:
-                table.method = m.group(1)
-                table.goal_function = m.group(2)
-                table.problem = int(m.group(3))
-                table.subproblem = int(m.group(4))
-                table.superproblem1 = int(m.group(5))
-                table.iteration1 = int(m.group(6))
-                table.superproblem2 = int(m.group(7))
-                table.iteration2 = int(m.group(8))
+            parse_table_title(table, table_line, suffix)
 
         return table
 
@@ -134,6 +128,49 @@ class NONMEMTableFile:
                 print(table.content, file=df, end='')
 
 
+def parse_table_title(table: NONMEMTable, table_line: str, suffix: Optional[str] = None):
+    """Set the attributes of a table from its "TABLE NO." title line"""
+    m = re.match(r'TABLE NO.\s+(\d+)', table_line)
+    if not m:
+        raise ValueError(f"Illegal {suffix}-file: missing TABLE NO.")
+    table.number = int(m.group(1))
+    table.is_evaluation = False
+    if re.search(r'(Evaluation)', table_line):
+        table.is_evaluation = True  # No estimation step was run
+    m = re.match(
+        r'TABLE NO.\s+\d+: (.*?): (?:Goal Function=(.*): )?Problem=(\d+) '
+        r'Subproblem=(\d+) Superproblem1=(\d+) Iteration1=(\d+) Superproblem2=(\d+) '
+        r'Iteration2=(\d+)',
+        table_line,
+    )
+    if m:
+        table.method = m.group(1)
+        table.goal_function = m.group(2)
+        table.problem = int(m.group(3))
+        table.subproblem = int(m.group(4))
+        table.superproblem1 = int(m.group(5))
+        table.iteration1 = int(m.group(6))
+        table.superproblem2 = int(m.group(7))
+        table.iteration2 = int(m.group(8))
+
+
+class _TableSource:
+    """Unparsed contents of one table in a table file"""
+
+    def __init__(self, content, remove_repeated_headers=False):
+        self.content = content
+        self.remove_repeated_headers = remove_repeated_headers
+
+    def read(self, columns=None):
+        content = self.content
+        if self.remove_repeated_headers:
+            lines = bytes(content).splitlines(keepends=True)
+            lines[1:] = [line for line in lines[1:] if not _header_line_regexp.match(line)]
+            content = b''.join(lines)
+        usecols = None if columns is None else list(columns)
+        return pd.read_table(BytesIO(content), sep=r'\s+', engine='c', usecols=usecols)
+
+
 class NONMEMTable:
     """A NONMEM output table."""
 
@@ -148,18 +185,45 @@ class NONMEMTable:
     superproblem2: Optional[int] = None
     iteration2: Optional[int] = None
 
-    def __init__(self, content=None, df=None):
+    def __init__(self, content=None, df=None, source=None):
+        self._source = None
         if content is not None:
             self._df = pd.read_table(StringIO(content), sep=r'\s+', engine='c')
         elif df is not None:
             self._df = df
+        elif source is not None:
+            self._source = source
+            self._data = None
         else:
             raise ValueError('NONMEMTable: content and df cannot be both None')
 
+    @property
+    def _df(self):
+        if self._data is None:
+            self._data = self._source.read()
+        return self._data
+
+    @_df.setter
+    def _df(self, df):
+        self._data = df
+
     @property
     def data_frame(self):
         return self._df
 
+    def read_columns(self, columns):
+        """Get a DataFrame with only some of the columns of the table
+
+        columns is a list of column names or a list of column positions. If the table
+        has not yet been parsed only the requested columns will be read from the file.
+        """
+        if self._data is None:
+            return self._source.read(columns)
+        df = self._data
+        if all(isinstance(col, int) for col in columns):
+            return df.iloc[:, list(columns)]
+        return df[list(columns)]
+
     @property
     def content(self):
         df = self._df.copy(deep=True)
@@ -15,11 +15,13 @@ from __future__ import annotations
 import json
 import warnings
 from pathlib import Path
+from threading import Lock
+from typing import Callable, Optional
 
 import pharmpy
 from pharmpy.deps import pandas as pd
 from pharmpy.deps import sympy
-from pharmpy.internals.df import hash_df_runtime
+from pharmpy.internals.df import df_equals, hash_df_runtime
 from pharmpy.internals.immutable import Immutable, cache_method, frozenmapping
 from pharmpy.model.external import detect_model
 
@@ -49,6 +51,50 @@ class ModelfitResultsError(ModelError):
     pass
 
 
+class LazyDataset:
+    """Deferred loader of the dataset of a model
+
+    The dataset is read the first time it is needed and then kept. Models
+    derived from each other share the loader so the dataset is read at most
+    once.
+
+    Parameters
+    ----------
+    loader : Callable
+        Function returning the dataset or None if there is no dataset
+    """
+
+    def __init__(self, loader: Callable[[], Optional[pd.DataFrame]]):
+        self._loader = loader
+        self._lock = Lock()
+        self._loaded = False
+        self._df = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the dataset has been read"""
+        return self._loaded
+
+    def load(self) -> Optional[pd.DataFrame]:
+        """Read the dataset if needed and return it"""
+        with self._lock:
+            if not self._loaded:
+                self._df = self._loader()
+                self._loaded = True
+                self._loader = None
+        return self._df
+
+    def __getstate__(self):
+        # NOTE Neither the lock nor the loader can be pickled
+        return {'df': self.load()}
+
+    def __setstate__(self, state):
+        self._loader = None
+        self._lock = Lock()
+        self._loaded = True
+        self._df = state['df']
+
+
 class Model(Immutable):
     """The Pharmpy model class"""
 
@@ -430,7 +476,7 @@ class Model(Immutable):
                 self._estimation_steps,
                 self._initial_individual_estimates,
                 self._datainfo,
-                hash_df_runtime(self._dataset),
+                hash_df_runtime(self.dataset),
                 self._value_type,
             )
         )
@@ -564,7 +610,10 @@ class Model(Immutable):
     @property
     def dataset(self):
         """Dataset connected to model"""
-        return self._dataset
+        dataset = self._dataset
+        if isinstance(dataset, LazyDataset):
+            return dataset.load()
+        return dataset
 
     @property
     def initial_individual_estimates(self):
@@ -616,8 +665,7 @@ class Model(Immutable):
         if other.dataset is None:
             return False
 
-        # NOTE rely on duck-typing here (?)
-        return self.dataset.equals(other.dataset)
+        return df_equals(self.dataset, other.dataset)
 
     @property
     def description(self):
@@ -726,6 +726,93 @@ class RandomVariables(CollectionsSequence, Immutable):
                     raise TypeError("Cannot validate parameters since all are not numeric")
         return True
 
+    def _variance_index_maps(self, names):
+        """Map the elements of the variance matrices of joint distributions to positions in names
+
+        Gives one pair of arrays (indices, constants) per joint distribution or None if
+        any of the matrices has elements that are neither symbols nor numbers.
+        Numeric elements get index -1 and their value in constants.
+        """
+        positions = {name: i for i, name in enumerate(names)}
+        maps = []
+        for dist in self._dists:
+            if not isinstance(dist, JointNormalDistribution):
+                continue
+            variance = dist.variance
+            indices = np.full(variance.shape, -1)
+            constants = np.zeros(variance.shape)
+            for row, col in product(range(variance.rows), range(variance.cols)):
+                elem = variance[row, col]
+                if isinstance(elem, sympy.Symbol):
+                    if elem.name not in positions:
+                        raise TypeError("Cannot validate parameters since all are not numeric")
+                    indices[row, col] = positions[elem.name]
+                elif elem.is_Number:
+                    constants[row, col] = float(elem)
+                else:
+                    return None
+            maps.append((indices, constants))
+        return maps
+
+    def validate_parameters_batch(self, parameter_values):
+        """Validate many parameter vectors at once
+
+        Batched version of validate_parameters. Each variance matrix is mapped onto the columns
+        once and then all samples are checked with stacked eigenvalue calculations.
+
+        Parameters
+        ----------
+        parameter_values : pd.DataFrame
+            One parameter vector per row and one parameter per column
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array with True for each valid row
+        """
+        maps = self._variance_index_maps(parameter_values.columns)
+        if maps is None:
+            return parameter_values.apply(self.validate_parameters, axis=1).to_numpy(dtype=bool)
+        values = parameter_values.to_numpy(dtype=np.float64)
+        valid = np.ones(len(values), dtype=bool)
+        for indices, constants in maps:
+            sigmas = np.where(indices >= 0, values[:, indices], constants)
+            valid &= (np.linalg.eigvalsh(sigmas) >= 0).all(axis=1)
+        return valid
+
+    def nearest_valid_parameters_batch(self, parameter_values):
+        """Force many parameter vectors into being valid at once
+
+        Batched version of nearest_valid_parameters. Only the variance matrices that are not
+        positive semidefinite will be changed.
+
+        Parameters
+        ----------
+        parameter_values : pd.DataFrame
+            One parameter vector per row and one parameter per column
+
+        Returns
+        -------
+        pd.DataFrame
+            Copy of parameter_values with all rows valid
+        """
+        maps = self._variance_index_maps(parameter_values.columns)
+        if maps is None:
+            return parameter_values.transform(self.nearest_valid_parameters, axis=1)
+        values = parameter_values.to_numpy(dtype=np.float64, copy=True)
+        for indices, constants in maps:
+            sigmas = np.where(indices >= 0, values[:, indices], constants)
+            invalid = np.flatnonzero((np.linalg.eigvalsh(sigmas) < 0).any(axis=1))
+            rows, cols = np.tril_indices(len(indices))
+            mapped = indices[rows, cols] >= 0
+            rows, cols = rows[mapped], cols[mapped]
+            for i in invalid:
+                B = nearest_postive_semidefinite(sigmas[i])
+                values[i, indices[rows, cols]] = B[rows, cols]
+        nearest = parameter_values.copy()
+        nearest[:] = values
+        return nearest
+
     def sample(self, expr, parameters=None, samples=1, rng=None):
         """Sample from the distribution of expr
 
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Any, Dict, Literal, Union, overload
 
 import pharmpy
+from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
 from pharmpy.internals.immutable import Immutable
 
@@ -66,6 +67,49 @@ class Results(Immutable):
         else:
             return s
 
+    def to_store(self, path: Union[str, Path]):
+        """Serialize results object as a binary columnar results store
+
+        The store is a directory with a small json manifest and one .npz file
+        for each DataFrame or Series attribute. Numeric columns are stored in
+        binary form so that floats round-trip exactly and single attributes can
+        be read without reading the rest of the store. Attributes that are not
+        tables are stored as json in the manifest.
+
+        Parameters
+        ----------
+        path : Path
+            Path to the store directory. Will be created if it does not exist.
+
+        See also
+        --------
+        pharmpy.results.ResultsStore : Read a results store
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        # NOTE Remove the manifest first so that a partially overwritten store
+        # is never seen as valid
+        manifest_path = path / RESULTS_STORE_MANIFEST
+        if manifest_path.is_file():
+            with open(manifest_path, 'r') as fh:
+                old_manifest = json.load(fh)
+            manifest_path.unlink()
+            for meta in old_manifest['attributes'].values():
+                if 'file' in meta:
+                    (path / meta['file']).unlink(missing_ok=True)
+
+        attributes = {
+            key: _attribute_to_store(path, key, value) for key, value in vars(self).items()
+        }
+        manifest = {
+            '__module__': self.__class__.__module__,
+            '__class__': self.__class__.__qualname__,
+            'attributes': attributes,
+        }
+        with open(manifest_path, 'w') as fh:
+            json.dump(manifest, fh)
+
     def get_and_reset_index(self, attr, **kwargs):
         """Wrapper to reset index of attribute or result from method.
 
@@ -146,6 +190,88 @@ class Results(Immutable):
             print(s, file=fh)
 
 
+RESULTS_STORE_MANIFEST = 'manifest.json'
+
+
+class _UnsupportedInStore(Exception):
+    pass
+
+
+def _attribute_to_store(path: Path, key: str, value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        arrays = {}
+        try:
+            meta = _table_to_store(value, arrays, '')
+            json.dumps(meta)
+        except (_UnsupportedInStore, TypeError, ValueError):
+            pass
+        else:
+            filename = f'{key}.npz'
+            np.savez(path / filename, **arrays)
+            meta['file'] = filename
+            return meta
+    return {'kind': 'json', 'value': json.loads(ResultsJSONEncoder().encode(value))}
+
+
+def _table_to_store(obj, arrays, prefix):
+    if isinstance(obj, pd.Series):
+        if obj.size >= 1 and isinstance(obj.iloc[0], pd.DataFrame):
+            return {
+                'kind': 'Series[DataFrame]',
+                'name': obj.name,
+                'index': _index_to_store(obj.index, arrays, prefix),
+                'frames': [
+                    _table_to_store(df, arrays, f'{prefix}f{i}_') for i, df in enumerate(obj.values)
+                ],
+            }
+        meta = {'kind': 'Series', 'name': obj.name}
+        df = obj.to_frame()
+    else:
+        meta = {'kind': 'DataFrame'}
+        df = obj
+
+    meta['columns'] = _labels_to_store(df.columns)
+    meta['index'] = _index_to_store(df.index, arrays, prefix)
+    meta['data'] = [
+        _values_to_store(df.iloc[:, j], f'{prefix}c{j}', arrays) for j in range(len(df.columns))
+    ]
+    return meta
+
+
+def _labels_to_store(labels):
+    return {
+        'names': list(labels.names),
+        'values': [list(v) if isinstance(v, tuple) else v for v in labels.tolist()],
+        'dtype': str(labels.dtype),
+        'multi': isinstance(labels, pd.MultiIndex),
+    }
+
+
+def _index_to_store(index, arrays, prefix):
+    if isinstance(index, pd.RangeIndex):
+        return {'range': [index.start, index.stop, index.step], 'names': list(index.names)}
+    levels = [
+        _values_to_store(index.get_level_values(i), f'{prefix}i{i}', arrays)
+        for i in range(index.nlevels)
+    ]
+    return {
+        'levels': levels,
+        'names': list(index.names),
+        'multi': isinstance(index, pd.MultiIndex),
+    }
+
+
+def _values_to_store(values, key, arrays):
+    a = values.to_numpy()
+    dtype = str(values.dtype)
+    if a.dtype.kind in 'biufcmM':
+        arrays[key] = a
+        return {'array': key, 'dtype': dtype}
+    elif a.dtype.kind == 'O':
+        return {'values': a.tolist(), 'dtype': dtype}
+    raise _UnsupportedInStore()
+
+
 def _df_to_json(df):
     if str(df.columns.dtype) == 'int64':
         # Workaround for https://github.com/pandas-dev/pandas/issues/46392
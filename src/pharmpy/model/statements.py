@@ -9,6 +9,7 @@ import pharmpy.internals.unicode as unicode
 from pharmpy.deps import networkx as nx
 from pharmpy.deps import sympy
 from pharmpy.internals.expr.assumptions import assume_all
+from pharmpy.internals.expr.backend import substitute_assignments
 from pharmpy.internals.expr.leaves import free_images, free_images_and_symbols
 from pharmpy.internals.expr.ode import canonical_ode_rhs
 from pharmpy.internals.expr.parse import parse as parse_expr
@@ -1823,6 +1824,9 @@ class Statements(Sequence, Immutable):
             self._statements = ()
         else:
             self._statements = tuple(statements)
+        self._assignment_index = None
+        self._definitions = None
+        self._dependency_graph = None
 
     @overload
     def __getitem__(self, ind: slice) -> Statements:
@@ -2001,18 +2005,38 @@ class Statements(Sequence, Immutable):
         """
         return Statements(s.subs(substitutions) for s in self)
 
+    def _get_assignment_index(self):
+        # Symbol name to index of last assignment. Created once and reused
+        if self._assignment_index is None:
+            index = {}
+            for i, statement in enumerate(self._statements):
+                if isinstance(statement, Assignment):
+                    index[statement.symbol.name] = i
+            self._assignment_index = index
+        return self._assignment_index
+
+    def _get_definitions(self):
+        # Symbol to ascending indices of all statements defining it. Created once and reused
+        if self._definitions is None:
+            definitions = {}
+            for i, statement in enumerate(self._statements):
+                if isinstance(statement, Assignment):
+                    definitions.setdefault(statement.symbol, []).append(i)
+                elif isinstance(statement, ODESystem):
+                    for amount in statement.amounts:
+                        definitions.setdefault(amount, []).append(i)
+            self._definitions = definitions
+        return self._definitions
+
     def _lookup_last_assignment(
         self, symbol: Union[str, sympy.Symbol]
     ) -> Tuple[Optional[int], Optional[Assignment]]:
-        if isinstance(symbol, str):
-            symbol = sympy.Symbol(symbol)
-        ind = None
-        assignment = None
-        for i, statement in enumerate(self):
-            if isinstance(statement, Assignment):
-                if statement.symbol.name == symbol.name:  # Threadsafe and faster to compare names
-                    ind = i
-                    assignment = statement
+        name = symbol if isinstance(symbol, str) else symbol.name
+        ind = self._get_assignment_index().get(name)
+        if ind is None:
+            return None, None
+        assignment = self._statements[ind]
+        assert isinstance(assignment, Assignment)
         return ind, assignment
 
     def find_assignment(self, symbol: Union[str, sympy.Symbol]) -> Optional[Assignment]:
@@ -2100,20 +2124,21 @@ class Statements(Sequence, Immutable):
         return Statements(new)
 
     def _create_dependency_graph(self):
-        """Create a graph of dependencies between statements"""
-        graph = nx.DiGraph()
-        for i in range(len(self) - 1, -1, -1):
-            rhs = self[i].rhs_symbols
-            for j in range(i - 1, -1, -1):
-                statement = self[j]
-                if (
-                    isinstance(statement, Assignment)
-                    and statement.symbol in rhs
-                    or isinstance(statement, ODESystem)
-                    and not rhs.isdisjoint(statement.amounts)
-                ):
-                    graph.add_edge(i, j)
-        return graph
+        """Create a graph of dependencies between statements
+
+        The graph is created once and reused
+        """
+        if self._dependency_graph is None:
+            definitions = self._get_definitions()
+            graph = nx.DiGraph()
+            for i, statement in enumerate(self._statements):
+                for symbol in statement.rhs_symbols:
+                    for j in definitions.get(symbol, ()):
+                        if j >= i:
+                            break
+                        graph.add_edge(i, j)
+            self._dependency_graph = nx.freeze(graph)
+        return self._dependency_graph
 
     def direct_dependencies(self, statement):
         """Find all direct dependencies of a statement
@@ -2141,10 +2166,8 @@ class Statements(Sequence, Immutable):
         """
         g = self._create_dependency_graph()
         index = self.index(statement)
-        succ = sorted(list(g.successors(index)))
-        stats = Statements()
-        stats._statements = [self[i] for i in succ]
-        return stats
+        succ = sorted(g.successors(index))
+        return Statements(self[i] for i in succ)
 
     def dependencies(self, symbol_or_statement):
         """Find all dependencies of a symbol or statement
@@ -2174,16 +2197,9 @@ class Statements(Sequence, Immutable):
                 if isinstance(symbol_or_statement, str)
                 else symbol_or_statement
             )
-            for i in range(len(self) - 1, -1, -1):
-                statement = self[i]
-                if (
-                    isinstance(statement, Assignment)
-                    and statement.symbol == symbol
-                    or isinstance(statement, ODESystem)
-                    and symbol in statement.amounts
-                ):
-                    break
-            else:
+            try:
+                i = self._get_definitions()[symbol][-1]
+            except KeyError:
                 raise KeyError(f"Could not find symbol {symbol}")
         g = self._create_dependency_graph()
         symbs = self[i].rhs_symbols
@@ -2263,16 +2279,15 @@ class Statements(Sequence, Immutable):
         """
         if isinstance(expression, str):
             expression = parse_expr(expression)
-        for statement in reversed(self):
-            if isinstance(statement, ODESystem):
-                raise ValueError(
-                    "ODESystem not supported by full_expression. Use the properties before_odes "
-                    "or after_odes."
-                )
-            expression = subs(
-                expression, {statement.symbol: statement.expression}, simultaneous=True
+        if any(isinstance(statement, ODESystem) for statement in self):
+            raise ValueError(
+                "ODESystem not supported by full_expression. Use the properties before_odes "
+                "or after_odes."
             )
-        return expression
+        # NOTE The substitutions are done with symengine since this is a hot path
+        return substitute_assignments(
+            expression, [(statement.symbol, statement.expression) for statement in self]
+        )
 
     def __eq__(self, other):
         if len(self) != len(other):
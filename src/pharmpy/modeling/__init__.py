@@ -78,6 +78,7 @@ from .estimation_steps import (
     set_evaluation_step,
 )
 from .evaluation import (
+    create_model_evaluator,
     evaluate_epsilon_gradient,
     evaluate_eta_gradient,
     evaluate_expression,
@@ -256,6 +257,7 @@ __all__ = [
     'create_basic_pk_model',
     'create_config_template',
     'create_joint_distribution',
+    'create_model_evaluator',
     'create_rng',
     'create_symbol',
     'deidentify_data',
@@ -662,42 +662,32 @@ def expand_additional_doses(model: Model, flag: bool = False):
     idv = model.datainfo.idv_column.name
     idcol = model.datainfo.id_column.name
 
-    df = model.dataset.copy()
+    df = model.dataset
 
     try:
         event = model.datainfo.typeix['event'][0].name
     except IndexError:
-        df['_RESETGROUP'] = 1.0
+        resetgroup = np.ones(len(df))
     else:
-        df['_FLAG'] = df[event] >= 3
-        df['_RESETGROUP'] = df.groupby('ID')['_FLAG'].cumsum()
-        df.drop('_FLAG', axis=1, inplace=True)
-
-    def fn(a):
-        if a[addl] == 0:
-            times = [a[idv]]
-            expanded = [False]
-        else:
-            length = int(a[addl])
-            times = [a[ii] * x + a[idv] for x in range(length + 1)]
-            expanded = [False] + [True] * length
-        a['_TIMES'] = times
-        a['_EXPANDED'] = expanded
-        return a
-
-    df = df.apply(fn, axis=1)
-    df = df.apply(lambda x: x.explode() if x.name in ['_TIMES', '_EXPANDED'] else x)
-    df = df.astype({'_EXPANDED': np.bool_})
-    df = df.groupby([idcol, '_RESETGROUP'], group_keys=False).apply(
-        lambda x: x.sort_values(by='_TIMES', kind='stable')
-    )
-    df[idv] = df['_TIMES']
-    df.drop(['_TIMES', '_RESETGROUP'], axis=1, inplace=True)
+        resetgroup = (df[event] >= 3).groupby(df[idcol]).cumsum().to_numpy()
+
+    # NOTE Each record is repeated once for itself and once for each additional dose
+    counts = df[addl].to_numpy().astype(np.int64) + 1
+    rows = np.repeat(np.arange(len(df)), counts)
+    k = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    time = df[idv].to_numpy()[rows]
+    times = np.where(k == 0, time, time + df[ii].to_numpy()[rows] * k)
+
+    # NOTE Sort the records of each ID and reset group on time keeping the order of ties
+    order = np.lexsort((times, resetgroup[rows], df[idcol].to_numpy()[rows]))
+    df = df.take(rows[order]).reset_index(drop=True)
+    df[idv] = times[order]
+    expanded = k[order] > 0
     if flag:
-        df.rename(columns={'_EXPANDED': 'EXPANDED'}, inplace=True)
+        df['EXPANDED'] = expanded
     else:
-        df.drop([addl, ii, '_EXPANDED'], axis=1, inplace=True)
-    model = model.replace(dataset=df.reset_index(drop=True))
+        df.drop([addl, ii], axis=1, inplace=True)
+    model = model.replace(dataset=df)
     return model.update_source()
 
 
@@ -740,12 +730,10 @@ def get_doseid(model: Model):
     except IndexError:
         raise DatasetError('Could not identify dosing rows in dataset')
 
-    df = model.dataset.copy()
-    df['DOSEID'] = df[dose]
-    df.loc[df['DOSEID'] > 0, 'DOSEID'] = 1
-    df['DOSEID'] = df['DOSEID'].astype(int)
+    df = model.dataset
     idcol = model.datainfo.id_column.name
-    df['DOSEID'] = df.groupby(idcol)['DOSEID'].cumsum()
+    idvcol = model.datainfo.idv_column.name
+    doseid = df[dose].mask(df[dose] > 0, 1).astype(int).groupby(df[idcol]).cumsum()
 
     # Adjust for dose and observation at the same time point
     # Observation is moved to previous dose group
@@ -753,38 +741,35 @@ def get_doseid(model: Model):
     try:
         eventcol = model.datainfo.typeix['event'][0].name
     except IndexError:
-        df['_RESETGROUP'] = 1.0
+        resetgroup = pd.Series(1.0, index=df.index)
     else:
-        df['_FLAG'] = df[eventcol] >= 3
-        df['_RESETGROUP'] = df.groupby('ID')['_FLAG'].cumsum()
+        resetgroup = (df[eventcol] >= 3).groupby(df[idcol]).cumsum()
 
     try:
         ss = model.datainfo.typeix['ss'][0].name
     except IndexError:
         ss = None
 
-    idvcol = model.datainfo.idv_column.name
-    ser = df.groupby([idcol, idvcol, '_RESETGROUP']).size()
-    nonunique = ser[ser > 1]
-
-    for i, time, _ in nonunique.index:
-        groupind = df[(df[idcol] == i) & (df[idvcol] == time)].index
-        obsind = df[(df[idcol] == i) & (df[idvcol] == time) & (df[dose] == 0)].index
-        doseind = set(groupind) - set(obsind)
-        if not doseind:
-            continue
-        maxind = max(doseind)
-        for index in obsind:
-            if 0 in groupind:  # This is the first dose
-                continue
-            if maxind > index:  # Dose record is after the observation
-                continue
-            if ss and df.loc[maxind, ss] > 0:  # No swap for SS dosing
-                continue
-            curdoseid = df.loc[index, 'DOSEID']
-            df.loc[index, 'DOSEID'] = curdoseid - 1
-
-    return df['DOSEID'].copy()
+    labels = pd.Series(df.index, index=df.index)
+    keys = [df[idcol], df[idvcol]]
+    # NOTE Number of groups of records at the same time point within a reset group with
+    # more than one record. Observations are moved once for each such group.
+    size = labels.groupby(keys + [resetgroup]).transform('size')
+    ngroups = resetgroup.where(size > 1).groupby(keys).transform('nunique').fillna(0)
+    # NOTE Last dose record of all records of the individual at the same time point
+    lastdose = labels.where(df[dose] != 0).groupby(keys).transform('max')
+    move = (ngroups > 0) & (df[dose] == 0) & (labels > lastdose)
+    if 0 in df.index:
+        # NOTE No swap in the group of the first record of the dataset (the first dose)
+        first = df.loc[0]
+        move &= ~((df[idcol] == first[idcol]) & (df[idvcol] == first[idvcol]))
+    if ss and move.any():
+        # NOTE No swap for SS dosing
+        lastss = df.loc[lastdose[move].astype(df.index.dtype), ss].to_numpy()
+        move[move] = ~(lastss > 0)
+
+    doseid = doseid - (ngroups * move).astype(int)
+    return doseid.rename('DOSEID')
 
 
 def get_mdv(model: Model):
@@ -1007,11 +992,7 @@ def add_time_after_dose(model: Model):
     df['_DOSEID'] = get_doseid(temp)
 
     # Sort in case DOSEIDs are non-increasing
-    df = (
-        df.groupby(idlab)
-        .apply(lambda x: x.sort_values(by=['_DOSEID'], kind='stable', ignore_index=True))
-        .reset_index(drop=True)
-    )
+    df = df.sort_values(by=[idlab, '_DOSEID'], kind='stable', ignore_index=True)
 
     df['TAD'] = df.groupby([idlab, '_DOSEID'])['_NEWTIME'].diff().fillna(0)
     df['TAD'] = df.groupby([idlab, '_DOSEID'])['TAD'].cumsum()
@@ -1028,20 +1009,15 @@ def add_time_after_dose(model: Model):
     except IndexError:
         pass
     else:
-
-        def fn(df):
-            if len(df) < 2:
-                return df
-            ii_time = None
-            for i in df.index:
-                if df.loc[i, ss] > 0:
-                    ii_time = df.loc[i, ii]
-                else:
-                    assert ii_time is not None
-                    df.loc[i, 'TAD'] = ii_time
-            return df
-
-        df = df.groupby([idlab, idv, '_DOSEID'], group_keys=False).apply(fn)
+        # NOTE In groups of more than one record all records that are not SS doses get the
+        # II of the previous SS dose of the group
+        keys = [df[idlab], df[idv], df['_DOSEID']]
+        ssdose = df[ss] > 0
+        position = pd.Series(np.arange(len(df)), index=df.index)
+        lastss = position.where(ssdose).groupby(keys).ffill()
+        imaginary = (df.groupby(keys)[ss].transform('size') > 1) & ~ssdose
+        assert lastss[imaginary].notna().all()
+        df.loc[imaginary, 'TAD'] = df[ii].to_numpy()[lastss[imaginary].astype(int)]
 
     df.drop(columns=['_NEWTIME', '_DOSEID'], inplace=True)
 
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import List, Mapping, Optional, Union
+from collections import ChainMap
+from functools import lru_cache
+from typing import List, Mapping, Optional, Tuple, Union
 
 from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
 from pharmpy.deps import sympy
 from pharmpy.deps.scipy import linalg
-from pharmpy.internals.expr.eval import eval_expr
+from pharmpy.internals.expr.eval import compile_expr
 from pharmpy.internals.expr.parse import parse as parse_expr
 from pharmpy.internals.expr.subs import subs
 from pharmpy.model import Model
@@ -35,6 +37,192 @@ class DataFrameMapping(Mapping['sympy.Symbol', 'np.ndarray']):
         return map(sympy.Symbol, self._df.columns)
 
 
+class ModelEvaluator:
+    """Numeric evaluator of the predictions and gradients of a model
+
+    Create it using :func:`create_model_evaluator`. All outputs are compiled into one
+    numpy function with common subexpressions shared between the outputs. Calling the
+    evaluator does not touch sympy so it can be used inside optimization or simulation loops.
+
+    Attributes
+    ----------
+    parameter_names : list
+        Names of the population parameters in the order expected by the evaluator
+    eta_names : list
+        Names of the etas in the order expected by the evaluator
+    data_columns : list
+        Names of the dataset columns in the order expected by the evaluator
+    output_names : list
+        Names of the evaluated outputs in the order they are returned
+    """
+
+    def __init__(self, parameter_names, eta_names, data_columns, output_names, id_column, fn):
+        self.parameter_names = parameter_names
+        self.eta_names = eta_names
+        self.data_columns = data_columns
+        self.output_names = output_names
+        self._id_column = id_column
+        self._fn = fn
+
+    def __call__(self, parameters, etas, data):
+        """Evaluate all outputs
+
+        Parameters
+        ----------
+        parameters : np.ndarray
+            Parameter values in the order of parameter_names
+        etas : np.ndarray
+            Eta values for each data record, one column for each name in eta_names
+        data : np.ndarray
+            Data records, one column for each name in data_columns
+
+        Returns
+        -------
+        np.ndarray
+            One column for each output in output_names and one row for each data record
+        """
+        data = np.asarray(data, dtype=np.float64)
+        etas = np.asarray(etas, dtype=np.float64)
+        n = len(data)
+        res = np.empty((n, len(self.output_names)))
+        outputs = self._fn(np.asarray(parameters, dtype=np.float64), etas.T, data.T)
+        for i, output in enumerate(outputs):
+            res[:, i] = output
+        return res
+
+    def data_array(self, dataset: pd.DataFrame) -> np.ndarray:
+        """Extract the columns needed by the evaluator from a dataset"""
+        return dataset[self.data_columns].to_numpy(dtype=np.float64)
+
+    def eta_array(self, dataset: pd.DataFrame, etas: Optional[pd.DataFrame] = None) -> np.ndarray:
+        """Expand individual eta values to one row for each data record of a dataset
+
+        Etas not given are set to 0.
+        """
+        if etas is None:
+            return np.zeros((len(dataset), len(self.eta_names)))
+        etas = etas.reindex(columns=self.eta_names, fill_value=0.0)
+        return etas.loc[dataset[self._id_column]].to_numpy(dtype=np.float64)
+
+
+def create_model_evaluator(model: Model) -> ModelEvaluator:
+    """Create a compiled evaluator of the predictions and gradients of a model
+
+    The evaluator computes the population prediction (PRED), the individual
+    prediction (IPRED), the eta gradient (dF/dETA) and the epsilon gradient
+    (dY/dEPS) for all data records jointly. It is created once and can then be
+    called repeatedly with new parameter values, etas and data given as numpy arrays.
+
+    This function currently only support models without ODE systems
+
+    Parameters
+    ----------
+    model : Model
+        Pharmpy model
+
+    Returns
+    -------
+    ModelEvaluator
+        Evaluator object
+
+    Examples
+    --------
+    >>> from pharmpy.modeling import load_example_model, create_model_evaluator
+    >>> from pharmpy.tools import load_example_modelfit_results
+    >>> model = load_example_model("pheno_linear")
+    >>> results = load_example_modelfit_results("pheno_linear")
+    >>> evaluator = create_model_evaluator(model)
+    >>> evaluator.output_names
+    ['PRED', 'IPRED', 'dF/dETA_1', 'dF/dETA_2', 'dY/dEPS_1']
+    >>> parameters = results.parameter_estimates[evaluator.parameter_names].to_numpy()
+    >>> etas = evaluator.eta_array(model.dataset, results.individual_estimates)
+    >>> evaluator(parameters, etas, evaluator.data_array(model.dataset))[1]
+    array([ 28.17991029,  28.88185875,  -9.32589257, -19.56228908,  28.88185875])
+
+    See also
+    --------
+    evaluate_population_prediction : Evaluate the population prediction
+    evaluate_individual_prediction : Evaluate the individual prediction
+    evaluate_eta_gradient : Evaluate the eta gradient
+    evaluate_epsilon_gradient : Evaluate the epsilon gradient
+    """
+    return _compile_model_evaluator(_ModelKey(model, tuple(model.dataset.columns)))
+
+
+class _ModelKey:
+    """Cache key for the parts of a model that compiled evaluators depend on"""
+
+    def __init__(self, model: Model, columns: Tuple[str, ...]):
+        self.model = model
+        self.columns = columns
+        self._key = (
+            model.statements,
+            model.random_variables,
+            model.dependent_variables,
+            tuple(model.parameters.names),
+            model.datainfo.id_column.name,
+            columns,
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, _ModelKey) and self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+
+@lru_cache(maxsize=16)
+def _compile_model_evaluator(key: _ModelKey) -> ModelEvaluator:
+    model = key.model
+    eta_names = model.random_variables.etas.names
+    eps_names = model.random_variables.epsilons.names
+    ipred = get_individual_prediction_expression(model)
+    pred = get_population_prediction_expression(model)
+    eta_gradient = calculate_eta_gradient_expression(model)
+    eps_repl = {sympy.Symbol(eps): 0 for eps in eps_names}
+    eps_gradient = [subs(x, eps_repl) for x in calculate_epsilon_gradient_expression(model)]
+    exprs = [pred, ipred, *eta_gradient, *eps_gradient]
+    output_names = [
+        'PRED',
+        'IPRED',
+        *(f'dF/d{eta}' for eta in eta_names),
+        *(f'dY/d{eps}' for eps in eps_names),
+    ]
+
+    parameter_names = model.parameters.names
+    free_symbols = set().union(*(expr.free_symbols for expr in exprs))
+    names = {symb.name for symb in free_symbols}
+    known = set(parameter_names).union(eta_names)
+    data_columns = [col for col in key.columns if col in names and col not in known]
+    unknown = names - known - set(data_columns)
+    if unknown:
+        raise ValueError(f'Cannot evaluate expressions depending on: {sorted(unknown)}')
+
+    # NOTE Substitution allows to use cse. Otherwise weird things happen with
+    # symbols that look like function eval (e.g. ETA(1), THETA(3)).
+    groups = [parameter_names, eta_names, data_columns]
+    substitutes = [
+        [sympy.Symbol(f'__{prefix}{i}') for i in range(len(group))]
+        for prefix, group in zip(('p', 'e', 'd'), groups)
+    ]
+    mapping = {
+        sympy.Symbol(name): substitute
+        for group, group_substitutes in zip(groups, substitutes)
+        for name, substitute in zip(group, group_substitutes)
+    }
+    exprs = [subs(expr, mapping, simultaneous=True) for expr in exprs]
+    fn = sympy.lambdify(substitutes, exprs, modules='numpy', cse=True)
+
+    return ModelEvaluator(
+        parameter_names,
+        eta_names,
+        data_columns,
+        output_names,
+        model.datainfo.id_column.name,
+        fn,
+    )
+
+
 def evaluate_expression(
     model: Model,
     expression: Union[str, sympy.Expr],
@@ -83,16 +271,18 @@ def evaluate_expression(
     Length: 744, dtype: float64
 
     """
-    expression = parse_expr(expression)
-    full_expr = model.statements.before_odes.full_expression(expression)
-    inits = model.parameters.inits
-    mapping = inits if parameter_estimates is None else {**inits, **parameter_estimates}
-    expr = subs(full_expr, mapping)
-
     df = model.dataset
+    fn = _compile_model_expression(_ModelKey(model, tuple(df.columns)), parse_expr(expression))
+    parameters = _parameter_values(model, parameter_estimates)
+    mapping = {sympy.Symbol(name): value for name, value in parameters.items()}
+    array = fn(len(df), ChainMap(mapping, DataFrameMapping(df)))
+    return pd.Series(np.array(array, dtype=np.float64))
+
 
-    array = eval_expr(expr, len(df), DataFrameMapping(df))
-    return pd.Series(array)
+@lru_cache(maxsize=256)
+def _compile_model_expression(key: _ModelKey, expression: sympy.Expr):
+    full_expr = key.model.statements.before_odes.full_expression(expression)
+    return compile_expr(full_expr)
 
 
 def evaluate_population_prediction(
@@ -146,14 +336,9 @@ def evaluate_population_prediction(
     --------
     evaluate_individual_prediction : Evaluate the individual prediction
     """
-    y = get_population_prediction_expression(model)
-    mapping = model.parameters.inits if parameters is None else parameters
-    expr = subs(y, mapping)
-
     df = model.dataset if dataset is None else dataset
-
-    pred = eval_expr(expr, len(df), DataFrameMapping(df))
-    return pd.Series(pred, name='PRED')
+    out = _evaluate(model, parameters, df, None, ['PRED'])
+    return pd.Series(out[:, 0], name='PRED')
 
 
 def evaluate_individual_prediction(
@@ -215,33 +400,35 @@ def evaluate_individual_prediction(
     evaluate_population_prediction : Evaluate the population prediction
     """
 
-    y = get_individual_prediction_expression(model)
-    mapping = model.parameters.inits if parameters is None else parameters
-    y = subs(y, mapping)
-
     df = model.dataset if dataset is None else dataset
+    out = _evaluate(model, parameters, df, etas, ['IPRED'])
+    return pd.Series(out[:, 0], name='IPRED')
 
-    idcol = model.datainfo.id_column.name
 
-    _etas = (
-        pd.DataFrame(
-            0,
-            index=df[idcol].unique(),
-            columns=model.random_variables.etas.names,
-        )
-        if etas is None
-        else etas
-    )
+def _parameter_values(model: Model, parameters: Optional[ParameterMap]):
+    inits = model.parameters.inits
+    if parameters is None:
+        return inits
+    return {**inits, **{str(name): value for name, value in parameters.items()}}
 
-    _df = df.join(_etas, on=idcol)
 
-    ipred = eval_expr(y, len(_df), DataFrameMapping(_df))
-    return pd.Series(ipred, name='IPRED')
+def _evaluate(
+    model: Model,
+    parameters: Optional[ParameterMap],
+    dataset: pd.DataFrame,
+    etas: Optional[pd.DataFrame],
+    output_names: List[str],
+) -> np.ndarray:
+    evaluator = _compile_model_evaluator(_ModelKey(model, tuple(dataset.columns)))
+    values = _parameter_values(model, parameters)
+    parameter_array = np.array([float(values[name]) for name in evaluator.parameter_names])
+    eta_array = evaluator.eta_array(dataset, etas)
+    out = evaluator(parameter_array, eta_array, evaluator.data_array(dataset))
+    return out[:, [evaluator.output_names.index(name) for name in output_names]]
 
 
-def _replace_parameters(model: Model, y: List[sympy.Expr], parameters: Optional[ParameterMap]):
-    mapping = model.parameters.inits if parameters is None else parameters
-    return [subs(x, mapping) for x in y]
+def _default_etas(model: Model, etas: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    return model.initial_individual_estimates if etas is None else etas
 
 
 def evaluate_eta_gradient(
@@ -305,33 +492,10 @@ def evaluate_eta_gradient(
     evaluate_epsilon_gradient : Evaluate the epsilon gradient
     """
 
-    y = calculate_eta_gradient_expression(model)
-    y = _replace_parameters(model, y, parameters)
-
     df = model.dataset if dataset is None else dataset
-    idcol = model.datainfo.id_column.name
-
-    if etas is not None:
-        _etas = etas
-    elif model.initial_individual_estimates is not None:
-        _etas = model.initial_individual_estimates
-    else:
-        _etas = pd.DataFrame(
-            0,
-            index=df[idcol].unique(),
-            columns=model.random_variables.etas.names,
-        )
-
     derivative_names = [f'dF/d{eta}' for eta in model.random_variables.etas.names]
-
-    _df = df.join(_etas, on=idcol)
-
-    return pd.DataFrame(
-        {
-            name: eval_expr(expr, len(_df), DataFrameMapping(_df))
-            for expr, name in zip(y, derivative_names)
-        }
-    )
+    out = _evaluate(model, parameters, df, _default_etas(model, etas), derivative_names)
+    return pd.DataFrame(out, columns=derivative_names)
 
 
 def evaluate_epsilon_gradient(
@@ -395,36 +559,10 @@ def evaluate_epsilon_gradient(
     evaluate_eta_gradient : Evaluate the eta gradient
     """
 
-    y = calculate_epsilon_gradient_expression(model)
-    y = _replace_parameters(model, y, parameters)
-    eps_names = model.random_variables.epsilons.names
-    repl = {sympy.Symbol(eps): 0 for eps in eps_names}
-    y = [subs(x, repl) for x in y]
-
     df = model.dataset if dataset is None else dataset
-
-    idcol = model.datainfo.id_column.name
-
-    if etas is not None:
-        _etas = etas
-    elif model.initial_individual_estimates is not None:
-        _etas = model.initial_individual_estimates
-    else:
-        _etas = pd.DataFrame(
-            0,
-            index=df[idcol].unique(),
-            columns=model.random_variables.etas.names,
-        )
-
-    _df = df.join(_etas, on=idcol)
-    derivative_names = [f'dY/d{eps}' for eps in eps_names]
-
-    return pd.DataFrame(
-        {
-            name: eval_expr(expr, len(_df), DataFrameMapping(_df))
-            for expr, name in zip(y, derivative_names)
-        }
-    )
+    derivative_names = [f'dY/d{eps}' for eps in model.random_variables.epsilons.names]
+    out = _evaluate(model, parameters, df, _default_etas(model, etas), derivative_names)
+    return pd.DataFrame(out, columns=derivative_names)
 
 
 def evaluate_weighted_residuals(
@@ -485,19 +623,14 @@ def evaluate_weighted_residuals(
     omega = np.float64(omega)
     sigma = np.float64(sigma)
     df = model.dataset if dataset is None else dataset
-    # FIXME: Could have option to gradients to set all etas 0
-    etas = pd.DataFrame(
-        0,
-        index=df[model.datainfo.id_column.name].unique(),
-        columns=model.random_variables.etas.names,
-    )
-    G = evaluate_eta_gradient(model, etas=etas, parameters=parameters, dataset=dataset)
-    H = evaluate_epsilon_gradient(model, etas=etas, parameters=parameters, dataset=dataset)
-    F = evaluate_population_prediction(model)
+    eta_names = [f'dF/d{eta}' for eta in model.random_variables.etas.names]
+    eps_names = [f'dY/d{eps}' for eps in model.random_variables.epsilons.names]
+    # NOTE All gradients and the prediction are evaluated with etas set to 0
+    out = _evaluate(model, parameters, df, None, ['PRED', *eta_names, *eps_names])
     index = df[model.datainfo.id_column.name]
-    G.index = index
-    H.index = index
-    F.index = index
+    F = pd.Series(out[:, 0], index=index)
+    G = pd.DataFrame(out[:, 1 : len(eta_names) + 1], index=index)
+    H = pd.DataFrame(out[:, len(eta_names) + 1 :], index=index)
     WRES = np.float64([])
     for i in df[model.datainfo.id_column.name].unique():
         Gi = np.float64(G.loc[[i]])
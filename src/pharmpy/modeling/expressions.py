@@ -7,6 +7,7 @@ from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
 
 from pharmpy.deps import sympy
 from pharmpy.internals.expr.assumptions import assume_all
+from pharmpy.internals.expr.backend import diff, substitute_assignments
 from pharmpy.internals.expr.leaves import free_images_and_symbols
 from pharmpy.internals.expr.parse import parse as parse_expr
 from pharmpy.internals.expr.subs import subs
@@ -64,10 +65,7 @@ def get_observation_expression(model: Model):
     else:
         raise ValueError('Could not locate dependent variable expression')
 
-    for j in range(i, -1, -1):
-        y = subs(y, {stats[j].symbol: stats[j].expression}, simultaneous=True)
-
-    return y
+    return substitute_assignments(y, [(s.symbol, s.expression) for s in stats[: i + 1]])
 
 
 def get_individual_prediction_expression(model: Model):
@@ -164,7 +162,7 @@ def calculate_eta_gradient_expression(model: Model):
     calculate_epsilon_gradient_expression : Epsilon gradient
     """
     y = get_individual_prediction_expression(model)
-    d = [y.diff(sympy.Symbol(x)) for x in model.random_variables.etas.names]
+    d = diff(y, map(sympy.Symbol, model.random_variables.etas.names))
     return d
 
 
@@ -196,7 +194,7 @@ def calculate_epsilon_gradient_expression(model: Model):
     """
 
     y = get_observation_expression(model)
-    d = [y.diff(sympy.Symbol(x)) for x in model.random_variables.epsilons.names]
+    d = diff(y, map(sympy.Symbol, model.random_variables.epsilons.names))
     return d
 
 
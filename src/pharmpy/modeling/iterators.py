@@ -5,19 +5,27 @@ datasets for each iteration.
 
 Currenly contains:
 
-1. Omit - Can be used for cdd
+1. Omit - Can be used for cdd and crossval
 2. Resample - Can be used by bootstrap
 """
 
 import warnings
 from collections.abc import Mapping
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
 from pharmpy.internals.math import round_and_keep_sum
 from pharmpy.model import Model
 
+from .parameter_sampling import create_rng
+
+
+def _run_positions(starts, lengths):
+    # Concatenated positions of runs with the given starts and lengths
+    run_starts = np.cumsum(lengths) - lengths
+    return np.arange(lengths.sum()) + np.repeat(starts - run_starts, lengths)
+
 
 class DatasetIterator:
     """Base class for iterator classes that generate new datasets from an input dataset
@@ -73,33 +81,71 @@ class DatasetIterator:
 class Omit(DatasetIterator):
     """Iterate over omissions of a certain group in a dataset. One group is omitted at a time.
 
+    Instead of single groups, arbitrary cases of groups or k folds of the groups can be
+    omitted one at a time, e.g. for crossval.
+
     :param dataset_or_model: DataFrame to iterate over or a model from which to use the dataset
     :param colname group: Name of the column to use for grouping
     :param name_pattern: Name to use for generated datasets. A number starting from 1 will
         be put in the placeholder.
-    :returns: Tuple of DataFrame and the omitted group
+    :param cases: List of cases, each a list of groups to omit together
+    :param Int folds: Number of folds to split the groups into in order of appearance. One
+        fold is omitted at a time.
+    :returns: Tuple of DataFrame and the omitted group or case
     """
 
-    def __init__(self, dataset_or_model, group, name_pattern='omitted_{}'):
+    def __init__(self, dataset_or_model, group, name_pattern='omitted_{}', cases=None, folds=None):
         df = self._retrieve_dataset(dataset_or_model)
-        self._unique_groups = df[group].unique()
-        if len(self._unique_groups) == 1:
+        unique_groups = df[group].unique()
+        if len(unique_groups) == 1:
             raise ValueError("Cannot create an Omit iterator as the number of unique groups is 1.")
+        if cases is not None and folds is not None:
+            raise ValueError("Cannot create an Omit iterator with both cases and folds.")
+        if folds is not None:
+            if not 1 < folds <= len(unique_groups):
+                raise ValueError(
+                    f'The number of folds ({folds}) must be between 2 and the number of groups '
+                    f'({len(unique_groups)}).'
+                )
+            cases = [fold.tolist() for fold in np.array_split(unique_groups, folds)]
+
+        # NOTE The rows of each group are located once so that each omission
+        # can be created with a single take
+        codes, uniques = pd.factorize(df[group])
+        self._order = np.argsort(codes, kind='stable')
+        self._counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        self._starts = np.cumsum(self._counts) - self._counts + np.count_nonzero(codes < 0)
+        self._group_index = pd.Index(uniques)
+
         self._df = df
         self._group = group
-        super().__init__(len(self._unique_groups), name_pattern=name_pattern)
+        self._unique_groups = unique_groups
+        self._cases = cases
+        super().__init__(
+            len(unique_groups) if cases is None else len(cases), name_pattern=name_pattern
+        )
 
     def __next__(self):
         self._check_exhausted()
-        df = self._df
-        next_group = self._unique_groups[self._next - 1]
-        new_df = df[df[self._group] != next_group]
+        if self._cases is None:
+            case = self._unique_groups[self._next - 1]
+            codes = self._group_index.get_indexer([case])
+        else:
+            case = self._cases[self._next - 1]
+            codes = self._group_index.get_indexer(case)
+        codes = codes[codes >= 0]
+        omitted = self._order[_run_positions(self._starts[codes], self._counts[codes])]
+        new_df = self._df.take(np.delete(np.arange(len(self._df)), omitted))
         self._prepare_next(new_df)
-        return self._combine_dataset(new_df), next_group
+        return self._combine_dataset(new_df), case
 
 
 def omit_data(
-    dataset_or_model: Union[pd.DataFrame, Model], group: str, name_pattern: str = 'omitted_{}'
+    dataset_or_model: Union[pd.DataFrame, Model],
+    group: str,
+    name_pattern: str = 'omitted_{}',
+    cases: Optional[List[list]] = None,
+    folds: Optional[int] = None,
 ):
     """Iterate over omissions of a certain group in a dataset. One group is omitted at a time.
 
@@ -111,13 +157,19 @@ def omit_data(
         Name of the column to use for grouping
     name_pattern : str
         Name to use for generated datasets. A number starting from 1 will be put in the placeholder.
+    cases : list
+        List of cases, each a list of groups to omit together. The default is to omit one group
+        at a time.
+    folds : int
+        Number of folds to split the groups into in order of appearance. One fold is omitted
+        at a time.
 
     Returns
     -------
     iterator
-        Iterator yielding tuples of models/dataframes and the omited group
+        Iterator yielding tuples of models/dataframes and the omited group or case
     """
-    return Omit(dataset_or_model, group, name_pattern)
+    return Omit(dataset_or_model, group, name_pattern, cases=cases, folds=folds)
 
 
 class Resample(DatasetIterator):
@@ -144,6 +196,8 @@ class Resample(DatasetIterator):
         without replacement
     :param name_pattern: Name to use for generated datasets. A number starting from 1 will
         be put in the placeholder.
+    :param rng: Random number generator or seed. The default is to use the global numpy
+        random state.
 
     :returns: A tuple of a resampled DataFrame and a list of resampled groups in order
     """
@@ -158,11 +212,20 @@ class Resample(DatasetIterator):
         replace=False,
         name_pattern='resample_{}',
         name=None,
+        rng=None,
     ):
         df = self._retrieve_dataset(dataset_or_model)
         unique_groups = df[group].unique()
         numgroups = len(unique_groups)
 
+        # NOTE The rows of each group are located once so that each resample
+        # can be created with a single take
+        codes, uniques = pd.factorize(df[group])
+        self._order = np.argsort(codes, kind='stable')
+        self._counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        self._starts = np.cumsum(self._counts) - self._counts + np.count_nonzero(codes < 0)
+        self._group_index = pd.Index(uniques)
+
         if sample_size is None:
             sample_size = numgroups
 
@@ -206,6 +269,7 @@ class Resample(DatasetIterator):
         self._replace = replace
         self._stratas = stratas
         self._sample_size_dict = sample_size_dict
+        self._choice = np.random.choice if rng is None else create_rng(rng).choice
         if resamples > 1 and name:
             warnings.warn(
                 f'One name was provided despite having multiple resamples, falling back to '
@@ -221,17 +285,11 @@ class Resample(DatasetIterator):
 
         random_groups = []
         for strata in self._sample_size_dict:
-            random_groups += np.random.choice(
+            random_groups += self._choice(
                 self._stratas[strata], size=self._sample_size_dict[strata], replace=self._replace
             ).tolist()
 
-        new_df = pd.DataFrame()
-        # Build the dataset given the random_groups list
-        for grp_id, new_grp in zip(random_groups, range(1, len(random_groups) + 1)):
-            sub = self._df.loc[self._df[self._group] == grp_id].copy()
-            sub[self._group] = new_grp
-            new_df = pd.concat([new_df, sub])
-        new_df.reset_index(inplace=True, drop=True)
+        new_df = self._take(random_groups)
         if self._name:
             new_df.name = self._name
         else:
@@ -239,6 +297,15 @@ class Resample(DatasetIterator):
 
         return self._combine_dataset(new_df), random_groups
 
+    def _take(self, groups):
+        # Build the dataset given the groups with the groups renumbered from 1
+        codes = self._group_index.get_indexer(groups)
+        lengths = self._counts[codes]
+        positions = _run_positions(self._starts[codes], lengths)
+        new_df = self._df.take(self._order[positions]).reset_index(drop=True)
+        new_df[self._group] = np.repeat(np.arange(1, len(groups) + 1), lengths)
+        return new_df
+
 
 def resample_data(
     dataset_or_model: Union[pd.DataFrame, Model],
@@ -249,6 +316,7 @@ def resample_data(
     replace: bool = False,
     name_pattern: str = 'resample_{}',
     name: Optional[str] = None,
+    rng: Optional[Union[np.random.Generator, int]] = None,
 ):
     """Iterate over resamples of a dataset.
 
@@ -282,6 +350,8 @@ def resample_data(
         be put in the placeholder.
     name : str
         Option to name pattern in case of only one resample
+    rng : Generator or int
+        Random number generator or seed. The default is to use the global numpy random state.
 
     Returns
     -------
@@ -297,4 +367,5 @@ def resample_data(
         replace=replace,
         name_pattern=name_pattern,
         name=name,
+        rng=rng,
     )
@@ -1,9 +1,9 @@
 import warnings
-from functools import partial
-from typing import List, Optional, Union
+from typing import List, Literal, Optional, Union
 
 from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
+from pharmpy.deps.scipy import special
 from pharmpy.internals.math import is_posdef, nearest_postive_semidefinite
 from pharmpy.model import Model
 
@@ -43,22 +43,107 @@ def create_rng(seed: Optional[Union[np.random.Generator, int]] = None):
     return rng
 
 
-def _sample_truncated_joint_normal(sigma, mu, a, b, n, rng):
-    """Give an array of samples from the truncated joint normal distributon using sample rejection
+def _sample_truncated_joint_normal(sigma, mu, a, b, n, rng, method='auto'):
+    """Give an array of samples from the truncated joint normal distributon
     - mu, sigma - parameters for the normal distribution
     - a, b - vectors of lower and upper limits for each random variable
     - n - number of samples
+    - method - 'rejection', 'gibbs' or 'auto' for rejection sampling falling back to
+      gibbs sampling when the acceptance rate is low
     """
+    return _truncated_joint_normal_sampler(sigma, method=method)(mu, a, b, n=n, rng=rng)
+
+
+# NOTE Rejection sampling switches to gibbs sampling below this acceptance rate
+MIN_ACCEPTANCE_RATE = 0.05
+# NOTE The acceptance rate is only trusted after this many proposals so that a small
+# batch without accepted samples does not cause a switch to gibbs sampling
+MIN_PROPOSALS = 500
+# NOTE Only oversample below this acceptance rate. Above it the few extra batches are
+# cheap and the samples are the same as drawn by multivariate_normal.
+OVERSAMPLING_ACCEPTANCE_RATE = 0.5
+# NOTE Number of sweeps through all variables before a gibbs sample is used
+GIBBS_BURN_IN = 50
+
+
+def _truncated_joint_normal_sampler(sigma, method='auto'):
+    """Create a function sampling from the truncated joint normal distribution
+
+    The covariance matrix is factorized once and reused for all calls. Rejection
+    sampling draws batches sized after the observed acceptance rate and falls back to
+    gibbs sampling of the remaining samples when the acceptance rate of at least
+    MIN_PROPOSALS proposals is low.
+    """
+    if method not in ('auto', 'rejection', 'gibbs'):
+        raise ValueError(f'Unknown sampling method {method}. Use auto, rejection or gibbs')
     if not is_posdef(sigma):
         raise ValueError("Covariance matrix not positive definite")
-    kept_samples = np.empty((0, len(mu)))
-    remaining = n
-    while remaining > 0:
-        samples = rng.multivariate_normal(mu, sigma, size=remaining, check_valid='ignore')
-        in_range = np.logical_and(samples > a, samples < b).all(axis=1)
-        kept_samples = np.concatenate((kept_samples, samples[in_range]))
-        remaining = n - len(kept_samples)
-    return kept_samples
+    # NOTE Same factorization as Generator.multivariate_normal
+    _, s, vh = np.linalg.svd(sigma)
+    factor = np.sqrt(s)[:, None] * vh
+    precision = np.linalg.inv(sigma)
+
+    def sample(mu, a, b, n, rng):
+        samples = np.empty((n, len(mu)))
+        kept = 0
+        if method != 'gibbs':
+            drawn, n_in_range = 0, 0
+            size = n
+            while kept < n:
+                batch = rng.standard_normal((size, len(mu))) @ factor + mu
+                in_range = np.logical_and(batch > a, batch < b).all(axis=1)
+                accepted = batch[in_range][: n - kept]
+                samples[kept : kept + len(accepted)] = accepted
+                kept += len(accepted)
+                drawn += size
+                n_in_range += np.count_nonzero(in_range)
+                rate = n_in_range / drawn
+                if method == 'auto' and drawn >= MIN_PROPOSALS and rate < MIN_ACCEPTANCE_RATE:
+                    break
+                if rate >= OVERSAMPLING_ACCEPTANCE_RATE:
+                    size = n - kept
+                else:
+                    # NOTE Oversample so that the next batch is likely to be the last and
+                    # so that enough proposals have been drawn to judge the acceptance rate
+                    size = int(np.ceil(1.1 * (n - kept) / max(rate, MIN_ACCEPTANCE_RATE)))
+                    size = max(size, MIN_PROPOSALS - drawn)
+        if kept < n:
+            samples[kept:] = _sample_truncated_joint_normal_gibbs(
+                precision, mu, a, b, n - kept, rng
+            )
+        return samples
+
+    return sample
+
+
+def _sample_truncated_joint_normal_gibbs(precision, mu, a, b, n, rng):
+    # Run n independent chains in parallel starting from the mean moved inside the
+    # bounds and keep the last state of each chain. The conditional distribution of each variable
+    # is a truncated univariate normal that is sampled exactly.
+    x = np.tile(np.clip(mu, a, b), (n, 1))
+    sd = 1 / np.sqrt(np.diag(precision))
+    for _ in range(GIBBS_BURN_IN):
+        for i in range(len(mu)):
+            delta = x - mu
+            cond_mean = (
+                mu[i] - (delta @ precision[i] - delta[:, i] * precision[i, i]) / precision[i, i]
+            )
+            lower = (a[i] - cond_mean) / sd[i]
+            upper = (b[i] - cond_mean) / sd[i]
+            x[:, i] = cond_mean + sd[i] * _sample_truncated_standard_normal(lower, upper, rng)
+    return x
+
+
+def _sample_truncated_standard_normal(lower, upper, rng):
+    # Inverse transform sampling. Intervals in the upper tail are mirrored to the lower
+    # tail where the normal cdf is accurate.
+    flip = lower > 0
+    lower, upper = np.where(flip, -upper, lower), np.where(flip, -lower, upper)
+    p_lower = special.ndtr(lower)
+    p_upper = special.ndtr(upper)
+    x = special.ndtri(p_lower + (p_upper - p_lower) * rng.uniform(size=len(lower)))
+    x = np.clip(x, lower, upper)
+    return np.where(flip, -x, x)
 
 
 def _sample_from_function(
@@ -100,11 +185,11 @@ def _sample_from_function(
     while remaining > 0:
         samples = samplingfn(pe, lower, upper, n=remaining, rng=rng)
         df = pd.DataFrame(samples, columns=parameter_estimates.keys())
+        rvs = model.random_variables
         if not force_posdef:
-            selected = df[df.apply(model.random_variables.validate_parameters, axis=1)]
+            selected = df[rvs.validate_parameters_batch(df)]
         else:
-            rvs = model.random_variables
-            selected = df.transform(lambda row: rvs.nearest_valid_parameters(row), axis=1)
+            selected = rvs.nearest_valid_parameters_batch(df)
         kept_samples = pd.concat((kept_samples, selected))
         remaining = n - len(kept_samples)
         i += 1
@@ -192,6 +277,7 @@ def sample_parameters_from_covariance_matrix(
     force_posdef_covmatrix: bool = False,
     n: int = 1,
     rng: Optional[Union[np.random.Generator, int]] = None,
+    method: Literal['auto', 'rejection', 'gibbs'] = 'auto',
 ):
     """Sample parameter vectors using the covariance matrix
 
@@ -214,6 +300,10 @@ def sample_parameters_from_covariance_matrix(
         Number of samples
     rng : Generator
         Random number generator
+    method : str
+        How to sample within the parameter bounds. 'rejection' for rejection sampling,
+        'gibbs' for gibbs sampling or 'auto' (default) for rejection sampling switching
+        to gibbs sampling if few samples are within the bounds
 
     Returns
     -------
@@ -256,7 +346,7 @@ def sample_parameters_from_covariance_matrix(
         else:
             raise ValueError("Uncertainty covariance matrix not positive-definite")
 
-    fn = partial(_sample_truncated_joint_normal, sigma)
+    fn = _truncated_joint_normal_sampler(sigma, method=method)
     samples = _sample_from_function(
         model, parameter_estimates, fn, force_posdef_samples=force_posdef_samples, n=n, rng=rng
     )
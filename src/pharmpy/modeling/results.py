@@ -1,29 +1,28 @@
 from __future__ import annotations
 
 import math
-from itertools import chain
 from typing import Iterable, Optional, Union
 
 from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
 from pharmpy.deps import sympy
+from pharmpy.internals.expr.eval import compile_expr
 from pharmpy.internals.expr.parse import parse as parse_expr
 from pharmpy.internals.expr.subs import subs, xreplace_dict
 from pharmpy.internals.math import round_to_n_sigdig
 from pharmpy.model import CompartmentalSystem, CompartmentalSystemBuilder, Model, output
-from pharmpy.model.distributions.numeric import ConstantDistribution
-from pharmpy.model.random_variables import (
-    eval_expr,
-    filter_distributions,
-    sample_rvs,
-    subs_distributions,
-)
+from pharmpy.model.random_variables import filter_distributions, sample_rvs, subs_distributions
 
 from .data import get_ids, get_observations
 from .odes import get_initial_conditions
 from .parameter_sampling import create_rng, sample_parameters_from_covariance_matrix
 
 RANK_TYPES = frozenset(('ofv', 'lrt', 'aic', 'bic'))
+MONTE_CARLO_CHUNK_SIZE = 100000
+# NOTE The standard error is estimated from this many samples of the parameters from their
+# uncertainty distribution and this many samples of the random variables for each of them
+STDERR_PARAMETER_SAMPLES = 100
+STDERR_SAMPLES_PER_PARAMETER = 10
 
 
 def calculate_eta_shrinkage(
@@ -213,6 +212,8 @@ def calculate_individual_parameter_statistics(
     parameter_estimates: pd.Series,
     covariance_matrix: Optional[pd.DataFrame] = None,
     rng: Optional[Union[np.random.Generator, int]] = None,
+    nsamples: int = 1000000,
+    tolerance: Optional[float] = None,
 ):
     """Calculate statistics for individual parameters
 
@@ -240,6 +241,13 @@ def calculate_individual_parameter_statistics(
         the names of the left hand sides will be used as the names of the parameters.
     rng : Generator or int
         Random number generator or int seed
+    nsamples : int
+        Maximum number of Monte Carlo samples used to estimate the mean and variance
+    tolerance : float
+        Stop sampling when the Monte Carlo standard error of all means relative to
+        the means is below this value. Default is to always use nsamples samples.
+        The standard error is always estimated from a fixed number of samples and is
+        not affected by nsamples or tolerance.
 
     Returns
     -------
@@ -259,9 +267,9 @@ def calculate_individual_parameter_statistics(
     >>> calculate_individual_parameter_statistics(model, "K=CL/V", pe, cov, rng=rng)
                               mean  variance    stderr
     parameter covariates
-    K         p5          0.004234  0.000001  0.001138
-              median      0.004907  0.000001  0.001247
-              p95         0.004907  0.000001  0.001247
+    K         p5          0.004234  0.000001  0.001096
+              median      0.004907  0.000001  0.001188
+              p95         0.004907  0.000001  0.001188
     """
     rng = create_rng(rng)
 
@@ -306,8 +314,6 @@ def calculate_individual_parameter_statistics(
         )
     )
 
-    batches = []
-
     if not all_covariate_free_symbols:
         cases = {'median': {}}
     else:
@@ -329,54 +335,72 @@ def calculate_individual_parameter_statistics(
         )
     )
 
-    nsamples = 1000000
-    nbatches = 100
-    batchsize = 10
-
-    samples = sample_rvs(filtered_sampling_rvs, nsamples, rng)
-
+    # NOTE Each expression is compiled once and evaluated on arrays of samples
+    compiled_exprs = [(name, compile_expr(full_expr)) for name, full_expr in full_exprs]
+    keys = [(j, case) for j in range(len(compiled_exprs)) for case in cases]
+    estimates = {symbol: float(value) for symbol, value in parameter_estimates.items()}
+    case_values = {
+        case: {symbol: float(value) for symbol, value in values.items()}
+        for case, values in cases.items()
+    }
+
+    # NOTE The mean and variance are estimated from chunks of samples to bound memory
+    moments = {key: (0, 0.0, 0.0) for key in keys}
+    remaining = nsamples
+    while remaining > 0:
+        chunksize = min(remaining, MONTE_CARLO_CHUNK_SIZE)
+        samples = sample_rvs(filtered_sampling_rvs, chunksize, rng)
+        for j, case in keys:
+            datamap = {**estimates, **case_values[case], **samples}
+            values = compiled_exprs[j][1](chunksize, datamap)
+            moments[(j, case)] = _update_moments(moments[(j, case)], values)
+        remaining -= chunksize
+        if tolerance is not None and all(
+            _monte_carlo_error(*moments[key]) <= tolerance for key in keys
+        ):
+            break
+
+    stderrs = {key: np.nan for key in keys}
     if covariance_matrix is not None:
         parameters_samples = sample_parameters_from_covariance_matrix(
             model,
             input_parameter_estimates,
             covariance_matrix,
-            n=nbatches,
+            n=STDERR_PARAMETER_SAMPLES,
             force_posdef_covmatrix=True,
             rng=rng,
         )
 
-        for _, row in parameters_samples.iterrows():
-            parameters = xreplace_dict(row)
-            local_sampling_rvs = list(subs_distributions(distributions, parameters)) + [
-                ((key,), ConstantDistribution(value))
-                for key, value in parameters.items()
-                if key in all_parameter_free_symbols
-            ]
-            batch = sample_rvs(local_sampling_rvs, batchsize, rng)
-            batches.append(batch)
+        sampled_parameters = {
+            sympy.Symbol(name): values.to_numpy(dtype='float64')
+            for name, values in parameters_samples.items()
+        }
+        batch_samples = _sample_distributions_batched(
+            distributions,
+            {**estimates, **sampled_parameters},
+            len(parameters_samples),
+            STDERR_SAMPLES_PER_PARAMETER,
+            rng,
+        )
+        size = len(parameters_samples) * STDERR_SAMPLES_PER_PARAMETER
+        batch_parameters = {
+            symbol: np.repeat(values, STDERR_SAMPLES_PER_PARAMETER)
+            for symbol, values in sampled_parameters.items()
+        }
+        for j, case in keys:
+            datamap = {**estimates, **batch_parameters, **case_values[case], **batch_samples}
+            values = compiled_exprs[j][1](size, datamap)
+            # NOTE This is NaN for empty inputs, dtype is required for those.
+            stderrs[(j, case)] = pd.Series(values, dtype='float64').std()
 
     table = pd.DataFrame(columns=['parameter', 'covariates', 'mean', 'variance', 'stderr'])
     i = 0
 
-    for name, full_expr in full_exprs:
+    for j, (name, _) in enumerate(compiled_exprs):
         df = pd.DataFrame(index=list(cases.keys()), columns=['mean', 'variance', 'stderr'])
-        parameter_estimates_expr = subs(full_expr, parameter_estimates, simultaneous=True)
-
-        for case, cov_values in cases.items():
-            expr = subs(parameter_estimates_expr, cov_values, simultaneous=True)
-            values = eval_expr(expr, nsamples, samples)
-
-            mean = np.mean(values)
-            variance = np.var(values)
-
-            # NOTE This is NaN for empty inputs, dtype is required for those.
-            cov_expr = subs(full_expr, cov_values, simultaneous=True)
-            stderr = pd.Series(
-                chain.from_iterable(eval_expr(cov_expr, batchsize, batch) for batch in batches),
-                dtype='float64',
-            ).std()
-
-            df.loc[case] = [mean, variance, stderr]
+        for case in cases:
+            n, mean, m2 = moments[(j, case)]
+            df.loc[case] = [mean, m2 / n, stderrs[(j, case)]]
 
         df.index.name = 'covariates'
         df.reset_index(inplace=True)
@@ -392,11 +416,64 @@ def calculate_individual_parameter_statistics(
     return table
 
 
+def _sample_distributions_batched(distributions, parameters, nbatches, batchsize, rng):
+    # Draw batchsize samples of the random variables for each of the nbatches parameter
+    # vectors. The means and covariance matrices of all parameter vectors are evaluated
+    # on arrays and the stacked covariance matrices are factorized at once.
+    mean_exprs = []
+    variance_blocks = []
+    for dist in distributions:
+        mean = dist.mean if isinstance(dist.mean, sympy.MatrixBase) else [dist.mean]
+        mean_exprs.extend(mean)
+        variance = dist.variance
+        if not isinstance(variance, sympy.MatrixBase):
+            variance = sympy.Matrix([[variance]])
+        variance_blocks.append(variance)
+    variance_exprs = sympy.diag(*variance_blocks)
+    k = len(mean_exprs)
+
+    def _eval(expr):
+        return compile_expr(sympy.sympify(expr))(nbatches, parameters)
+
+    means = np.column_stack([_eval(expr) for expr in mean_exprs])
+    covariances = np.empty((nbatches, k, k))
+    for i in range(k):
+        for j in range(i + 1):
+            covariances[:, i, j] = covariances[:, j, i] = _eval(variance_exprs[i, j])
+    factors = np.linalg.cholesky(covariances)
+
+    z = rng.standard_normal((nbatches, batchsize, k))
+    samples = means[:, np.newaxis, :] + z @ np.swapaxes(factors, 1, 2)
+    samples = samples.reshape(nbatches * batchsize, k)
+    symbols = [sympy.Symbol(name) for dist in distributions for name in dist.names]
+    return {symbol: samples[:, i] for i, symbol in enumerate(symbols)}
+
+
+def _update_moments(moments, values):
+    # Combine the count, mean and sum of squared deviations of the samples so far with
+    # those of a new chunk of values
+    n, mean, m2 = moments
+    k = len(values)
+    chunk_mean = np.mean(values)
+    chunk_m2 = np.sum((values - chunk_mean) ** 2)
+    total = n + k
+    delta = chunk_mean - mean
+    return (total, mean + delta * k / total, m2 + chunk_m2 + delta**2 * n * k / total)
+
+
+def _monte_carlo_error(n, mean, m2):
+    # Standard error of the mean relative to the mean
+    error = np.sqrt(m2 / n / n)
+    return error / abs(mean) if mean != 0 else error
+
+
 def calculate_pk_parameters_statistics(
     model: Model,
     parameter_estimates: pd.Series,
     covariance_matrix: Optional[pd.DataFrame] = None,
     rng: Optional[Union[np.random.Generator, int]] = None,
+    nsamples: int = 1000000,
+    tolerance: Optional[float] = None,
 ):
     """Calculate statistics for common pharmacokinetic parameters
 
@@ -414,6 +491,13 @@ def calculate_pk_parameters_statistics(
         Parameter uncertainty covariance matrix
     rng : Generator or int
         Random number generator or seed
+    nsamples : int
+        Maximum number of Monte Carlo samples used to estimate the mean and variance
+    tolerance : float
+        Stop sampling when the Monte Carlo standard error of all means relative to
+        the means is below this value. Default is to always use nsamples samples.
+        The standard error is always estimated from a fixed number of samples and is
+        not affected by nsamples or tolerance.
 
     Returns
     -------
@@ -433,12 +517,12 @@ def calculate_pk_parameters_statistics(
     >>> calculate_pk_parameters_statistics(model, pe, cov, rng=rng)
                                   mean     variance     stderr
     parameter   covariates
-    t_half_elim p5          173.337164  1769.493756  42.843398
-                median      149.567842  1317.474199  36.233070
-                p95         149.567842  1317.474199  36.233070
-    k_e         p5            0.004234     0.000001   0.001138
-                median        0.004907     0.000001   0.001247
-                p95           0.004907     0.000001   0.001247
+    t_half_elim p5          173.353343  1768.921744  43.305024
+                median      149.581803  1317.048309  35.728975
+                p95         149.581803  1317.048309  35.728975
+    k_e         p5            0.004234     0.000001   0.001096
+                median        0.004907     0.000001   0.001188
+                p95           0.004907     0.000001   0.001188
 
 
     See Also
@@ -515,7 +599,13 @@ def calculate_pk_parameters_statistics(
         expressions.append(sympy.Eq(sympy.Symbol('k_e'), elimination_rate))
 
     df = calculate_individual_parameter_statistics(
-        model, expressions, parameter_estimates, covariance_matrix, rng=rng
+        model,
+        expressions,
+        parameter_estimates,
+        covariance_matrix,
+        rng=rng,
+        nsamples=nsamples,
+        tolerance=tolerance,
     )
     return df
 
@@ -51,5 +51,5 @@ def write_csv(model: Model, path: Optional[Union[str, Path]] = None, force: bool
 
     path = path_absolute(path)
     model.dataset.to_csv(path, na_rep=data.conf.na_rep, index=False)
-    model = model.replace(datainfo=model.datainfo.replace(path=path))
+    model = model.replace(datainfo=model.datainfo.replace(path=path, separator=','))
     return model
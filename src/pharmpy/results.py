@@ -11,8 +11,10 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Optional, Union
 
 from pharmpy.deps import altair as alt
+from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
 from pharmpy.model import Model, Results
+from pharmpy.model.results import RESULTS_STORE_MANIFEST
 
 if TYPE_CHECKING:
     from pharmpy.workflows import Log
@@ -130,11 +132,98 @@ def _is_likely_to_be_json(source: str):
     return match is not None and match.group(1) == '{'
 
 
+class ResultsStore:
+    """Read access to a binary columnar results store
+
+    A results store is written by Results.to_store. Attributes are read
+    individually when accessed so that only the needed tables are loaded.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the store directory
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path / RESULTS_STORE_MANIFEST, 'r') as fh:
+            manifest = json.load(fh)
+        self._module = manifest['__module__']
+        self._class = manifest['__class__']
+        self._attributes = manifest['attributes']
+
+    @staticmethod
+    def is_store(path: Union[str, Path]) -> bool:
+        """Check if a path is a results store"""
+        return (Path(path) / RESULTS_STORE_MANIFEST).is_file()
+
+    def keys(self):
+        """Names of all attributes in the store"""
+        return self._attributes.keys()
+
+    def __getitem__(self, key: str):
+        meta = self._attributes[key]
+        if meta['kind'] == 'json':
+            return json.loads(json.dumps(meta['value']), cls=ResultsJSONDecoder)
+        with np.load(self.path / meta['file'], allow_pickle=False) as arrays:
+            return _table_from_store(meta, arrays)
+
+    def to_results(self):
+        """Read all attributes and create the results object"""
+        d = {key: self[key] for key in self.keys()}
+        d['__module__'] = self._module
+        d['__class__'] = self._class
+        return ResultsJSONDecoder().object_hook(d)
+
+
+def _table_from_store(meta, arrays):
+    index = _index_from_store(meta['index'], arrays)
+    if meta['kind'] == 'Series[DataFrame]':
+        frames = [_table_from_store(frame, arrays) for frame in meta['frames']]
+        series = pd.Series(frames, index=index, dtype=object, name=meta['name'])
+        return series
+    data = [_values_from_store(d, arrays) for d in meta['data']]
+    df = pd.DataFrame(dict(enumerate(data)), index=index)
+    df.columns = _labels_from_store(meta['columns'])
+    if meta['kind'] == 'Series':
+        series = df.iloc[:, 0]
+        series.name = meta['name']
+        return series
+    return df
+
+
+def _labels_from_store(meta):
+    if meta['multi']:
+        return pd.MultiIndex.from_tuples(list(map(tuple, meta['values'])), names=meta['names'])
+    return pd.Index(meta['values'], dtype=meta['dtype'], name=meta['names'][0])
+
+
+def _index_from_store(meta, arrays):
+    if 'range' in meta:
+        return pd.RangeIndex(*meta['range'], name=meta['names'][0])
+    levels = [_values_from_store(level, arrays) for level in meta['levels']]
+    if meta['multi']:
+        return pd.MultiIndex.from_arrays(levels, names=meta['names'])
+    return pd.Index(levels[0], name=meta['names'][0])
+
+
+def _values_from_store(meta, arrays):
+    if 'array' in meta:
+        values = pd.Series(arrays[meta['array']])
+    else:
+        values = pd.Series(meta['values'], dtype=object)
+    if str(values.dtype) != meta['dtype']:
+        values = values.astype(meta['dtype'])
+    return values.array
+
+
 def read_results(path_or_str: Union[str, Path]):
     if isinstance(path_or_str, str) and _is_likely_to_be_json(path_or_str):
         manager = closing(StringIO(path_or_str))
     else:
         path = Path(path_or_str)
+        if ResultsStore.is_store(path):
+            return ResultsStore(path).to_results()
         if path.is_dir():
             path /= 'results.json'
 
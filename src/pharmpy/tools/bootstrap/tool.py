@@ -1,14 +1,19 @@
 from typing import Optional
 
 from pharmpy.model import Model
-from pharmpy.modeling import resample_data
+from pharmpy.modeling import create_rng, resample_data
 from pharmpy.results import ModelfitResults
 from pharmpy.tools.bootstrap.results import calculate_results
 from pharmpy.tools.modelfit import create_fit_workflow
 from pharmpy.workflows import Task, Workflow, WorkflowBuilder
 
 
-def create_workflow(model: Model, results: Optional[ModelfitResults] = None, resamples: int = 1):
+def create_workflow(
+    model: Model,
+    results: Optional[ModelfitResults] = None,
+    resamples: int = 1,
+    seed: Optional[int] = None,
+):
     """Run bootstrap tool
 
     Parameters
@@ -19,6 +24,8 @@ def create_workflow(model: Model, results: Optional[ModelfitResults] = None, res
         Results for model
     resamples : int
         Number of bootstrap resamples
+    seed : int
+        Seed for the random number generator used for resampling. Default is a randomized seed.
 
     Returns
     -------
@@ -36,9 +43,13 @@ def create_workflow(model: Model, results: Optional[ModelfitResults] = None, res
 
     wb = WorkflowBuilder(name='bootstrap')
 
+    # NOTE All resamples are created in one task so that the groups of the
+    # dataset are only located once and the result only depends on the seed
+    task_resample = Task('resample', resample_models, model, resamples, seed)
+    wb.add_task(task_resample)
     for i in range(resamples):
-        task_resample = Task('resample', resample_model, model, f'bs_{i + 1}')
-        wb.add_task(task_resample)
+        task_select = Task('select', select_model, i)
+        wb.add_task(task_select, predecessors=[task_resample])
 
     wf_fit = create_fit_workflow(n=resamples)
     wb.insert_workflow(wf_fit)
@@ -49,10 +60,19 @@ def create_workflow(model: Model, results: Optional[ModelfitResults] = None, res
     return Workflow(wb)
 
 
-def resample_model(model, name):
-    resample = resample_data(model, model.datainfo.id_column.name, resamples=1, name=name)
-    model, _ = next(resample)
-    return model
+def resample_models(model, resamples, seed):
+    resample = resample_data(
+        model,
+        model.datainfo.id_column.name,
+        resamples=resamples,
+        name_pattern='bs_{}',
+        rng=create_rng(seed),
+    )
+    return tuple(model for model, _ in resample)
+
+
+def select_model(i, models):
+    return models[i]
 
 
 def post_process_results(original_model, *models):
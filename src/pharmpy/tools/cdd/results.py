@@ -47,17 +47,23 @@ def compute_delta_ofv(base_model_results, cdd_model_results, skipped_individuals
     if iofv is None:
         return [np.nan] * len(cdd_model_results)
 
-    cdd_ofvs = [res.ofv if res is not None else np.nan for res in cdd_model_results]
+    cdd_ofvs = np.array([res.ofv if res is not None else np.nan for res in cdd_model_results])
 
-    # need to set dtype for index.difference to work
-    skipped_indices = [
-        pd.Index(np.array(skipped, dtype=iofv.index.dtype)) for skipped in skipped_individuals
-    ]
+    # NOTE The OFVs of the skipped individuals of all cases are summed in one pass
+    # need to set dtype for the lookup in the iofv index to work
+    lengths = [len(skipped) for skipped in skipped_individuals]
+    skipped = pd.DataFrame(
+        {
+            'case': np.repeat(np.arange(len(lengths)), lengths),
+            'id': np.array(
+                [i for skipped in skipped_individuals for i in skipped], dtype=iofv.index.dtype
+            ),
+        }
+    ).drop_duplicates()
+    skipped_ofv = iofv.reindex(skipped['id']).fillna(0).to_numpy()
+    skipped_sum = np.bincount(skipped['case'], weights=skipped_ofv, minlength=len(lengths))
 
-    return [
-        sum(iofv[iofv.index.difference(skipped)]) - ofv
-        for skipped, ofv in zip(skipped_indices, cdd_ofvs)
-    ]
+    return list(iofv.sum() - skipped_sum - cdd_ofvs)
 
 
 def compute_jackknife_covariance_matrix(cdd_estimates):
@@ -26,7 +26,7 @@ from pharmpy.tools.mfl.feature.covariate import (
 from pharmpy.tools.mfl.parse import parse as mfl_parse
 from pharmpy.tools.modelfit import create_fit_workflow
 from pharmpy.tools.scm.results import candidate_summary_dataframe, ofv_summary_dataframe
-from pharmpy.workflows import Task, Workflow, WorkflowBuilder, call_workflow
+from pharmpy.workflows import Task, Workflow, WorkflowBuilder, WorkflowStream, call_workflow
 
 from ..mfl.filter import covsearch_statement_types
 from .results import COVSearchResults
@@ -97,6 +97,12 @@ class SearchState:
 
 ALGORITHMS = frozenset(['scm-forward', 'scm-forward-then-backward'])
 
+SCHEDULES = frozenset(['step', 'speculative'])
+
+# NOTE Fraction of the candidates of a step that must have been fitted before
+# the next step is speculatively started
+SPECULATION_THRESHOLD = 0.75
+
 
 def create_workflow(
     effects: Union[str, Sequence[InputSpec]],
@@ -104,6 +110,7 @@ def create_workflow(
     p_backward: float = 0.01,
     max_steps: int = -1,
     algorithm: str = 'scm-forward-then-backward',
+    schedule: str = 'step',
     results: Optional[ModelfitResults] = None,
     model: Optional[Model] = None,
 ):
@@ -122,6 +129,10 @@ def create_workflow(
     algorithm : str
         The search algorithm to use. Currently 'scm-forward' and
         'scm-forward-then-backward' are supported.
+    schedule : str
+        How to schedule the candidate fits of the forward steps. 'step' waits for all
+        candidates of a step and 'speculative' starts the next step on the current best
+        candidate while the last candidates of a step are still being fitted.
     results : ModelfitResults
         Results of model
     model : Model
@@ -153,6 +164,7 @@ def create_workflow(
         effects,
         p_forward,
         max_steps,
+        schedule,
     )
 
     wb.add_task(forward_search_task, predecessors=init_task)
@@ -199,6 +211,7 @@ def task_greedy_forward_search(
     effects: str,
     p_forward: float,
     max_steps: int,
+    schedule: str,
     state: SearchState,
 ) -> SearchState:
     candidate = state.best_candidate_so_far
@@ -217,9 +230,35 @@ def task_greedy_forward_search(
             for model, effect in zip(new_candidate_models, candidate_effects)
         ]
 
-    return _greedy_search(
+    if schedule == 'step':
+        return _greedy_search(
+            state,
+            handle_effects,
+            candidate_effects,
+            p_forward,
+            max_steps,
+        )
+
+    stream = WorkflowStream(context)
+
+    def submit_effect(parent: Candidate, effect: EffectLiteral, effect_index: int):
+        wf = wf_effect_addition(parent.model, parent, effect, effect_index)
+        name = _candidate_name(effect_index)
+        return stream.submit(wf, f'{NAME_WF}-effect_addition-{name}')
+
+    def reject(models: List[Model]):
+        # NOTE Fitted candidates of a discarded speculative step stay in the
+        # database but are flagged as not being part of the search
+        for model in models:
+            with context.model_database.transaction(model) as txn:
+                txn.store_metadata({'covsearch': {'speculative': 'rejected'}})
+
+    return _streaming_greedy_search(
         state,
-        handle_effects,
+        submit_effect,
+        stream.cancel,
+        reject,
+        stream,
         candidate_effects,
         p_forward,
         max_steps,
@@ -313,6 +352,180 @@ def _greedy_search(
     )
 
 
+class _StepRun:
+    """Candidate fits of one step of a streaming greedy search"""
+
+    def __init__(
+        self,
+        step: int,
+        parent: Candidate,
+        effects: List[EffectLiteral],
+        keys: list,
+    ):
+        self.step = step
+        self.parent = parent
+        self.effects = effects
+        self.keys = keys
+        self.models: List[Optional[Model]] = [None] * len(effects)
+
+    @property
+    def n_completed(self):
+        return sum(model is not None for model in self.models)
+
+    @property
+    def is_complete(self):
+        return all(model is not None for model in self.models)
+
+    def add(self, key, model: Model):
+        self.models[self.keys.index(key)] = model
+
+    def best_model(self, alpha: float) -> Model:
+        # NOTE Only the candidates that have been fitted so far are considered
+        parent = self.parent.model
+        models = [model for model in self.models if model is not None]
+        ofvs = [np.nan if (mfr := model.modelfit_results) is None else mfr.ofv for model in models]
+        # NOTE We assume parent.modelfit_results is not None
+        assert parent.modelfit_results is not None
+        return lrt_best_of_many(parent, models, parent.modelfit_results.ofv, ofvs, alpha)
+
+    def candidates(self, alpha: float) -> List[Candidate]:
+        return [
+            Candidate(model, self.parent.steps + (ForwardStep(alpha, AddEffect(*effect)),))
+            for model, effect in zip(self.models, self.effects)
+        ]
+
+
+def _remaining_effects(candidate_effects: List[EffectLiteral], candidate: Candidate):
+    # NOTE Filter out incompatible effects
+    last_step_effect = candidate.steps[-1].effect
+    return [
+        effect
+        for effect in candidate_effects
+        if effect[0] != last_step_effect.parameter or effect[1] != last_step_effect.covariate
+    ]
+
+
+def _streaming_greedy_search(
+    state: SearchState,
+    submit_effect: Callable[[Candidate, EffectLiteral, int], Any],
+    cancel: Callable[[list], None],
+    reject: Callable[[List[Model]], None],
+    completed: Iterable[Tuple[Any, Model]],
+    candidate_effects: List[EffectLiteral],
+    alpha: float,
+    max_steps: int,
+) -> SearchState:
+    """Greedy forward search speculatively starting the next step before a step is complete
+
+    Gives the same search result as _greedy_search. The candidates of a speculative
+    step get the names they would have had with _greedy_search so that kept
+    candidates are fitted and stored only once. When the speculation was wrong the
+    speculative fits are cancelled, the completed ones are passed to reject, and
+    their names are not reused by the following steps.
+    """
+    best_candidate_so_far = state.best_candidate_so_far
+    all_candidates_so_far = list(state.all_candidates_so_far)  # NOTE this includes start model
+    last_index = len(all_candidates_so_far) - 1
+
+    def submit_step(step: int, parent: Candidate, effects: List[EffectLiteral]):
+        nonlocal last_index
+        keys = [
+            submit_effect(parent, effect, last_index + i) for i, effect in enumerate(effects, 1)
+        ]
+        last_index += len(effects)
+        return _StepRun(step, parent, effects, keys)
+
+    def step_allowed(step: int):
+        return max_steps < 0 or step <= max_steps
+
+    if not candidate_effects or not step_allowed(1):
+        return state
+
+    current = submit_step(1, best_candidate_so_far, candidate_effects)
+    speculative = None
+
+    for key, model in completed:
+        if speculative is not None and key in speculative.keys:
+            speculative.add(key, model)
+            continue
+        current.add(key, model)
+
+        while current is not None and current.is_complete:
+            new_candidates = current.candidates(alpha)
+            all_candidates_so_far.extend(new_candidates)
+            best_model_so_far = current.best_model(alpha)
+            next_run = None
+            if best_model_so_far is not current.parent.model:
+                best_candidate_so_far = next(
+                    filter(lambda candidate: candidate.model is best_model_so_far, new_candidates)
+                )
+                candidate_effects = _remaining_effects(candidate_effects, best_candidate_so_far)
+                step = current.step + 1
+                if candidate_effects and step_allowed(step):
+                    if (
+                        speculative is not None
+                        and speculative.parent.model is best_candidate_so_far.model
+                    ):
+                        next_run = speculative
+                        speculative = None
+                    else:
+                        next_run = submit_step(step, best_candidate_so_far, candidate_effects)
+            if speculative is not None:
+                cancel(speculative.keys)
+                reject([model for model in speculative.models if model is not None])
+                speculative = None
+            current = next_run
+
+        if current is None:
+            break
+
+        if (
+            speculative is None
+            and current.n_completed >= SPECULATION_THRESHOLD * len(current.effects)
+            and step_allowed(current.step + 1)
+        ):
+            provisional_model = current.best_model(alpha)
+            if provisional_model is not current.parent.model:
+                provisional = next(
+                    filter(
+                        lambda candidate: candidate.model is provisional_model,
+                        current.candidates(alpha),
+                    )
+                )
+                effects = _remaining_effects(candidate_effects, provisional)
+                if effects:
+                    speculative = submit_step(current.step + 1, provisional, effects)
+
+    return SearchState(
+        state.start_model,
+        best_candidate_so_far,
+        all_candidates_so_far,
+    )
+
+
+def wf_effect_addition(
+    model: Model,
+    candidate: Candidate,
+    effect: EffectLiteral,
+    effect_index: int,
+):
+    wb = WorkflowBuilder()
+
+    task = Task(
+        repr(effect),
+        task_add_covariate_effect,
+        model,
+        candidate,
+        effect,
+        effect_index,
+    )
+    wb.add_task(task)
+
+    wf_fit = create_fit_workflow(n=1)
+    wb.insert_workflow(wf_fit)
+    return Workflow(wb)
+
+
 def wf_effects_addition(
     model: Model, candidate: Candidate, candidate_effects: List[EffectLiteral], index_offset: int
 ):
@@ -338,9 +551,12 @@ def wf_effects_addition(
 
 
 def task_add_covariate_effect(
-    model: Model, candidate: Candidate, effect: EffectLiteral, effect_index: int
+    model: Model,
+    candidate: Candidate,
+    effect: EffectLiteral,
+    effect_index: int,
 ):
-    name = f'covsearch_run{effect_index}'
+    name = _candidate_name(effect_index)
     description = _create_description(effect, candidate.steps)
     model_with_added_effect = model.replace(name=name, description=description, parent_model=name)
     model_with_added_effect = update_initial_estimates(model_with_added_effect)
@@ -350,6 +566,10 @@ def task_add_covariate_effect(
     return model_with_added_effect
 
 
+def _candidate_name(effect_index: int):
+    return f'covsearch_run{effect_index}'
+
+
 def _create_description(
     effect_new: Union[Tuple, Effect], steps_prev: Tuple[Step, ...], forward: bool = True
 ):
@@ -530,12 +750,17 @@ def _make_df_steps_row(
 
 @with_runtime_arguments_type_check
 @with_same_arguments_as(create_workflow)
-def validate_input(effects, p_forward, p_backward, algorithm, model):
+def validate_input(effects, p_forward, p_backward, algorithm, schedule, model):
     if algorithm not in ALGORITHMS:
         raise ValueError(
             f'Invalid `algorithm`: got `{algorithm}`, must be one of {sorted(ALGORITHMS)}.'
         )
 
+    if schedule not in SCHEDULES:
+        raise ValueError(
+            f'Invalid `schedule`: got `{schedule}`, must be one of {sorted(SCHEDULES)}.'
+        )
+
     if not 0 < p_forward <= 1:
         raise ValueError(
             f'Invalid `p_forward`: got `{p_forward}`, must be a float in range (0, 1].'
@@ -13,6 +13,11 @@ class NONMEMConfiguration(Configuration):
     )
     write_etas_in_abbr = ConfigItem(False, 'Whether to write etas as $ABBR records', bool)
     licfile = ConfigItem(None, 'Path to the NONMEM license file', cls=normalize_user_given_path)
+    max_concurrent_runs = ConfigItem(
+        0,
+        'Maximum number of concurrent NONMEM runs of execute_models. 0 means one per CPU',
+        int,
+    )
 
 
 conf = NONMEMConfiguration()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from pharmpy.deps import pandas as pd
+from pharmpy.model.external.nonmem.table import ExtTable, parse_table_title
+
+_lst_message_regexp = re.compile(
+    r'ERROR|TERMINATED|MINIMIZATION SUCCESSFUL|OPTIMIZATION WAS COMPLETED|'
+    r'ESTIMATION STEP OMITTED|#TERM'
+)
+
+
+@dataclass(frozen=True)
+class RunProgress:
+    """Progress of a running NONMEM model
+
+    An event is either an iteration read from the ext-file or a message line
+    read from the lst-file.
+    """
+
+    model: str
+    elapsed: float
+    table: Optional[int] = None
+    method: Optional[str] = None
+    iteration: Optional[int] = None
+    ofv: Optional[float] = None
+    message: Optional[str] = None
+
+
+class _FileTail:
+    """Read the complete lines appended to a file since the last read"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.offset = 0
+
+    def read_lines(self) -> List[str]:
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, 2)
+                size = f.tell()
+                if size < self.offset:
+                    # NOTE The file has been rewritten
+                    self.offset = 0
+                f.seek(self.offset)
+                content = f.read(size - self.offset)
+        except FileNotFoundError:
+            return []
+        end = content.rfind(b'\n') + 1
+        self.offset += end
+        return content[:end].decode(errors='replace').splitlines()
+
+
+class RunMonitor:
+    """Follow a running NONMEM model by tailing its ext- and lst-files
+
+    Each call to poll reads what has been appended to the files since the
+    previous call and returns it as progress events. The events are also
+    passed to the callback.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the model file of the run. The ext-file and lst-file are
+        looked up next to it. NONMEM writes the lst-file as results.lst
+        during the run.
+    name : str
+        Name of the model. Default is the stem of path.
+    callback : Callable[[RunProgress], None]
+        Called with each new progress event
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        name: Optional[str] = None,
+        callback: Optional[Callable[[RunProgress], None]] = None,
+    ):
+        path = Path(path)
+        self.name = path.stem if name is None else name
+        self.callback = callback
+        self._ext = _FileTail(path.with_suffix('.ext'))
+        self._lst = _FileTail(path.parent / 'results.lst')
+        self._table = ExtTable(df=pd.DataFrame())
+        self._header = None
+        self.start = time.time()
+        self.last_progress = self.start
+        self.ofv: List[float] = []
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since monitoring started"""
+        return time.time() - self.start
+
+    def stalled(self, timeout: float) -> bool:
+        """Whether no new iteration has been seen for timeout seconds"""
+        return time.time() - self.last_progress >= timeout
+
+    def poll(self) -> List[RunProgress]:
+        """Read new progress from the files of the run
+
+        Returns
+        -------
+        List[RunProgress]
+            New progress events since the previous call
+        """
+        elapsed = self.elapsed
+        events = self._poll_ext(elapsed) + self._poll_lst(elapsed)
+        if any(event.iteration is not None for event in events):
+            self.last_progress = time.time()
+        if self.callback is not None:
+            for event in events:
+                self.callback(event)
+        return events
+
+    def _poll_ext(self, elapsed: float) -> List[RunProgress]:
+        rows = []
+        events = []
+        for line in self._ext.read_lines():
+            if line.startswith('TABLE NO.'):
+                events.extend(self._iterations(rows, elapsed))
+                rows = []
+                self._table = ExtTable(df=pd.DataFrame())
+                parse_table_title(self._table, line, '.ext')
+                self._header = None
+            elif self._header is None:
+                self._header = line
+            else:
+                rows.append(line)
+        events.extend(self._iterations(rows, elapsed))
+        return events
+
+    def _iterations(self, rows: List[str], elapsed: float) -> List[RunProgress]:
+        if not rows or self._header is None:
+            return []
+        table = ExtTable(content='\n'.join([self._header] + rows) + '\n')
+        df = table.read_columns(['ITERATION', 'OBJ'])
+        # NOTE Negative iterations hold final estimates, standard errors etc.
+        df = df[df['ITERATION'] >= 0]
+        events = []
+        for iteration, ofv in zip(df['ITERATION'], df['OBJ']):
+            self.ofv.append(float(ofv))
+            events.append(
+                RunProgress(
+                    model=self.name,
+                    elapsed=elapsed,
+                    table=self._table.number,
+                    method=self._table.method,
+                    iteration=int(iteration),
+                    ofv=float(ofv),
+                )
+            )
+        return events
+
+    def _poll_lst(self, elapsed: float) -> List[RunProgress]:
+        return [
+            RunProgress(model=self.name, elapsed=elapsed, message=line.strip())
+            for line in self._lst.read_lines()
+            if _lst_message_regexp.search(line)
+        ]
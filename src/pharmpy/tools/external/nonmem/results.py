@@ -360,7 +360,7 @@ def _parse_tables(path: Path, control_stream: NMTranControlStream, netas) -> pd.
             continue
         table = table_file.tables[0]
 
-        df[colnames_in_table] = table.data_frame.iloc[:, columns_in_table]
+        df[colnames_in_table] = table.read_columns(columns_in_table)
 
     if 'ID' in df.columns:
         df['ID'] = df['ID'].convert_dtypes()
@@ -612,6 +612,26 @@ def simfit_results(model, model_path):
     return results
 
 
+def simfit_individual_ofv(model_path):
+    """Iterate over the individual OFVs of each subproblem of a simulation/estimation model
+
+    The phi-file is read once and the individual OFVs are yielded one subproblem at a time.
+    None is yielded for subproblems without individual OFVs.
+    """
+    try:
+        phi_tables = NONMEMTableFile(Path(model_path).with_suffix('.phi'))
+    except FileNotFoundError:
+        return
+    for table in phi_tables.tables:
+        iofv = None
+        if isinstance(table, PhiTable):
+            try:
+                iofv = table.iofv
+            except KeyError:
+                pass
+        yield iofv
+
+
 # def parse_ext(model, path, subproblem):
 #     try:
 #         ext_tables = NONMEMTableFile(path.with_suffix('.ext'))
@@ -1,7 +1,9 @@
+import asyncio
 import json
 import os
 import os.path
 import shutil
+import signal
 import subprocess
 import time
 import uuid
@@ -14,12 +16,298 @@ from pharmpy.model.external.nonmem import convert_model
 from pharmpy.model.external.nonmem.records.factory import create_record
 from pharmpy.modeling import write_csv, write_model
 from pharmpy.tools.external.nonmem import conf, parse_modelfit_results
+from pharmpy.tools.external.nonmem.monitor import RunMonitor
 
 PARENT_DIR = f'..{os.path.sep}'
 
 
 def execute_model(model, db):
     database = db.model_database
+    model, path, model_path, args = _prepare_run(model, database)
+
+    stdout = model_path / 'stdout'
+    stderr = model_path / 'stderr'
+
+    with open(stdout, "wb") as out, open(stderr, "wb") as err:
+        result = subprocess.run(
+            args, stdin=subprocess.DEVNULL, stderr=err, stdout=out, cwd=str(model_path)
+        )
+
+    basename = Path(model.name)
+
+    start = time.time()
+    timeout = 5
+
+    while not _rename_results(model_path, basename):
+        elapsed_time = time.time() - start
+        if elapsed_time >= timeout:
+            warnings.warn(f'UNEXPECTED Could not find .lst-file after waiting {elapsed_time}s')
+            break
+        else:
+            time.sleep(1)
+
+    return _store_run(model, database, path, model_path, args, result.returncode)
+
+
+def execute_models(
+    models,
+    db,
+    max_concurrency=None,
+    timeout=None,
+    callback=None,
+    progress=None,
+    stall_timeout=None,
+):
+    """Execute many models with NONMEM concurrently
+
+    Runs the models with execute_models_async in a new event loop.
+
+    Parameters
+    ----------
+    models : Iterable[Model]
+        Models to execute
+    db : ToolDatabase
+        Tool database to store the runs in
+    max_concurrency : int
+        Maximum number of concurrent NONMEM runs. Default is the
+        max_concurrent_runs configuration item.
+    timeout : float
+        Timeout in seconds for each NONMEM run
+    callback : Callable[[Model], None]
+        Called with each fitted model as soon as it has been stored
+    progress : Callable[[RunProgress], None]
+        Called with the progress events of the running models
+    stall_timeout : float
+        Kill a run when no new iteration has been written for this many seconds
+
+    Returns
+    -------
+    List[Model]
+        Fitted models in the order of the input models
+    """
+    models = list(models)
+
+    async def _run():
+        fitted = {}
+        async for i, model in _execute_models_async(
+            models,
+            db,
+            max_concurrency,
+            timeout=timeout,
+            progress=progress,
+            stall_timeout=stall_timeout,
+        ):
+            fitted[i] = model
+            if callback is not None:
+                callback(model)
+        return [fitted[i] for i in range(len(models))]
+
+    return asyncio.run(_run())
+
+
+async def execute_models_async(
+    models, db, max_concurrency=None, timeout=None, progress=None, stall_timeout=None
+):
+    """Execute many models with NONMEM concurrently without blocking the event loop
+
+    At most max_concurrency nmfe processes run at the same time. Preparing and
+    storing the runs is done in worker threads. Fitted models are yielded in
+    the order they complete. Closing the generator or cancelling the
+    enclosing task kills all running NONMEM processes.
+
+    While a model runs its ext- and lst-files are followed with a RunMonitor.
+    The OFV trajectory is stored in nonmem.json of the run, and a warning is
+    added to the log of the modelfit results of runs that had to be killed.
+
+    Parameters
+    ----------
+    models : Iterable[Model]
+        Models to execute
+    db : ToolDatabase
+        Tool database to store the runs in
+    max_concurrency : int
+        Maximum number of concurrent NONMEM runs. Default is the
+        max_concurrent_runs configuration item.
+    timeout : float
+        Timeout in seconds for each NONMEM run. A run that times out is killed
+        and stored like a failed run.
+    progress : Callable[[RunProgress], None]
+        Called with the progress events of the running models
+    stall_timeout : float
+        Kill a run when no new iteration has been written for this many seconds
+
+    Yields
+    ------
+    Model
+        Fitted models
+    """
+    async for _, model in _execute_models_async(
+        models,
+        db,
+        max_concurrency,
+        timeout=timeout,
+        progress=progress,
+        stall_timeout=stall_timeout,
+    ):
+        yield model
+
+
+async def _execute_models_async(models, db, max_concurrency, **kwargs):
+    if max_concurrency is None:
+        max_concurrency = conf.max_concurrent_runs or os.cpu_count() or 1
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _indexed(i, model):
+        return i, await _execute_model_async(model, db, semaphore, **kwargs)
+
+    tasks = [asyncio.ensure_future(_indexed(i, model)) for i, model in enumerate(models)]
+    try:
+        for future in asyncio.as_completed(tasks):
+            yield await future
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _execute_model_async(model, db, semaphore, timeout, progress, stall_timeout):
+    database = db.model_database
+
+    # NOTE The run directory is only written when the run can start so that
+    # a large batch does not create all run directories up front
+    async with semaphore:
+        model, path, model_path, args = await asyncio.to_thread(_prepare_run, model, database)
+        basename = Path(model.name)
+        monitor = RunMonitor(model_path / basename, callback=progress)
+        returncode, killed = await _run_nmfe(
+            args,
+            model_path,
+            model_path / 'stdout',
+            model_path / 'stderr',
+            timeout=timeout,
+            monitor=monitor,
+            stall_timeout=stall_timeout,
+        )
+
+    # NOTE results.lst is normally there when nmfe has exited, but it can show
+    # up late on network filesystems
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    while not _rename_results(model_path, basename):
+        elapsed_time = loop.time() - start
+        if elapsed_time >= 5:
+            warnings.warn(f'UNEXPECTED Could not find .lst-file after waiting {elapsed_time}s')
+            break
+        await asyncio.sleep(0.1)
+
+    return await asyncio.to_thread(
+        _store_run, model, database, path, model_path, args, returncode, monitor.ofv, killed
+    )
+
+
+async def run_nmfe(
+    args, cwd, stdout, stderr, timeout=None, monitor=None, stall_timeout=None, poll_interval=1.0
+):
+    """Run nmfe as a subprocess and wait for it to exit
+
+    Parameters
+    ----------
+    args : List[str]
+        Command line
+    cwd : Path
+        Working directory of the process
+    stdout : Path
+        File to write the standard output to
+    stderr : Path
+        File to write the standard error to
+    timeout : float
+        Kill the process if it has not exited after this many seconds
+    monitor : RunMonitor
+        Monitor to poll while the process runs
+    stall_timeout : float
+        Kill the process if the monitor has not seen a new iteration for this
+        many seconds
+    poll_interval : float
+        Seconds between polls of the monitor
+
+    Returns
+    -------
+    int
+        Return code of the process. Negative if it was killed by a signal.
+    """
+    returncode, _ = await _run_nmfe(
+        args,
+        cwd,
+        stdout,
+        stderr,
+        timeout=timeout,
+        monitor=monitor,
+        stall_timeout=stall_timeout,
+        poll_interval=poll_interval,
+    )
+    return returncode
+
+
+async def _run_nmfe(
+    args, cwd, stdout, stderr, timeout=None, monitor=None, stall_timeout=None, poll_interval=1.0
+):
+    # NOTE nmfe is a script that starts the NONMEM executable, so it is run
+    # in its own session to be able to kill the whole process group
+    posix = os.name == 'posix'
+    with open(stdout, "wb") as out, open(stderr, "wb") as err:
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=subprocess.DEVNULL,
+            stdout=out,
+            stderr=err,
+            cwd=str(cwd),
+            start_new_session=posix,
+        )
+
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    wait = asyncio.ensure_future(proc.wait())
+    try:
+        while True:
+            interval = None if monitor is None else poll_interval
+            if deadline is not None:
+                remaining = max(deadline - loop.time(), 0)
+                interval = remaining if interval is None else min(interval, remaining)
+            done, _ = await asyncio.wait({wait}, timeout=interval)
+            if monitor is not None:
+                monitor.poll()
+            if done:
+                return wait.result(), None
+            if deadline is not None and loop.time() >= deadline:
+                killed = f'timeout of {timeout}s'
+            elif (
+                stall_timeout is not None and monitor is not None and monitor.stalled(stall_timeout)
+            ):
+                killed = f'no new iteration in {stall_timeout}s'
+            else:
+                continue
+            warnings.warn(f'NONMEM run in {cwd} killed after {killed}')
+            _kill(proc, posix)
+            return await wait, killed
+    except asyncio.CancelledError:
+        _kill(proc, posix)
+        await wait
+        raise
+
+
+def _kill(proc, posix):
+    if proc.returncode is not None:
+        return
+    if posix:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        proc.kill()
+
+
+def _prepare_run(model, database):
     parent_model = model.parent_model
     model = convert_model(model)
     model = model.replace(parent_model=parent_model)
@@ -65,31 +353,21 @@ def execute_model(model, db):
         'results.lst',
     )
 
-    stdout = model_path / 'stdout'
-    stderr = model_path / 'stderr'
+    return model, path, model_path, args
 
-    with open(stdout, "wb") as out, open(stderr, "wb") as err:
-        result = subprocess.run(
-            args, stdin=subprocess.DEVNULL, stderr=err, stdout=out, cwd=str(model_path)
-        )
 
-    basename = Path(model.name)
+def _rename_results(model_path, basename):
+    try:
+        (model_path / 'results.lst').rename((model_path / basename).with_suffix('.lst'))
+        return True
+    except FileNotFoundError:
+        return False
 
-    results_path = model_path / 'results.lst'
-    start = time.time()
-    timeout = 5
 
-    while True:
-        try:
-            results_path.rename((model_path / basename).with_suffix('.lst'))
-            break
-        except FileNotFoundError:
-            elapsed_time = time.time() - start
-            if elapsed_time >= timeout:
-                warnings.warn(f'UNEXPECTED Could not find .lst-file after waiting {elapsed_time}s')
-                break
-            else:
-                time.sleep(1)
+def _store_run(model, database, path, model_path, args, returncode, ofv=None, killed=None):
+    basename = Path(model.name)
+    stdout = model_path / 'stdout'
+    stderr = model_path / 'stderr'
 
     metadata = {
         'plugin': 'nonmem',
@@ -100,49 +378,55 @@ def execute_model(model, db):
         'commands': [
             {
                 'args': args,
-                'returncode': result.returncode,
+                'returncode': returncode,
                 'stdout': 'stdout',
                 'stderr': 'stderr',
             }
         ]
     }
+    if ofv is not None:
+        plugin['commands'][0]['ofv'] = ofv
+    if killed is not None:
+        plugin['commands'][0]['killed'] = killed
+
+    plugin_path = model_path / 'nonmem.json'
+    with open(plugin_path, 'w') as f:
+        json.dump(plugin, f, indent=2)
+
+    if (
+        not (model_path / basename).with_suffix('.lst').is_file()
+        or not (model_path / basename).with_suffix('.ext').is_file()
+    ):
+        warnings.warn(f'Expected result files do not exist, copying everything: {basename}')
+        files = list(path.glob('*'))
+    else:
+        files = [
+            (model_path / basename).with_suffix(suffix)
+            for suffix in ['.lst', '.ext', '.phi', '.cov', '.cor', '.coi']
+        ]
+        files.extend(
+            model_path / rec.path for rec in model.internals.control_stream.get_records('TABLE')
+        )
+    files.extend((stdout, stderr, plugin_path))
+
+    # NOTE Read in results for the server side before storing so that the
+    # warning of a killed run is part of the stored results
+    modelfit_results = parse_modelfit_results(model, model_path / basename)
+    if killed is not None and getattr(modelfit_results, 'log', None) is not None:
+        modelfit_results.log.log_warning(f'NONMEM run was killed: {killed}')
+    model = model.replace(modelfit_results=modelfit_results)
 
     with database.transaction(model) as txn:
         txn.store_model()
 
-        if (
-            not (model_path / basename).with_suffix('.lst').is_file()
-            or not (model_path / basename).with_suffix('.ext').is_file()
-        ):
-            warnings.warn(f'Expected result files do not exist, copying everything: {basename}')
-            for file in path.glob('*'):
-                txn.store_local_file(file)
-        else:
-            for suffix in ['.lst', '.ext', '.phi', '.cov', '.cor', '.coi']:
-                file_path = (model_path / basename).with_suffix(suffix)
-                txn.store_local_file(file_path)
-
-            for rec in model.internals.control_stream.get_records('TABLE'):
-                txn.store_local_file(model_path / rec.path)
-
-        txn.store_local_file(stdout)
-        txn.store_local_file(stderr)
-
-        plugin_path = model_path / 'nonmem.json'
-        with open(plugin_path, 'w') as f:
-            json.dump(plugin, f, indent=2)
-
-        txn.store_local_file(plugin_path)
+        # NOTE The run directory is not modified after this point so the
+        # database can hard link the files instead of copying them
+        txn.store_local_files(files, link=True)
 
         txn.store_metadata(metadata)
         if len(model.estimation_steps) > 0 or True:
             txn.store_modelfit_results()
 
-            # Read in results for the server side
-            model = model.replace(
-                modelfit_results=parse_modelfit_results(model, model_path / basename)
-            )
-
     return model
 
 
@@ -521,6 +521,7 @@ def calculate_results_using_cov_sampling(
     samples=1000,
     rescale=True,
     rng=None,
+    sampling_method='auto',
 ):
     """Calculate the FREM results using covariance matrix for uncertainty
 
@@ -534,6 +535,8 @@ def calculate_results_using_cov_sampling(
                                    the cov model to be positive definite. Default is to raise
                                    in this case.
     :param samples: The number of parameter vector samples to use.
+    :param sampling_method: How to sample within the parameter bounds. See
+                            sample_parameters_from_covariance_matrix.
     """
     if cov_model is not None:
         uncertainty_results = cov_model.modelfit_results
@@ -556,6 +559,7 @@ def calculate_results_using_cov_sampling(
         force_posdef_covmatrix=force_posdef_covmatrix,
         n=samples,
         rng=rng,
+        method=sampling_method,
     )
     res = calculate_results_from_samples(
         frem_model, frem_model_results, continuous, categorical, parvecs, rescale=rescale
@@ -11,18 +11,36 @@ r"""
      - 'nonmem'
      - str
      - Name of default estimation tool either 'nonmem' or 'nlmixr'
+   * - ``fit_cache``
+     - ''
+     - str
+     - Path to a directory where modelfit results are cached on model content. Empty for no cache
+   * - ``fit_cache_max_size``
+     - 0
+     - int
+     - Maximum size of the fit cache in megabytes. 0 for no limit
+   * - ``fit_cache_max_age``
+     - 0
+     - int
+     - Number of days an unused entry is kept in the fit cache. 0 for no limit
 """
 import pharmpy.config as config
 
+from .cache import FitCache, hash_model
 from .tool import create_fit_workflow, create_workflow
 
 
 class ModelfitConfiguration(config.Configuration):
     module = 'pharmpy.tools.modelfit'  # TODO: change default
     default_tool = config.ConfigItem('nonmem', 'Name of default estimation tool', cls=str)
+    fit_cache = config.ConfigItem('', 'Path to the fit cache directory', cls=str)
+    fit_cache_max_size = config.ConfigItem(0, 'Maximum size of the fit cache in megabytes', cls=int)
+    fit_cache_max_age = config.ConfigItem(
+        0, 'Number of days to keep unused fit cache entries', cls=int
+    )
 
 
 conf = ModelfitConfiguration()
 
 
-__all__ = ('create_workflow', 'create_fit_workflow')
+__all__ = ('create_workflow', 'create_fit_workflow', 'FitCache', 'hash_model')
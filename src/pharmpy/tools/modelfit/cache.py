@@ -0,0 +1,167 @@
+import json
+import os
+import pickle
+import time
+import uuid
+from dataclasses import replace
+from hashlib import sha256
+from pathlib import Path, PurePath
+from typing import Optional, Union
+
+import pharmpy
+from pharmpy.deps import numpy as np
+from pharmpy.deps import pandas as pd
+from pharmpy.deps import sympy
+from pharmpy.internals.df import hash_df_fs, hash_df_fs_memoized
+from pharmpy.model import Model
+from pharmpy.results import ModelfitResults
+
+FILE_SUFFIX = '.pickle'
+
+
+def hash_model(model: Model, tool: Optional[str] = None) -> str:
+    """Stable content hash of a model
+
+    The hash only depends on the parts of the model that affect the estimation, i.e.
+    not on its name, description or the path of its dataset. It is stable across
+    sessions.
+
+    Parameters
+    ----------
+    model : Model
+        Pharmpy model
+    tool : str
+        Name of the estimation tool that will be used to fit the model
+
+    Returns
+    -------
+    str
+        Hex digest of the hash
+    """
+    d = model.to_dict()
+    d['datainfo'] = {key: value for key, value in d['datainfo'].items() if key != 'path'}
+    h = sha256()
+    h.update(pharmpy.__version__.encode('utf-8'))
+    h.update(str(tool).encode('utf-8'))
+    h.update(json.dumps(d, sort_keys=True, default=_encode_for_hash).encode('utf-8'))
+    if model.dataset is not None:
+        h.update(hash_df_fs_memoized(model.dataset).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _encode_for_hash(obj):
+    # NOTE Values that are not JSON serializable are encoded so that values
+    # with different contents always give different encodings
+    if isinstance(obj, np.generic):
+        return {'__numpy__': obj.dtype.str, 'value': obj.item()}
+    if isinstance(obj, np.ndarray):
+        data = np.ascontiguousarray(obj)
+        return {
+            '__ndarray__': data.dtype.str,
+            'shape': data.shape,
+            'sha256': sha256(data.tobytes()).hexdigest(),
+        }
+    if isinstance(obj, pd.DataFrame):
+        return {'__dataframe__': hash_df_fs(obj)}
+    if isinstance(obj, pd.Series):
+        return {'__series__': hash_df_fs(obj.to_frame())}
+    if isinstance(obj, sympy.Basic):
+        return {'__sympy__': sympy.srepr(obj)}
+    if isinstance(obj, PurePath):
+        return {'__path__': str(obj)}
+    if isinstance(obj, (set, frozenset)):
+        return {
+            '__set__': sorted(json.dumps(x, sort_keys=True, default=_encode_for_hash) for x in obj)
+        }
+    raise TypeError(f'Cannot hash value of type {type(obj).__name__}: {obj!r}')
+
+
+class FitCache:
+    """On-disk cache of modelfit results keyed on the content hash of models
+
+    Entries are stored as one file per model hash so that the cache can be shared between
+    concurrent processes. Entries that have not been used for longer than max_age are
+    evicted together with the least recently used entries when the cache grows larger
+    than max_size.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the cache directory. Will be created if it does not exist.
+    max_size : int
+        Maximum total size of the cache in bytes or None for no limit
+    max_age : float
+        Maximum time in seconds since an entry was last used or None for no limit
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / key[:2] / (key + FILE_SUFFIX)
+
+    def retrieve(self, model: Model, tool: Optional[str] = None) -> Optional[ModelfitResults]:
+        """Retrieve cached modelfit results for a model
+
+        Returns None if the model is not in the cache.
+        """
+        path = self._entry_path(hash_model(model, tool))
+        try:
+            with open(path, 'rb') as f:
+                res = pickle.load(f)
+            # NOTE Mark the entry as recently used
+            os.utime(path)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        return replace(res, name=model.name, description=model.description)
+
+    def store(self, model: Model, tool: Optional[str] = None):
+        """Store the modelfit results of a model in the cache"""
+        res = model.modelfit_results
+        if res is None:
+            return
+        path = self._entry_path(hash_model(model, tool))
+        path.parent.mkdir(exist_ok=True)
+        # NOTE Write to a temporary file first so that readers never see a
+        # partially written entry
+        tmp_path = path.with_name(f'.{path.name}.{uuid.uuid4().hex}')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(res, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Remove too old entries and the least recently used entries until the cache fits"""
+        if self.max_size is None and self.max_age is None:
+            return
+
+        entries = []
+        for path in self.path.glob(f'*/*{FILE_SUFFIX}'):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+
+        now = time.time()
+        total_size = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            too_old = self.max_age is not None and now - mtime > self.max_age
+            too_large = self.max_size is not None and total_size > self.max_size
+            if not too_old and not too_large:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+    def __repr__(self):
+        return f"FitCache({self.path})"
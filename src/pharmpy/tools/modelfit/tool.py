@@ -1,8 +1,11 @@
+from math import isnan
 from typing import Iterable, Literal, Optional, Tuple, Union
 
 from pharmpy.model import Model
 from pharmpy.workflows import Task, Workflow, WorkflowBuilder
 
+from .cache import FitCache
+
 SupportedPlugin = Literal['nonmem', 'nlmixr']
 
 
@@ -48,7 +51,16 @@ def create_workflow(
     return wf
 
 
-def create_fit_workflow(models=None, n=None, tool=None):
+def create_fit_workflow(models=None, n=None, tool=None, batch=False):
+    # NOTE By default each model is fitted in a task of its own so that fits
+    # start and finish independently. With batch=True NONMEM models are
+    # fitted together in one task sharing a bounded pool of nmfe processes.
+    if models is not None and not isinstance(models, Model):
+        models = list(models)
+
+    if batch and _n_models(models, n) > 1 and resolve_tool(tool) == 'nonmem':
+        return _create_batch_fit_workflow(models, n, tool)
+
     execute_model = retrieve_from_database_or_execute_model_with_tool(tool)
 
     wb = WorkflowBuilder()
@@ -70,6 +82,37 @@ def create_fit_workflow(models=None, n=None, tool=None):
     return Workflow(wb)
 
 
+def _n_models(models, n):
+    if models is None:
+        return 1 if n is None else n
+    elif isinstance(models, Model):
+        return 1
+    else:
+        return len(models)
+
+
+def _create_batch_fit_workflow(models, n, tool):
+    # NOTE One select task per model keeps the number of output tasks the
+    # same as for the per model workflow.
+    execute_models = retrieve_from_database_or_execute_models_with_tool(tool)
+
+    wb = WorkflowBuilder()
+    if models is None:
+        task_fit = Task('fit', execute_models)
+    else:
+        n = len(models)
+        task_fit = Task('fit', execute_models, *models)
+    wb.add_task(task_fit)
+    for i in range(n):
+        task_select = Task(f'run{i}', select_model, i)
+        wb.add_task(task_select, predecessors=[task_fit])
+    return Workflow(wb)
+
+
+def select_model(i, models):
+    return models[i]
+
+
 def post_process_results_one(context, *models: Model):
     return models[0]
 
@@ -80,41 +123,110 @@ def post_process_results_many(context, *models: Model):
 
 def retrieve_from_database_or_execute_model_with_tool(tool):
     def task(context, model):
-        try:
-            db_results = context.model_database.retrieve_modelfit_results(model.name)
-        except (KeyError, AttributeError, FileNotFoundError):
-            db_results = None
-
-        if db_results is not None:
-            # NOTE We have the results
-            try:
-                db_model = context.model_database.retrieve_model(model.name)
-            except (KeyError, AttributeError, FileNotFoundError):
-                db_model = None
-
-            # NOTE Here we could invalidate cached results if certain errors
-            # happened such as a missing or outdated license. We do not do that
-            # at the moment.
-
-            # NOTE Right now we only rely on model name comparison
-            # if db_model == model and model.has_same_dataset_as(db_model):
-            if db_model and model.has_same_dataset_as(db_model):
-                # NOTE Inputs are identical so we can reuse the results
-                model = model.replace(modelfit_results=db_results)
-                return model
+        retrieved = _retrieve_from_database_or_cache(context, model, tool)
+        if retrieved is not None:
+            return retrieved
 
         # NOTE Fallback to executing the model
         execute_model = get_execute_model(tool)
-        return execute_model(model, context)
+        fitted_model = execute_model(model, context)
+        _store_in_fit_cache(model, fitted_model, tool)
+        return fitted_model
 
     return task
 
 
-def get_execute_model(tool: Optional[SupportedPlugin]):
+def retrieve_from_database_or_execute_models_with_tool(tool):
+    def task(context, *models):
+        fitted = [_retrieve_from_database_or_cache(context, model, tool) for model in models]
+
+        # NOTE Fallback to executing the models that were not retrieved
+        to_execute = [model for model, fitted_model in zip(models, fitted) if fitted_model is None]
+        if to_execute:
+            from pharmpy.tools.external.nonmem.run import execute_models
+
+            executed = iter(execute_models(to_execute, context))
+            for i, model in enumerate(models):
+                if fitted[i] is None:
+                    fitted[i] = next(executed)
+                    _store_in_fit_cache(model, fitted[i], tool)
+
+        return tuple(fitted)
+
+    return task
+
+
+def _retrieve_from_database_or_cache(context, model, tool):
+    try:
+        db_results = context.model_database.retrieve_modelfit_results(model.name)
+    except (KeyError, AttributeError, FileNotFoundError):
+        db_results = None
+
+    if db_results is not None:
+        # NOTE We have the results
+        try:
+            db_model = context.model_database.retrieve_model(model.name)
+        except (KeyError, AttributeError, FileNotFoundError):
+            db_model = None
+
+        # NOTE Here we could invalidate cached results if certain errors
+        # happened such as a missing or outdated license. We do not do that
+        # at the moment.
+
+        # NOTE Right now we only rely on model name comparison
+        # if db_model == model and model.has_same_dataset_as(db_model):
+        if db_model and model.has_same_dataset_as(db_model):
+            # NOTE Inputs are identical so we can reuse the results
+            return model.replace(modelfit_results=db_results)
+
+    # NOTE Semantically identical models with other names might have been
+    # fitted before, possibly by another tool or in another session
+    cache = get_fit_cache()
+    if cache is not None:
+        cached_results = cache.retrieve(model, resolve_tool(tool))
+        if cached_results is not None:
+            model = model.replace(modelfit_results=cached_results)
+            # NOTE Store the model as if it had been executed so that the
+            # database has all models that were fitted
+            with context.model_database.transaction(model) as txn:
+                txn.store_model()
+                txn.store_modelfit_results()
+            return model
+
+    return None
+
+
+def _store_in_fit_cache(model, fitted_model, tool):
+    cache = get_fit_cache()
+    if cache is None:
+        return
+
+    res = fitted_model.modelfit_results
+    # NOTE Only cache successful runs so that failures caused by the
+    # environment (e.g. license errors) are retried
+    if res is not None and res.ofv is not None and not isnan(res.ofv):
+        cache.store(model.replace(modelfit_results=res), resolve_tool(tool))
+
+
+def get_fit_cache() -> Optional[FitCache]:
     from pharmpy.tools.modelfit import conf
 
-    if tool is None:
-        tool = conf.default_tool
+    if not conf.fit_cache:
+        return None
+
+    max_size = conf.fit_cache_max_size * 1024**2 if conf.fit_cache_max_size else None
+    max_age = conf.fit_cache_max_age * 24 * 3600 if conf.fit_cache_max_age else None
+    return FitCache(conf.fit_cache, max_size=max_size, max_age=max_age)
+
+
+def resolve_tool(tool: Optional[SupportedPlugin]) -> SupportedPlugin:
+    from pharmpy.tools.modelfit import conf
+
+    return conf.default_tool if tool is None else tool
+
+
+def get_execute_model(tool: Optional[SupportedPlugin]):
+    tool = resolve_tool(tool)
 
     if tool == 'nonmem':
         from pharmpy.tools.external.nonmem.run import execute_model
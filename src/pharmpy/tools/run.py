@@ -557,7 +557,7 @@ def retrieve_models(
     diff = set(names).difference(names_all)
     if diff:
         raise ValueError(f'Models {diff} not in database')
-    models = [db.retrieve_model(name) for name in names]
+    models = db.retrieve_models(names)
     return models
 
 
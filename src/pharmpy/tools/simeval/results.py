@@ -4,11 +4,12 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Optional
 
+from pharmpy.deps import numpy as np
 from pharmpy.deps import pandas as pd
 from pharmpy.model import Model, Results
 from pharmpy.modeling import plot_individual_predictions
 from pharmpy.tools import read_modelfit_results
-from pharmpy.tools.simfit.results import psn_simfit_results
+from pharmpy.tools.external.nonmem.results import simfit_individual_ofv
 
 
 @dataclass(frozen=True)
@@ -20,31 +21,84 @@ class SimevalResults(Results):
     individual_predictions_plot: Optional[Any] = None
 
 
+class SampledIndividualOFV:
+    """Individual OFVs of simulations collected as they arrive
+
+    The OFVs are kept in a preallocated array with one row per individual and one column
+    per simulation. The array grows if more simulations than expected are added.
+
+    Parameters
+    ----------
+    ids : list
+        Ids of the individuals
+    nsims : int
+        Expected number of simulations
+    """
+
+    def __init__(self, ids, nsims: int = 0):
+        self._index = pd.Index(ids)
+        self._values = np.full((len(self._index), max(nsims, 1)), np.nan)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    def add(self, iofv: Optional[pd.Series]):
+        """Add the individual OFVs of the next simulation
+
+        Individuals missing from iofv get NaN. None is a failed simulation.
+        """
+        if self._n == self._values.shape[1]:
+            grown = np.full((len(self._index), 2 * self._n), np.nan)
+            grown[:, : self._n] = self._values
+            self._values = grown
+        if iofv is not None:
+            self._values[:, self._n] = iofv.reindex(self._index).to_numpy()
+        self._n += 1
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Individual OFVs with one column per simulation numbered from 1"""
+        return pd.DataFrame(
+            self._values[:, : self._n],
+            index=self._index,
+            columns=pd.RangeIndex(start=1, stop=self._n + 1),
+        )
+
+    def summary(self, original: pd.Series) -> pd.DataFrame:
+        """Summary of the original individual OFVs compared to the sampled"""
+        sampled_iofv = self.to_dataframe()
+        quantiles = sampled_iofv.quantile([0.25, 0.75], axis=1)
+        iofv_summary = pd.DataFrame(
+            {
+                'original': original,
+                'sampled_mean': sampled_iofv.mean(axis=1),
+                'sampled_stdev': sampled_iofv.std(axis=1),
+            }
+        )
+        iofv_summary['residual'] = (
+            iofv_summary['original'] - iofv_summary['sampled_mean']
+        ) / iofv_summary['sampled_stdev']
+        iofv_summary['residual_q1'] = (
+            iofv_summary['original'] - quantiles.loc[0.25]
+        ) / iofv_summary['sampled_stdev']
+        iofv_summary['residual_q3'] = (
+            iofv_summary['original'] - quantiles.loc[0.75]
+        ) / iofv_summary['sampled_stdev']
+        iofv_summary['residual_outlier'] = iofv_summary['residual'] >= 3
+        return iofv_summary
+
+
 def calculate_results(original_model, original_results, simfit_results):
     """Calculate simeval results"""
-    sampled_iofv = pd.concat(
-        [res.individual_ofv for res in simfit_results.modelfit_results],
-        axis=1,
-        keys=range(1, len(simfit_results.modelfit_results) + 1),
-    )
-    origiofv = original_results.individual_ofv
-    iofv_summary = pd.DataFrame(
-        {
-            'original': origiofv,
-            'sampled_mean': sampled_iofv.T.mean(),
-            'sampled_stdev': sampled_iofv.T.std(),
-        }
-    )
-    iofv_summary['residual'] = (
-        iofv_summary['original'] - iofv_summary['sampled_mean']
-    ) / iofv_summary['sampled_stdev']
-    iofv_summary['residual_q1'] = (
-        iofv_summary['original'] - sampled_iofv.T.quantile(0.25)
-    ) / iofv_summary['sampled_stdev']
-    iofv_summary['residual_q3'] = (
-        iofv_summary['original'] - sampled_iofv.T.quantile(0.75)
-    ) / iofv_summary['sampled_stdev']
-    iofv_summary['residual_outlier'] = iofv_summary['residual'] >= 3
+    modelfit_results = simfit_results.modelfit_results
+    sampled = SampledIndividualOFV(original_results.individual_ofv.index, len(modelfit_results))
+    for res in modelfit_results:
+        sampled.add(res.individual_ofv)
+    return _calculate_results(original_model, original_results, sampled)
+
+
+def _calculate_results(original_model, original_results, sampled: SampledIndividualOFV):
+    iofv_summary = sampled.summary(original_results.individual_ofv)
 
     ids = iofv_summary.index[iofv_summary['residual_outlier']].tolist()
     id_plot = None
@@ -59,7 +113,7 @@ def calculate_results(original_model, original_results, simfit_results):
             pass
 
     res = SimevalResults(
-        sampled_iofv=sampled_iofv,
+        sampled_iofv=sampled.to_dataframe(),
         iofv_summary=iofv_summary,
         individual_predictions_plot=id_plot,
     )
@@ -69,10 +123,15 @@ def calculate_results(original_model, original_results, simfit_results):
 def psn_simeval_results(path):
     path = Path(path)
     simfit_paths = (path / 'm1').glob('sim-*.mod')
-    simfit_results = psn_simfit_results(simfit_paths)
     original = Model.parse_model(path / 'm1' / 'original.mod')
     original_results = read_modelfit_results(path / 'm1' / 'original.mod')
-    res = calculate_results(original, original_results, simfit_results)
+    # NOTE Only the individual OFVs of the simulations are needed so they are read
+    # directly from the phi-files one subproblem at a time
+    sampled = SampledIndividualOFV(original_results.individual_ofv.index)
+    for simfit_path in simfit_paths:
+        for iofv in simfit_individual_ofv(simfit_path):
+            sampled.add(iofv)
+    res = _calculate_results(original, original_results, sampled)
 
     # Add CWRES outliers as 2 in data_flag
     # Reading PsN results for now
@@ -10,7 +10,8 @@
    * - ``default_dispatcher``
      - ``pharmpy.workflows.local_dask``
      - str
-     - Name of default dispatcher module
+     - Name of default dispatcher module, ``pharmpy.workflows.local_dask`` or
+       ``pharmpy.workflows.local_pool``
    * - ``default_model_database``
      - ``pharmpy.workflows.LocalDirectoryDatabase``
      - str
@@ -27,8 +28,8 @@ import importlib
 import pharmpy.config as config
 
 from .args import split_common_options
-from .call import call_workflow
-from .dispatchers import local_dask
+from .call import WorkflowStream, call_workflow
+from .dispatchers import local_dask, local_pool
 from .execute import execute_workflow
 from .log import Log
 from .model_database import (
@@ -81,6 +82,7 @@ __all__ = [
     'execute_workflow',
     'split_common_options',
     'local_dask',
+    'local_pool',
     'LocalDirectoryDatabase',
     'LocalModelDirectoryDatabase',
     'LocalDirectoryToolDatabase',
@@ -92,4 +94,5 @@ __all__ = [
     'ToolDatabase',
     'Workflow',
     'WorkflowBuilder',
+    'WorkflowStream',
 ]
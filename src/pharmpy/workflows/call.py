@@ -9,7 +9,7 @@ T = TypeVar('T')
 def call_workflow(wf: Workflow[T], unique_name, db) -> T:
     """Dynamically call a workflow from another workflow.
 
-    Currently only supports dask distributed
+    Supports dask distributed and the local_pool dispatcher
 
     Parameters
     ----------
@@ -27,12 +27,16 @@ def call_workflow(wf: Workflow[T], unique_name, db) -> T:
     """
     from dask.distributed import get_client, rejoin, secede
 
+    from .dispatchers import local_pool
     from .optimize import optimize_task_graph_for_dask_distributed
 
     wb = WorkflowBuilder(wf)
     insert_context(wb, db)
     wf = Workflow(wb)
 
+    if local_pool.in_worker():
+        return local_pool.run_nested(wf)
+
     client = get_client()
     dsk = wf.as_dask_dict()
     dsk[unique_name] = dsk.pop('results')
@@ -42,3 +46,114 @@ def call_workflow(wf: Workflow[T], unique_name, db) -> T:
     res: T = client.gather(futures)  # pyright: ignore [reportGeneralTypeIssues]
     rejoin()
     return res
+
+
+class WorkflowStream:
+    """Dynamically submit workflows from another workflow and get their results as they complete
+
+    Supports dask distributed and the local_pool dispatcher
+
+    Parameters
+    ----------
+    db : ToolDatabase
+        ToolDatabase to pass to new workflows
+    """
+
+    def __init__(self, db):
+        from .dispatchers import local_pool
+
+        self._db = db
+        self._futures = {}
+        if local_pool.in_worker():
+            from concurrent.futures import ThreadPoolExecutor
+            from queue import SimpleQueue
+
+            self._client = None
+            self._executor = ThreadPoolExecutor(max_workers=local_pool.nested_workers())
+            self._completed = SimpleQueue()
+        else:
+            from dask.distributed import as_completed, get_client
+
+            self._client = get_client()
+            self._completed = as_completed()
+
+    def submit(self, wf: Workflow, unique_name):
+        """Submit a workflow without waiting for its result
+
+        Parameters
+        ----------
+        wf : Workflow
+            A workflow object
+        unique_name : str
+            A name of the results node that is unique between parent and dynamically created
+            workflows
+
+        Returns
+        -------
+        str
+            Key identifying the submitted workflow
+        """
+        from .dispatchers import local_pool
+        from .optimize import optimize_task_graph_for_dask_distributed
+
+        wb = WorkflowBuilder(wf)
+        insert_context(wb, self._db)
+        wf = Workflow(wb)
+
+        if self._client is None:
+            key = unique_name
+            # NOTE The workflows share the threads of the stream and their tasks are
+            # run serially
+            future = self._executor.submit(local_pool.run_nested, wf, 1)
+            self._futures[key] = future
+            future.add_done_callback(lambda f: self._completed.put((key, f)))
+            return key
+
+        dsk = wf.as_dask_dict()
+        dsk[unique_name] = dsk.pop('results')
+        dsk_optimized = optimize_task_graph_for_dask_distributed(self._client, dsk)
+        future = self._client.get(dsk_optimized, unique_name, sync=False)
+        self._futures[future.key] = future
+        self._completed.add(future)
+        return future.key
+
+    def cancel(self, keys):
+        """Cancel submitted workflows
+
+        Results of cancelled workflows will not be given when iterating.
+
+        Parameters
+        ----------
+        keys : list
+            Keys of the workflows to cancel
+        """
+        futures = [self._futures.pop(key) for key in keys if key in self._futures]
+        if self._client is None:
+            for future in futures:
+                future.cancel()
+        else:
+            self._client.cancel(futures)
+
+    def __iter__(self):
+        """Pairs of key and result in order of completion until all submitted workflows are done
+
+        Workflows can be submitted and cancelled while iterating.
+        """
+        if self._client is None:
+            while self._futures:
+                key, future = self._completed.get()
+                if self._futures.pop(key, None) is None:
+                    continue  # Cancelled
+                yield key, future.result()
+            return
+
+        from dask.distributed import rejoin, secede
+
+        secede()
+        try:
+            for future in self._completed:
+                if self._futures.pop(future.key, None) is None:
+                    continue  # Cancelled
+                yield future.key, future.result()
+        finally:
+            rejoin()
@@ -8,6 +8,11 @@ class DispatcherConfiguration(config.Configuration):
         'Which type of dask scheduler to use (supports threaded and distributed).',
         str,
     )
+    local_pool_workers = config.ConfigItem(
+        0,
+        'Number of worker processes of the local_pool dispatcher (0 for one per CPU).',
+        int,
+    )
 
 
 conf = DispatcherConfiguration()
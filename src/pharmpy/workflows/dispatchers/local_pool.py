@@ -0,0 +1,137 @@
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Optional, TypeVar
+
+import pharmpy.workflows.dispatchers
+from pharmpy.internals.fs.cwd import chdir
+from pharmpy.internals.fs.tmp import TemporaryDirectory
+
+from ..workflow import Workflow
+
+T = TypeVar('T')
+
+# NOTE Set in the worker processes of the pool
+_in_worker = False
+_nested_workers = 1
+
+
+def run(workflow: Workflow[T]) -> T:
+    # NOTE See local_dask.run for why we change to a temporary directory. The
+    # worker processes are started from within this directory so that they
+    # share it as their working directory.
+    n_processes = _max_workers() or os.cpu_count() or 1
+    with TemporaryDirectory() as tempdirname, chdir(tempdirname):
+        with ProcessPoolExecutor(
+            max_workers=n_processes, initializer=_initialize_worker, initargs=(n_processes,)
+        ) as executor:
+            res = execute_graph(workflow, executor)
+    return res
+
+
+def in_worker() -> bool:
+    """Whether the caller is running in a worker process of the pool"""
+    return _in_worker
+
+
+def nested_workers() -> int:
+    """Number of threads available to nested workflows in a worker process"""
+    return _nested_workers
+
+
+def run_nested(workflow: Workflow[T], max_workers: Optional[int] = None) -> T:
+    """Run a workflow called from a task running in a worker process
+
+    A worker cannot hand a workflow back to the pool without risking that all
+    workers end up waiting for each other. Nested workflows are instead executed
+    by a pool of threads in the calling worker. The CPUs are shared between the
+    worker processes so that all workers together run at most about one nested
+    task per CPU. With one worker per CPU nested workflows are run serially.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or _nested_workers) as executor:
+        res = execute_graph(workflow, executor)
+    return res
+
+
+def execute_graph(workflow: Workflow[T], executor: Executor) -> T:
+    """Execute all tasks of a workflow in topological order on an executor
+
+    A task is submitted as soon as all of its predecessors have completed and
+    results are released as soon as no more tasks need them.
+    """
+    serialize = isinstance(executor, ProcessPoolExecutor)
+    tasks = workflow.tasks
+    predecessors = {task: workflow.get_predecessors(task) for task in tasks}
+    successors = {task: workflow.get_successors(task) for task in tasks}
+    n_waiting = {task: len(preds) for task, preds in predecessors.items()}
+    n_consumers = {task: len(succs) for task, succs in successors.items()}
+    (output_task,) = workflow.output_tasks
+
+    results = {}
+    running = {}
+
+    def submit(task):
+        args = (*task.task_input, *(results[pred] for pred in predecessors[task]))
+        for pred in predecessors[task]:
+            n_consumers[pred] -= 1
+            if n_consumers[pred] == 0:
+                del results[pred]
+        if serialize:
+            import cloudpickle
+
+            # NOTE Task functions are often closures and lambdas that cannot
+            # be pickled by the executor
+            payload = cloudpickle.dumps((task.function, args))
+            future = executor.submit(_execute_serialized_task, payload)
+        else:
+            future = executor.submit(task.function, *args)
+        running[future] = task
+
+    try:
+        for task in tasks:
+            if n_waiting[task] == 0:
+                submit(task)
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                res = future.result()
+                if serialize:
+                    import cloudpickle
+
+                    res = cloudpickle.loads(res)
+                results[task] = res
+                for succ in successors[task]:
+                    n_waiting[succ] -= 1
+                    if n_waiting[succ] == 0:
+                        submit(succ)
+    except BaseException:
+        for future in running:
+            future.cancel()
+        raise
+
+    return results[output_task]
+
+
+def _max_workers():
+    n = pharmpy.workflows.dispatchers.conf.local_pool_workers
+    return n if n > 0 else None
+
+
+def _initialize_worker(n_processes):
+    global _in_worker, _nested_workers
+    _in_worker = True
+    _nested_workers = max(1, (os.cpu_count() or 1) // n_processes)
+
+
+def _execute_serialized_task(payload):
+    import cloudpickle
+
+    function, args = cloudpickle.loads(payload)
+    return cloudpickle.dumps(function(*args))
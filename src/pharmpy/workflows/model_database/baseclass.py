@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import ContextManager, Union
+from typing import ContextManager, Iterable, List, Union
 
 from pharmpy.model import Model, Results
 
+# NOTE Models are read in chunks of this many snapshots so that reading many models does
+# not hold one lock file open per model
+SNAPSHOT_CHUNK_SIZE = 64
+
 
 class ModelTransaction(ABC):
     @abstractmethod
@@ -27,6 +31,21 @@ class ModelTransaction(ABC):
         """
         pass
 
+    def store_local_files(self, paths: Iterable[Path], link: bool = False) -> None:
+        """Store many files from the local machine for the model bound to this
+        transaction
+
+        Parameters
+        ----------
+        paths : Iterable[Path]
+            Paths to files
+        link : bool
+            Allow the database to hard link the files instead of copying them.
+            Only use this for files that will not be modified afterwards.
+        """
+        for path in paths:
+            self.store_local_file(path)
+
     @abstractmethod
     def store_metadata(self, metadata) -> None:
         """Store metadata for the model bound to this transaction
@@ -254,6 +273,111 @@ class ModelDatabase(ABC):
         """
         pass
 
+    @contextmanager
+    def snapshots(self, model_names: Iterable[str]):
+        """Creates a readable snapshot context for many models at once.
+
+        All snapshots are held until the context is exited. They are entered
+        in the order of the model names to avoid deadlocks with concurrent
+        writers, and yielded as a list in the order of the given names.
+
+        Parameters
+        ----------
+        model_names : Iterable[str]
+            Names of the Pharmpy model objects
+        """
+        model_names = list(model_names)
+        order = sorted(range(len(model_names)), key=lambda i: model_names[i])
+        sns = [None] * len(model_names)
+        with ExitStack() as stack:
+            for i in order:
+                sns[i] = stack.enter_context(self.snapshot(model_names[i]))
+            yield sns
+
+    @contextmanager
+    def transactions(self, models: Iterable[Model]):
+        """Creates a writable transaction context for many models at once.
+
+        All transactions are held until the context is exited. They are
+        entered in the order of the model names to avoid deadlocks between
+        concurrent writers, and yielded as a list in the order of the models.
+
+        Parameters
+        ----------
+        models : Iterable[Model]
+            Pharmpy model objects
+        """
+        models = list(models)
+        order = sorted(range(len(models)), key=lambda i: models[i].name)
+        txns = [None] * len(models)
+        with ExitStack() as stack:
+            for i in order:
+                txns[i] = stack.enter_context(self.transaction(models[i]))
+            yield txns
+
+    def store_models(self, models: Iterable[Model], modelfit_results: bool = False) -> None:
+        """Store many model objects in one transaction
+
+        Parameters
+        ----------
+        models : Iterable[Model]
+            Pharmpy model objects
+        modelfit_results : bool
+            Also store the modelfit results of the models
+        """
+        with self.transactions(models) as txns:
+            for txn in txns:
+                txn.store_model()
+                if modelfit_results:
+                    txn.store_modelfit_results()
+
+    def retrieve_models(self, model_names: Iterable[str]) -> List[Model]:
+        """Read many models from the database
+
+        The models are read in chunks of SNAPSHOT_CHUNK_SIZE snapshots.
+
+        Parameters
+        ----------
+        model_names : Iterable[str]
+            Names of the models
+
+        Returns
+        -------
+        List[Model]
+            Retrieved model objects
+        """
+        models = []
+        for chunk in _chunks(list(model_names), SNAPSHOT_CHUNK_SIZE):
+            with self.snapshots(chunk) as sns:
+                models.extend(sn.retrieve_model() for sn in sns)
+        return models
+
+    def retrieve_all_modelfit_results(self, model_names: Iterable[str]) -> List[Results]:
+        """Read modelfit results of many models from the database
+
+        The results are read in chunks of SNAPSHOT_CHUNK_SIZE snapshots.
+
+        Parameters
+        ----------
+        model_names : Iterable[str]
+            Names of the models
+
+        Returns
+        -------
+        List[Results]
+            Retrieved model results objects
+        """
+        results = []
+        for chunk in _chunks(list(model_names), SNAPSHOT_CHUNK_SIZE):
+            with self.snapshots(chunk) as sns:
+                results.extend(sn.retrieve_modelfit_results() for sn in sns)
+        return results
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
 
 class NonTransactionalModelDatabase(ModelDatabase):
     @contextmanager
@@ -1,11 +1,12 @@
 import json
+import os
 import shutil
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from os import stat
 from pathlib import Path
-from typing import Union
+from typing import Iterable, Union
 
-from pharmpy.internals.df import hash_df_fs
+from pharmpy.internals.df import hash_df_fs_memoized
 from pharmpy.internals.fs.lock import path_lock
 from pharmpy.internals.fs.path import path_absolute
 from pharmpy.model import DataInfo, Model
@@ -24,6 +25,7 @@ DIRECTORY_DATASETS = '.datasets'
 DIRECTORY_INDEX = '.hash'
 FILE_METADATA = 'metadata.json'
 FILE_MODELFIT_RESULTS = 'results.json'
+DIRECTORY_MODELFIT_RESULTS = 'results'
 FILE_PENDING = 'PENDING'
 FILE_LOCK = '.lock'
 
@@ -136,32 +138,50 @@ class LocalModelDirectoryDatabase(TransactionalModelDatabase):
         Path to the base database directory. Will be created if it does not exist.
     file_extension : str
         File extension to use for model files.
+    verify_datasets : bool
+        Compare the contents of datasets with equal hashes before reusing a
+        stored dataset. By default the hash of a dataset is its identity.
     """
 
-    def __init__(self, path: Union[str, Path] = '.', file_extension='.mod'):
+    def __init__(
+        self,
+        path: Union[str, Path] = '.',
+        file_extension='.mod',
+        verify_datasets: bool = False,
+    ):
         path = Path(path)
         path.mkdir(parents=True, exist_ok=True)
         self.path = path_absolute(path)
         self.file_extension = file_extension
+        self.verify_datasets = verify_datasets
+
+    def _read_lock(self, model_name: str):
+        # NOTE Obtain shared (blocking) lock on one model. Reading never
+        # creates the lock file: it is created by the first writer, so if it
+        # does not exist there is no writer to wait for.
+        path = self.path / model_name / DIRECTORY_PHARMPY_METADATA / FILE_LOCK
+        if not path.exists():
+            return nullcontext()
+        return path_lock(str(path), shared=True)
 
-    def _read_lock(self):
-        # NOTE Obtain shared (blocking) lock on the entire database
-        path = self.path / FILE_LOCK
+    def _write_lock(self, model_name: str):
+        # NOTE Obtain exclusive (blocking) lock on one model
+        path = self.path / model_name / DIRECTORY_PHARMPY_METADATA / FILE_LOCK
         path.touch(exist_ok=True)
-        return path_lock(str(path), shared=True)
+        return path_lock(str(path), shared=False)
 
-    def _write_lock(self):
-        # NOTE Obtain exclusive (blocking) lock on the entire database
-        path = self.path / FILE_LOCK
+    def _dataset_lock(self, h: str):
+        # NOTE Obtain exclusive (blocking) lock on all datasets with hash h.
+        # Always taken after the model lock.
+        path = self.path / DIRECTORY_DATASETS / DIRECTORY_INDEX / (h + FILE_LOCK)
+        path.parent.mkdir(parents=True, exist_ok=True)
         path.touch(exist_ok=True)
         return path_lock(str(path), shared=False)
 
     @contextmanager
     def snapshot(self, model_name: str):
-        model_path = self.path / model_name
-        destination = model_path / DIRECTORY_PHARMPY_METADATA
-        destination.mkdir(parents=True, exist_ok=True)
-        with self._read_lock():
+        destination = self.path / model_name / DIRECTORY_PHARMPY_METADATA
+        with self._read_lock(model_name):
             # NOTE Check that no pending transaction exists
             path = destination / FILE_PENDING
             if path.exists():
@@ -175,7 +195,7 @@ class LocalModelDirectoryDatabase(TransactionalModelDatabase):
         model_path = self.path / model.name
         destination = model_path / DIRECTORY_PHARMPY_METADATA
         destination.mkdir(parents=True, exist_ok=True)
-        with self._write_lock():
+        with self._write_lock(model.name):
             # NOTE Mark state as pending
             path = destination / FILE_PENDING
             try:
@@ -189,6 +209,22 @@ class LocalModelDirectoryDatabase(TransactionalModelDatabase):
             # NOTE Commit transaction (only if no exception was raised)
             path.unlink()
 
+    def store_models(self, models: Iterable[Model], modelfit_results: bool = False) -> None:
+        with self.transactions(models) as txns:
+            # NOTE Models sharing a dataset are stored under one acquisition
+            # of the dataset lock
+            groups = {}
+            for txn in txns:
+                h = hash_df_fs_memoized(txn.model.dataset)
+                groups.setdefault(h, []).append(txn)
+            for h, group in groups.items():
+                with self._dataset_lock(h):
+                    for txn in group:
+                        txn._store_model(h)
+            if modelfit_results:
+                for txn in txns:
+                    txn.store_modelfit_results()
+
     def list_models(self):
         model_dir_names = [p.name for p in self.path.glob('*') if not p.name.startswith('.')]
         return sorted(model_dir_names)
@@ -203,14 +239,29 @@ class LocalModelDirectoryDatabaseTransaction(ModelTransaction):
         self.model = model
 
     def store_model(self):
-        from pharmpy.modeling import read_dataset_from_datainfo, write_csv, write_model
+        # NOTE Get the hash of the dataset and list filenames with contents
+        # matching this hash only. The hash identifies the contents so the
+        # datasets themselves are only read in verification mode.
+        h = hash_df_fs_memoized(self.model.dataset)
+        with self.db._dataset_lock(h):
+            return self._store_model(h)
+
+    def _store_model(self, h: str) -> Model:
+        # NOTE The lock on datasets with hash h must be held
+        from pharmpy.modeling import write_model
 
-        model = self.model
         datasets_path = self.db.path / DIRECTORY_DATASETS
+        model = self._store_dataset(self.model, datasets_path, h)
+
+        # NOTE Write the model
+        model_path = self.db.path / model.name
+        model_path.mkdir(exist_ok=True)
+        write_model(model, str(model_path / (model.name + model.filename_extension)), force=True)
+        return model
+
+    def _store_dataset(self, model: Model, datasets_path: Path, h: str) -> Model:
+        from pharmpy.modeling import read_dataset_from_datainfo, write_csv
 
-        # NOTE Get the hash of the dataset and list filenames with contents
-        # matching this hash only
-        h = hash_df_fs(model.dataset)
         h_dir = datasets_path / DIRECTORY_INDEX / h
         h_dir.mkdir(parents=True, exist_ok=True)
         for hpath in h_dir.iterdir():
@@ -222,12 +273,13 @@ class LocalModelDirectoryDatabaseTransaction(ModelTransaction):
             curdi = DataInfo.read_json(dipath)
             # NOTE paths are not compared here
             if curdi == model.datainfo:
-                df = read_dataset_from_datainfo(curdi)
-                if df.equals(model.dataset):
-                    # NOTE Update datainfo path
-                    datainfo = model.datainfo.replace(path=curdi.path)
-                    model = model.replace(datainfo=datainfo)
-                    break
+                if self.db.verify_datasets:
+                    df = read_dataset_from_datainfo(curdi)
+                    if not df.equals(model.dataset):
+                        continue
+                # NOTE Update datainfo path
+                datainfo = model.datainfo.replace(path=curdi.path)
+                return model.replace(datainfo=datainfo)
         else:
             model_filename = model.name + '.csv'
 
@@ -243,12 +295,7 @@ class LocalModelDirectoryDatabaseTransaction(ModelTransaction):
             # NOTE Write datainfo last so that we are "sure" dataset is there
             # if datainfo is there
             model.datainfo.to_json(datasets_path / (model.name + '.datainfo'))
-
-        # NOTE Write the model
-        model_path = self.db.path / model.name
-        model_path.mkdir(exist_ok=True)
-        write_model(model, str(model_path / (model.name + model.filename_extension)), force=True)
-        return model
+            return model
 
     def store_local_file(self, path, new_filename=None):
         if Path(path).is_file():
@@ -258,6 +305,17 @@ class LocalModelDirectoryDatabaseTransaction(ModelTransaction):
                 destination = destination / new_filename
             shutil.copy2(path, destination)
 
+    def store_local_files(self, paths, link=False):
+        if not link:
+            return super().store_local_files(paths)
+
+        destination = self.db.path / self.model.name
+        destination.mkdir(parents=True, exist_ok=True)
+        for path in paths:
+            path = Path(path)
+            if path.is_file():
+                _link_or_copy(path, destination / path.name)
+
     def store_metadata(self, metadata):
         destination = self.db.path / self.model.name / DIRECTORY_PHARMPY_METADATA
         destination.mkdir(parents=True, exist_ok=True)
@@ -269,7 +327,17 @@ class LocalModelDirectoryDatabaseTransaction(ModelTransaction):
         destination.mkdir(parents=True, exist_ok=True)
 
         if self.model.modelfit_results:
-            self.model.modelfit_results.to_json(destination / FILE_MODELFIT_RESULTS)
+            self.model.modelfit_results.to_store(destination / DIRECTORY_MODELFIT_RESULTS)
+
+
+def _link_or_copy(source: Path, destination: Path):
+    # NOTE Hard links are only possible within one filesystem, so we fall
+    # back to copying
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
 
 
 class LocalModelDirectoryDatabaseSnapshot(ModelSnapshot):
@@ -327,5 +395,9 @@ class LocalModelDirectoryDatabaseSnapshot(ModelSnapshot):
         # FIXME The following does not work because deserialization of modelfit
         # results is not generic enough. We only use it to make the resume_tool
         # test pass.
-        path = self.db.path / self.name / DIRECTORY_PHARMPY_METADATA / FILE_MODELFIT_RESULTS
+        metadata_path = self.db.path / self.name / DIRECTORY_PHARMPY_METADATA
+        path = metadata_path / DIRECTORY_MODELFIT_RESULTS
+        if not path.is_dir():
+            # NOTE Databases created by earlier versions store results as json
+            path = metadata_path / FILE_MODELFIT_RESULTS
         return read_results(path)
@@ -0,0 +1,31 @@
+import sympy
+
+from pharmpy.internals.expr.backend import diff, substitute_assignments
+
+
+def test_substitute_assignments():
+    x, y, z, theta = sympy.symbols('x y z theta')
+    assignments = [(x, theta * 2), (y, x + sympy.exp(z)), (x, y**2)]
+    expr = substitute_assignments(x + 1, assignments)
+    assert expr == (theta * 2 + sympy.exp(z)) ** 2 + 1
+    assert substitute_assignments(z, assignments) == z
+
+
+def test_substitute_assignments_keeps_assumptions():
+    x = sympy.Symbol('x')
+    w = sympy.Symbol('w', positive=True)
+    expr = substitute_assignments(x, [(x, sympy.sqrt(w**2))])
+    assert expr == w
+    assert expr.free_symbols == {w}
+
+
+def test_substitute_assignments_piecewise():
+    x, y, a = sympy.symbols('x y a')
+    value = sympy.Piecewise((a, sympy.Eq(y, 1)), (2 * a, True))
+    expr = substitute_assignments(x * 3, [(x, value)])
+    assert expr == 3 * value
+
+
+def test_diff():
+    x, y = sympy.symbols('x y')
+    assert diff(x**2 * y, [x, y]) == [2 * x * y, x**2]
@@ -0,0 +1,57 @@
+import gc
+
+import pandas as pd
+
+from pharmpy.internals.df import (
+    _hash_df_fs_memo,
+    df_equals,
+    hash_df_fs,
+    hash_df_fs_memoized,
+    hash_df_runtime,
+)
+
+
+def test_hash_df_fs_memoized():
+    df = pd.DataFrame({'ID': [1, 1, 2], 'DV': [0.1, 0.2, 0.3]})
+    h = hash_df_fs_memoized(df)
+    assert h == hash_df_fs(df)
+    assert hash_df_fs_memoized(df) == h
+    assert id(df) in _hash_df_fs_memo
+
+    other = df.copy()
+    other.loc[0, 'DV'] = 1.0
+    assert hash_df_fs_memoized(other) != h
+
+    key = id(df)
+    del df
+    gc.collect()
+    assert key not in _hash_df_fs_memo
+
+
+def test_hash_df_runtime():
+    df = pd.DataFrame({'ID': [1, 1, 2], 'DV': [0.1, 0.2, 0.3]})
+    assert hash_df_runtime(df) == hash_df_runtime(df.copy())
+    other = df.copy()
+    other.loc[0, 'DV'] = 1.0
+    assert hash_df_runtime(other) != hash_df_runtime(df)
+
+
+def test_df_equals():
+    df = pd.DataFrame({'ID': [1, 1, 2], 'DV': [0.1, 0.2, 0.3]})
+    assert df_equals(df, df)
+    assert df_equals(df, df.copy())
+    assert not df_equals(df, df.iloc[:2])
+    assert not df_equals(df, df.astype({'ID': 'float64'}))
+    other = df.copy()
+    other.loc[0, 'DV'] = 1.0
+    assert not df_equals(df, other)
+
+
+def test_df_equals_modified_after_hashing():
+    a = pd.DataFrame({'A': [1, 2, 3]})
+    d = a.copy()
+    hash_df_fs_memoized(a)
+    hash_df_fs_memoized(d)
+    d.loc[0, 'A'] = 7
+    assert not a.equals(d)
+    assert not df_equals(a, d)
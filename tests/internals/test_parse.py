@@ -3,6 +3,7 @@ import textwrap
 import pytest
 
 from pharmpy.internals.parse import AttrToken, AttrTree, prettyprint
+from pharmpy.internals.parse.grammar import load_grammar
 
 
 def assert_create(expect, *args, **kwargs):
@@ -130,3 +131,20 @@ def test_tree_create_abuse():
         └─ _LEAF_ " (nope, here!)"
     """
     assert_create(out, 'root', inp)
+
+
+def test_load_grammar(tmp_path):
+    (tmp_path / 'grammars').mkdir()
+    grammar = tmp_path / 'grammars' / 'list.lark'
+    grammar.write_text('start: "[" [INT ("," INT)*] "]"\n%import common.INT\n')
+    cache_path = tmp_path / 'cache'
+
+    parser = load_grammar(grammar, cache_path, parser='lalr')
+    (entry,) = cache_path.glob('list-*.pickle')
+    assert load_grammar(grammar, cache_path, parser='lalr').parse('[1,2]') == parser.parse('[1,2]')
+
+    load_grammar(grammar, cache_path, parser='lalr', keep_all_tokens=True)
+    assert len(list(cache_path.glob('list-*.pickle'))) == 2
+
+    entry.write_bytes(b'corrupt')
+    assert load_grammar(grammar, cache_path, parser='lalr').parse('[3]') == parser.parse('[3]')
@@ -1,6 +1,7 @@
 import pickle
 
 import numpy as np
+import pandas as pd
 import pytest
 import sympy
 from sympy import Symbol as symbol
@@ -503,6 +504,36 @@ def test_validate_parameters():
         rvs.validate_parameters({})
 
 
+def test_validate_parameters_batch():
+    a, b, c = (symbol('a'), symbol('b'), symbol('c'))
+    dist1 = JointNormalDistribution.create(
+        ['ETA(1)', 'ETA(2)'],
+        'iiv',
+        [0, 0],
+        [[a, b], [b, c]],
+    )
+    dist2 = NormalDistribution.create('ETA(3)', 'iiv', 0.5, c)
+    rvs = RandomVariables.create([dist1, dist2])
+    df = pd.DataFrame(
+        {'a': [2.0, 1.0, 1.0], 'b': [0.1, 1.1, 0.1], 'c': [23.0, 1.0, 2.0], 'd': [1.0, 2.0, 3.0]}
+    )
+    assert list(rvs.validate_parameters_batch(df)) == [True, False, True]
+    assert list(rvs.validate_parameters_batch(df)) == [
+        rvs.validate_parameters(row) for _, row in df.iterrows()
+    ]
+    with pytest.raises(TypeError):
+        rvs.validate_parameters_batch(df[['a', 'b']])
+
+    nearest = rvs.nearest_valid_parameters_batch(df)
+    assert list(nearest.columns) == ['a', 'b', 'c', 'd']
+    pd.testing.assert_frame_equal(nearest.iloc[[0, 2]], df.iloc[[0, 2]])
+    assert nearest['a'][1] == pytest.approx(1.05)
+    assert nearest['b'][1] == pytest.approx(1.05)
+    assert nearest['c'][1] == pytest.approx(1.05)
+    assert nearest['d'][1] == 2.0
+    assert all(rvs.validate_parameters_batch(nearest))
+
+
 def test_sample():
     dist = JointNormalDistribution.create(
         ['ETA(1)', 'ETA(2)'],
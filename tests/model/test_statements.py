@@ -422,6 +422,25 @@ def test_dependencies(load_model_for_test, pheno_path):
         model.statements.dependencies("NONEXISTING")
 
 
+def test_dependency_graph_many_statements():
+    n = 500
+    stats = [Assignment(S('X0'), S('THETA_1'))]
+    for i in range(1, n):
+        stats.append(Assignment(S(f'X{i}'), S(f'X{i - 1}') + S(f'X{i // 2}')))
+    stats.append(Assignment(S('X0'), S('X0') + S(f'X{n - 1}')))
+    s = Statements(stats)
+
+    graph = s._create_dependency_graph()
+    assert graph is s._create_dependency_graph()
+    assert set(graph.successors(n)) == {0, n - 1}
+    assert set(graph.successors(3)) == {1, 2}
+    assert s.find_assignment_index('X0') == n
+    assert s.find_assignment('X3').expression == S('X1') + S('X2')
+    assert s.find_assignment('Y') is None
+    assert s.dependencies(S('X3')) == {S('THETA_1')}
+    assert s.direct_dependencies(s[n]) == Statements([s[0], s[n - 1]])
+
+
 def test_builder():
     cb = CompartmentalSystemBuilder()
     dose = Bolus('AMT')
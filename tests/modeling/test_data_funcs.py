@@ -51,6 +51,153 @@ def test_get_doseid(load_example_model_for_test):
     assert doseid[743] == 12
     assert doseid[742] == 13
 
+    # Observation at the same timepoint as the first dose of an individual that is not the
+    # first individual is moved to the previous dose group
+    df = model.dataset.copy()
+    df.loc[13, 'TIME'] = 0.0
+    model = model.replace(dataset=df)
+    doseid = get_doseid(model)
+    assert doseid[12] == 1
+    assert doseid[13] == 0
+    assert doseid[14] == 2
+
+
+def test_get_doseid_ss(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'models' / 'mox1.mod')
+    doseid = get_doseid(model)
+    # Observation at the same timepoint as an SS dose stays in its dose group
+    assert list(doseid.iloc[0:16]) == [1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 2, 2, 2]
+
+
+def _reference_get_doseid(model):
+    # NOTE Loop implementation that get_doseid must give the same results as
+    dose = model.datainfo.typeix['dose'][0].name
+    df = model.dataset.copy()
+    df['DOSEID'] = df[dose]
+    df.loc[df['DOSEID'] > 0, 'DOSEID'] = 1
+    df['DOSEID'] = df['DOSEID'].astype(int)
+    idcol = model.datainfo.id_column.name
+    df['DOSEID'] = df.groupby(idcol)['DOSEID'].cumsum()
+    try:
+        eventcol = model.datainfo.typeix['event'][0].name
+    except IndexError:
+        df['_RESETGROUP'] = 1.0
+    else:
+        df['_FLAG'] = df[eventcol] >= 3
+        df['_RESETGROUP'] = df.groupby(idcol)['_FLAG'].cumsum()
+    try:
+        ss = model.datainfo.typeix['ss'][0].name
+    except IndexError:
+        ss = None
+    idvcol = model.datainfo.idv_column.name
+    ser = df.groupby([idcol, idvcol, '_RESETGROUP']).size()
+    nonunique = ser[ser > 1]
+    for i, time, _ in nonunique.index:
+        groupind = df[(df[idcol] == i) & (df[idvcol] == time)].index
+        obsind = df[(df[idcol] == i) & (df[idvcol] == time) & (df[dose] == 0)].index
+        doseind = set(groupind) - set(obsind)
+        if not doseind:
+            continue
+        maxind = max(doseind)
+        for index in obsind:
+            if 0 in groupind:
+                continue
+            if maxind > index:
+                continue
+            if ss and df.loc[maxind, ss] > 0:
+                continue
+            df.loc[index, 'DOSEID'] = df.loc[index, 'DOSEID'] - 1
+    return df['DOSEID'].copy()
+
+
+def _reference_tad_ss(model, df, idlab, idv):
+    # NOTE Loop implementation of TAD for observations at the same time point as an SS dose
+    ss = model.datainfo.typeix['ss'][0].name
+    ii = model.datainfo.typeix['ii'][0].name
+
+    def fn(df):
+        if len(df) < 2:
+            return df
+        ii_time = None
+        for i in df.index:
+            if df.loc[i, ss] > 0:
+                ii_time = df.loc[i, ii]
+            else:
+                assert ii_time is not None
+                df.loc[i, 'TAD'] = ii_time
+        return df
+
+    return df.groupby([idlab, idv, '_DOSEID'], group_keys=False).apply(fn)
+
+
+def _dataset_with_resets(model):
+    model = model.replace(
+        datainfo=model.datainfo.set_column(model.datainfo['EVID'].replace(type='event'))
+    )
+    df = pd.DataFrame(
+        {
+            'ID': [1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2],
+            'TIME': [0.0, 0.0, 2.0, 10.0, 10.0, 10.0, 10.0, 12.0, 0.0, 1.0, 5.0, 5.0, 5.0, 6.0],
+            'AMT': [100.0, 0.0, 0.0, 0.0, 100.0, 200.0, 0.0, 0.0, 50.0, 0.0, 50.0, 0.0, 0.0, 0.0],
+            'SS': [0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+            'II': [0.0, 0.0, 0.0, 0.0, 0.0, 12.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+            'EVID': [1.0, 0.0, 0.0, 0.0, 1.0, 4.0, 0.0, 0.0, 1.0, 0.0, 4.0, 0.0, 0.0, 0.0],
+            'DV': [0.0, 1.0, 2.0, 3.0, 0.0, 0.0, 4.0, 5.0, 0.0, 6.0, 0.0, 7.0, 8.0, 9.0],
+        }
+    )
+    df = df.reindex(columns=model.dataset.columns, fill_value=0.0)
+    return model.replace(dataset=df)
+
+
+def _dataset_with_resets_ss_only(model):
+    model = _dataset_with_resets(model)
+    df = model.dataset
+    return model.replace(dataset=df[df['ID'] == 1].reset_index(drop=True))
+
+
+def _doseid_test_models(load_example_model_for_test, load_model_for_test, testdata):
+    pheno = load_example_model_for_test('pheno')
+    df = pheno.dataset.copy()
+    df.loc[13, 'TIME'] = 0.0
+    df.loc[742, 'TIME'] = df.loc[743, 'TIME']
+    mox1 = load_model_for_test(testdata / 'nonmem' / 'models' / 'mox1.mod')
+    return [
+        pheno,
+        pheno.replace(dataset=df),
+        mox1,
+        _dataset_with_resets(mox1),
+        _dataset_with_resets_ss_only(mox1),
+        mox1.replace(
+            datainfo=mox1.datainfo.set_column(mox1.datainfo['EVID'].replace(type='event'))
+        ),
+    ]
+
+
+def test_get_doseid_reference(load_example_model_for_test, load_model_for_test, testdata):
+    for model in _doseid_test_models(load_example_model_for_test, load_model_for_test, testdata):
+        pd.testing.assert_series_equal(get_doseid(model), _reference_get_doseid(model))
+
+
+def test_add_time_after_dose_ss_reference(
+    load_example_model_for_test, load_model_for_test, testdata
+):
+    models = _doseid_test_models(load_example_model_for_test, load_model_for_test, testdata)
+    for model in models[2:]:
+        # NOTE The records are sorted within each individual on DOSEID before TAD is computed
+        df = model.dataset.copy()
+        df['_DOSEID'] = _reference_get_doseid(model)
+        df = df.sort_values(by=['ID', '_DOSEID'], kind='stable', ignore_index=True)
+        df['TAD'] = df.groupby(['ID', '_DOSEID'])['TIME'].diff().fillna(0)
+        df['TAD'] = df.groupby(['ID', '_DOSEID'])['TAD'].cumsum()
+        try:
+            df = _reference_tad_ss(model, df, 'ID', 'TIME')
+        except AssertionError:
+            # NOTE Records at the same time point without a previous SS dose are not supported
+            with pytest.raises(AssertionError):
+                add_time_after_dose(model)
+        else:
+            pd.testing.assert_series_equal(add_time_after_dose(model).dataset['TAD'], df['TAD'])
+
 
 def test_get_number_of_individuals(load_example_model_for_test):
     model = load_example_model_for_test('pheno')
@@ -317,6 +464,28 @@ def test_expand_additional_doses(load_model_for_test, testdata):
     assert not df.loc[4, 'EXPANDED']
 
 
+def test_expand_additional_doses_sorted(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'models' / 'pef.mod')
+    df = pd.DataFrame(
+        {
+            'ID': [1, 1, 2, 2],
+            'TIME': [0.0, 30.0, 0.0, 10.0],
+            'DV': [0.0, 5.0, 0.0, 3.0],
+            'AMT': [100.0, 0.0, 50.0, 0.0],
+            'RATE': [0.0, 0.0, 0.0, 0.0],
+            'ADDL': [2.0, 0.0, 1.0, 0.0],
+            'II': [12.0, 0.0, 24.0, 0.0],
+        }
+    )
+    model = model.replace(dataset=df)
+    model = expand_additional_doses(model, flag=True)
+    df = model.dataset
+    assert list(df['ID']) == [1, 1, 1, 1, 2, 2, 2]
+    assert list(df['TIME']) == [0.0, 12.0, 24.0, 30.0, 0.0, 10.0, 24.0]
+    assert list(df['AMT']) == [100.0, 100.0, 100.0, 0.0, 50.0, 0.0, 50.0]
+    assert list(df['EXPANDED']) == [False, True, True, False, False, False, True]
+
+
 def test_deidentify_data():
     np.random.seed(23)
 
@@ -1,11 +1,13 @@
 from io import StringIO
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from pharmpy.model.external.nonmem.dataset import read_nonmem_dataset
 from pharmpy.modeling import (
+    create_model_evaluator,
     evaluate_epsilon_gradient,
     evaluate_eta_gradient,
     evaluate_expression,
@@ -13,6 +15,7 @@ from pharmpy.modeling import (
     evaluate_population_prediction,
     evaluate_weighted_residuals,
 )
+from pharmpy.modeling.evaluation import _compile_model_evaluator
 from pharmpy.tools import read_modelfit_results
 
 tabpath = Path(__file__).resolve().parent.parent / 'testdata' / 'nonmem' / 'pheno_real_linbase.tab'
@@ -100,3 +103,44 @@ def test_evaluate_weighted_residuals(load_model_for_test, testdata):
     res = read_modelfit_results(linpath)
     wres = evaluate_weighted_residuals(linmod, parameters=dict(res.parameter_estimates))
     pd.testing.assert_series_equal(lincorrect['WRES'], wres, rtol=1e-4, check_names=False)
+
+
+def test_create_model_evaluator(load_model_for_test, testdata):
+    path = testdata / 'nonmem' / 'minimal.mod'
+    model = load_model_for_test(path)
+    evaluator = create_model_evaluator(model)
+    assert evaluator.output_names == ['PRED', 'IPRED', 'dF/dETA_1', 'dY/dEPS_1']
+    parameters = model.parameters.inits
+    parameters = np.array([parameters[name] for name in evaluator.parameter_names])
+    dataset = pd.DataFrame({'ID': [1, 2], 'TIME': [0, 0], 'DV': [3, 4]})
+    etas = evaluator.eta_array(dataset, pd.DataFrame({'ETA_1': [0.5, 0.0]}, index=[1, 2]))
+    out = evaluator(parameters, etas, evaluator.data_array(dataset))
+    np.testing.assert_allclose(out, [[0.1, 0.6, 1.0, 1.0], [0.1, 0.1, 1.0, 1.0]])
+
+    linpath = testdata / 'nonmem' / 'pheno_real_linbase.mod'
+    linmod = load_model_for_test(linpath)
+    res = read_modelfit_results(linpath)
+    evaluator = create_model_evaluator(linmod)
+    parameters = res.parameter_estimates[evaluator.parameter_names].to_numpy()
+    etas = evaluator.eta_array(linmod.dataset, res.individual_estimates)
+    out = evaluator(parameters, etas, evaluator.data_array(linmod.dataset))
+    for name, column in zip(['PRED', 'CIPREDI', 'G11', 'G21', 'H11'], out.T):
+        np.testing.assert_allclose(column, lincorrect[name], rtol=1e-4)
+
+
+def test_evaluate_reuses_compiled_evaluator(load_model_for_test, testdata):
+    linpath = testdata / 'nonmem' / 'pheno_real_linbase.mod'
+    linmod = load_model_for_test(linpath)
+    res = read_modelfit_results(linpath)
+    pe = dict(res.parameter_estimates)
+
+    evaluate_population_prediction(linmod, parameters=pe)
+    misses = _compile_model_evaluator.cache_info().misses
+    grad = evaluate_eta_gradient(linmod, parameters=pe, etas=res.individual_estimates)
+    wres = evaluate_weighted_residuals(linmod, parameters=pe)
+    wres2 = evaluate_weighted_residuals(linmod, parameters={**pe, 'IVCL': 2 * pe['IVCL']})
+    assert _compile_model_evaluator.cache_info().misses == misses
+
+    assert not np.allclose(wres, wres2)
+    pd.testing.assert_series_equal(lincorrect['G11'], grad.iloc[:, 0], rtol=1e-4, check_names=False)
+    pd.testing.assert_series_equal(lincorrect['WRES'], wres, rtol=1e-4, check_names=False)
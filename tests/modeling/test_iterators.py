@@ -35,6 +35,37 @@ def test_omit(df):
         next(omitter)
 
 
+def test_omit_cases(df):
+    omitter = iters.Omit(df, 'ID', cases=[[1, 4], [2]])
+    (new_df, case) = next(omitter)
+    assert case == [1, 4]
+    assert list(new_df['ID']) == [2, 2]
+    assert list(new_df.index) == [2, 3]
+    (new_df, case) = next(omitter)
+    assert case == [2]
+    assert list(new_df['DV']) == [5, 6, 0, 9]
+    assert new_df.name == 'omitted_2'
+    with pytest.raises(StopIteration):
+        next(omitter)
+
+
+def test_omit_folds(df):
+    omitter = iters.Omit(df, 'ID', folds=2)
+    (new_df, case) = next(omitter)
+    assert case == [1, 2]
+    assert list(new_df['ID']) == [4, 4]
+    (new_df, case) = next(omitter)
+    assert case == [4]
+    assert list(new_df['ID']) == [1, 1, 2, 2]
+    with pytest.raises(StopIteration):
+        next(omitter)
+
+    with pytest.raises(ValueError):
+        iters.Omit(df, 'ID', folds=4)
+    with pytest.raises(ValueError):
+        iters.Omit(df, 'ID', cases=[[1]], folds=2)
+
+
 def test_resampler_default(df):
     np.random.seed(28)
     resampler = iters.Resample(df, 'ID')
@@ -109,3 +140,29 @@ def test_resampler_anonymization(testdata):
         df_oldid.reset_index(inplace=True, drop=True)
         df_newid['ID'] = old_id
         pandas.testing.assert_frame_equal(df_newid, df_oldid)
+
+
+def test_resampler_rng(df):
+    (first, first_ids), (second, second_ids) = iters.Resample(
+        df, 'ID', resamples=2, replace=True, rng=123
+    )
+    (again, again_ids), _ = iters.Resample(df, 'ID', resamples=2, replace=True, rng=123)
+    assert first_ids == again_ids
+    pandas.testing.assert_frame_equal(first, again)
+    assert second.name == 'resample_2'
+
+    for new_df, ids in ((first, first_ids), (second, second_ids)):
+        expected = pd.concat(
+            [df[df['ID'] == old_id].assign(ID=new_id) for new_id, old_id in enumerate(ids, 1)]
+        ).reset_index(drop=True)
+        pandas.testing.assert_frame_equal(new_df, expected)
+
+
+def test_resampler_unsorted_groups():
+    df = pd.DataFrame({'ID': [3, 1, 3, 2, 1], 'DV': [1, 2, 3, 4, 5]})
+    resampler = iters.Resample(df, 'ID', rng=np.random.default_rng(5))
+    new_df, ids = next(resampler)
+    expected = pd.concat(
+        [df[df['ID'] == old_id].assign(ID=new_id) for new_id, old_id in enumerate(ids, 1)]
+    ).reset_index(drop=True)
+    pandas.testing.assert_frame_equal(new_df, expected)
@@ -4,9 +4,12 @@ import pytest
 
 from pharmpy.modeling import (
     create_rng,
+    parameter_sampling,
     sample_individual_estimates,
     sample_parameters_from_covariance_matrix,
     sample_parameters_uniformly,
+    set_lower_bounds,
+    set_upper_bounds,
 )
 from pharmpy.tools import read_modelfit_results
 
@@ -64,6 +67,66 @@ def test_sample_parameter_from_covariance_matrix(load_model_for_test, testdata):
         )
 
 
+@pytest.mark.parametrize('method', ['auto', 'rejection', 'gibbs'])
+def test_sample_parameters_from_covariance_matrix_tight_bounds(
+    load_model_for_test, testdata, method
+):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+    res = read_modelfit_results(testdata / 'nonmem' / 'pheno_real.mod')
+    pe = res.parameter_estimates
+    cm = res.covariance_matrix
+    # NOTE Only about 2% of the untruncated samples are within the bounds
+    se = np.sqrt(cm.loc['PTVCL', 'PTVCL'])
+    lower = pe['PTVCL'] + 2 * se
+    model = set_lower_bounds(model, {'PTVCL': lower})
+    model = set_upper_bounds(model, {'PTVCL': lower + se})
+    samples = sample_parameters_from_covariance_matrix(
+        model, pe, cm, n=200, rng=create_rng(23), method=method
+    )
+    assert len(samples) == 200
+    assert (samples['PTVCL'] > lower).all()
+    assert (samples['PTVCL'] < lower + se).all()
+    assert samples['PTVCL'].mean() == pytest.approx(pe['PTVCL'] + 2.316 * se, abs=0.05 * se)
+
+
+@pytest.mark.parametrize('method', ['auto', 'rejection'])
+def test_sample_truncated_joint_normal_rejection(method):
+    sigma = np.array([[1.0, 0.5], [0.5, 2.0]])
+    mu = np.array([0.0, 1.0])
+    a = np.array([-1.0, -np.inf])
+    b = np.array([np.inf, 3.0])
+    samples = parameter_sampling._sample_truncated_joint_normal(
+        sigma, mu, a, b, 4, create_rng(42), method=method
+    )
+    # NOTE Same samples as drawn by rejection sampling with multivariate_normal
+    correct = np.array(
+        [
+            [-0.6823179059679519, 1.7726219956159874],
+            [1.2004210980718155, 1.7095233938671255],
+            [-0.18748075789072013, 1.2832293079010064],
+            [-0.7113207775388463, 1.2676218123514296],
+        ]
+    )
+    np.testing.assert_allclose(samples, correct, rtol=1e-12)
+
+
+def test_sample_truncated_joint_normal_no_early_fallback(monkeypatch):
+    def gibbs(*args):
+        raise AssertionError('Unexpected fallback to gibbs sampling')
+
+    monkeypatch.setattr(parameter_sampling, '_sample_truncated_joint_normal_gibbs', gibbs)
+    sigma = np.eye(2)
+    mu = np.zeros(2)
+    # NOTE About 20% of the samples are within the bounds
+    a = np.array([-np.inf, 0.84])
+    b = np.array([np.inf, np.inf])
+    for seed in range(20):
+        samples = parameter_sampling._sample_truncated_joint_normal(
+            sigma, mu, a, b, 2, create_rng(seed)
+        )
+        assert (samples[:, 1] > 0.84).all()
+
+
 def test_sample_individual_estimates(load_model_for_test, testdata):
     model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
     res = read_modelfit_results(testdata / 'nonmem' / 'pheno_real.mod')
@@ -56,9 +56,9 @@ def test_calculate_individual_parameter_statistics(load_model_for_test, testdata
         rng=rng,
     )
 
-    assert stats['mean'][0] == pytest.approx(0.004700589484324183)
-    assert stats['variance'][0] == pytest.approx(8.086653508585209e-06)
-    assert stats['stderr'][0] == pytest.approx(0.0035089729730046304, abs=1e-6)
+    assert stats['mean'][0] == pytest.approx(0.004700589484324183, rel=0.01)
+    assert stats['variance'][0] == pytest.approx(8.086653508585209e-06, rel=0.01)
+    assert stats['stderr'][0] == pytest.approx(0.0035089729730046304, rel=0.2)
 
     model = load_model_for_test(testdata / 'nonmem' / 'secondary_parameters' / 'run1.mod')
     res = read_modelfit_results(testdata / 'nonmem' / 'secondary_parameters' / 'run1.mod')
@@ -72,7 +72,7 @@ def test_calculate_individual_parameter_statistics(load_model_for_test, testdata
     )
     assert stats['mean'][0] == pytest.approx(0.0049100899539843)
     assert stats['variance'][0] == pytest.approx(7.391076132098555e-07)
-    assert stats['stderr'][0] == pytest.approx(0.0009425952783595735, abs=1e-6)
+    assert stats['stderr'][0] == pytest.approx(0.0009425952783595735, rel=0.2)
 
     covmodel = load_model_for_test(testdata / 'nonmem' / 'secondary_parameters' / 'run2.mod')
     res = read_modelfit_results(testdata / 'nonmem' / 'secondary_parameters' / 'run2.mod')
@@ -86,13 +86,35 @@ def test_calculate_individual_parameter_statistics(load_model_for_test, testdata
     )
     assert stats['mean']['K', 'median'] == pytest.approx(0.004526899290470633)
     assert stats['variance']['K', 'median'] == pytest.approx(2.95125370813005e-06)
-    assert stats['stderr']['K', 'median'] == pytest.approx(0.0018170955599868073, abs=1e-6)
+    assert stats['stderr']['K', 'median'] == pytest.approx(0.0018170955599868073, rel=0.2)
     assert stats['mean']['K', 'p5'] == pytest.approx(0.0033049497924269385)
     assert stats['variance']['K', 'p5'] == pytest.approx(1.5730213328583985e-06)
-    assert stats['stderr']['K', 'p5'] == pytest.approx(0.0013102577338191103, abs=1e-6)
+    assert stats['stderr']['K', 'p5'] == pytest.approx(0.0013102577338191103, rel=0.2)
     assert stats['mean']['K', 'p95'] == pytest.approx(0.014616277746303079)
     assert stats['variance']['K', 'p95'] == pytest.approx(3.0766525541426746e-05)
-    assert stats['stderr']['K', 'p95'] == pytest.approx(0.006735905156223314, abs=1e-6)
+    assert stats['stderr']['K', 'p95'] == pytest.approx(0.006735905156223314, rel=0.2)
+
+
+def test_calculate_individual_parameter_statistics_tolerance(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'secondary_parameters' / 'pheno.mod')
+    res = read_modelfit_results(testdata / 'nonmem' / 'secondary_parameters' / 'pheno.mod')
+    stats = calculate_individual_parameter_statistics(
+        model, 'CL/V', res.parameter_estimates, rng=np.random.default_rng(103), nsamples=250001
+    )
+    assert stats['mean'][0] == pytest.approx(0.0047, rel=0.01)
+    assert np.isnan(stats['stderr'][0])
+
+    stats2 = calculate_individual_parameter_statistics(
+        model,
+        'CL/V',
+        res.parameter_estimates,
+        rng=np.random.default_rng(103),
+        nsamples=250001,
+        tolerance=0.01,
+    )
+    # NOTE Sampling stops after the first chunk
+    assert stats2['mean'][0] != stats['mean'][0]
+    assert stats2['mean'][0] == pytest.approx(0.0047, rel=0.03)
 
 
 def test_calculate_pk_parameters_statistics(load_model_for_test, testdata):
@@ -105,12 +127,14 @@ def test_calculate_pk_parameters_statistics(load_model_for_test, testdata):
         res.covariance_matrix,
         rng=rng,
     )
-    assert df['mean'].loc['t_max', 'median'] == pytest.approx(1.5999856886869577)
-    assert df['variance'].loc['t_max', 'median'] == pytest.approx(0.29728565293669557)
-    assert df['stderr'].loc['t_max', 'median'] == pytest.approx(0.589128711884761)
-    assert df['mean'].loc['C_max_dose', 'median'] == pytest.approx(0.6305869738624813)
-    assert df['variance'].loc['C_max_dose', 'median'] == pytest.approx(0.012200490462185057)
-    assert df['stderr'].loc['C_max_dose', 'median'] == pytest.approx(0.11128015565024524)
+    assert df['mean'].loc['t_max', 'median'] == pytest.approx(1.5999856886869577, rel=0.01)
+    assert df['variance'].loc['t_max', 'median'] == pytest.approx(0.29728565293669557, rel=0.01)
+    assert df['stderr'].loc['t_max', 'median'] == pytest.approx(0.589128711884761, rel=0.2)
+    assert df['mean'].loc['C_max_dose', 'median'] == pytest.approx(0.6305869738624813, rel=0.01)
+    assert df['variance'].loc['C_max_dose', 'median'] == pytest.approx(
+        0.012200490462185057, rel=0.01
+    )
+    assert df['stderr'].loc['C_max_dose', 'median'] == pytest.approx(0.11128015565024524, rel=0.2)
 
 
 def test_calc_pk_two_comp_bolus(load_model_for_test, testdata):
@@ -1,12 +1,13 @@
 import re
 import shutil
+from dataclasses import replace
 
 import pandas as pd
 import pytest
 
 from pharmpy.deps import numpy as np
 from pharmpy.internals.fs.cwd import chdir
-from pharmpy.results import read_results
+from pharmpy.results import ResultsStore, read_results
 from pharmpy.tools import read_modelfit_results
 from pharmpy.tools.external.nonmem.results import simfit_results
 
@@ -276,3 +277,28 @@ def test_serialization(testdata):
 
     assert res.parameter_estimates.equals(res_decode.parameter_estimates)
     assert res.log.to_dataframe().equals(res_decode.log.to_dataframe())
+
+
+def test_results_store(testdata, tmp_path):
+    res = read_modelfit_results(testdata / 'nonmem' / 'pheno_real.mod')
+    res.to_store(tmp_path / 'results')
+    res_decode = read_results(tmp_path / 'results')
+
+    for key, value in vars(res).items():
+        decoded = getattr(res_decode, key)
+        if key == 'individual_estimates_covariance':
+            assert value.index.equals(decoded.index)
+            assert all(a.equals(b) for a, b in zip(value, decoded))
+        elif isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(value, decoded, check_exact=True)
+        elif isinstance(value, pd.Series):
+            pd.testing.assert_series_equal(value, decoded, check_exact=True)
+    assert res.ofv == res_decode.ofv
+    assert res.log.to_dataframe().equals(res_decode.log.to_dataframe())
+
+    store = ResultsStore(tmp_path / 'results')
+    assert store['ofv'] == res.ofv
+    pd.testing.assert_series_equal(store['parameter_estimates'], res.parameter_estimates)
+
+    replace(res, ofv=1.0).to_store(tmp_path / 'results')
+    assert read_results(tmp_path / 'results').ofv == 1.0
@@ -0,0 +1,32 @@
+from pharmpy.tools.external.nonmem.monitor import RunMonitor
+
+
+def test_run_monitor(tmp_path, pheno_ext, pheno_lst):
+    lines = pheno_ext.read_text().splitlines(keepends=True)
+    ext = tmp_path / 'run1.ext'
+    events = []
+    monitor = RunMonitor(tmp_path / 'run1.mod', callback=events.append)
+    assert monitor.poll() == []
+
+    # NOTE The last line is incomplete
+    ext.write_text(''.join(lines[:5]) + lines[5][:20])
+    progress = monitor.poll()
+    assert [event.iteration for event in progress] == [0, 1, 2]
+    assert progress[0].model == 'run1'
+    assert progress[0].table == 1
+    assert progress[0].method == 'First Order Conditional Estimation with Interaction'
+    assert progress[0].ofv == 587.36644134661617
+    assert not monitor.stalled(60)
+
+    with open(ext, 'a') as f:
+        f.write(lines[5][20:] + ''.join(lines[6:]))
+    progress = monitor.poll()
+    assert [event.iteration for event in progress] == list(range(3, 13))
+    assert len(monitor.ofv) == 13
+    assert events[-1].iteration == 12
+
+    (tmp_path / 'results.lst').write_text(pheno_lst.read_text())
+    messages = [event.message for event in monitor.poll()]
+    assert '#TERM:' in messages
+    assert '0MINIMIZATION SUCCESSFUL' in messages
+    assert monitor.poll() == []
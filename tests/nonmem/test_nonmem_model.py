@@ -10,6 +10,7 @@ from pharmpy.model import (
     Assignment,
     EstimationStep,
     EstimationSteps,
+    Infusion,
     Model,
     ModelSyntaxError,
     NormalDistribution,
@@ -27,6 +28,7 @@ from pharmpy.modeling import (
     create_basic_pk_model,
     create_joint_distribution,
     read_model,
+    read_model_from_string,
     remove_iiv,
     set_direct_effect,
     set_estimation_step,
@@ -72,6 +74,45 @@ def test_parse_nonmem_model(testdata):
     assert model.observation_transformation == {S('Y_1'): S('Y_1'), S('Y_2'): S('Y_2')}
 
 
+def test_lazy_dataset(testdata):
+    model = read_model(testdata / 'nonmem/modeling/pheno_advan1_zero_order.mod')
+    assert not model._dataset.is_loaded
+    dose = model.statements.ode_system.dosing_compartment[0].dose
+    assert dose == Infusion(S('AMT'), duration=S('D1'))
+    model = set_initial_estimates(model, {'PTVCL': 0.01})
+    assert not model._dataset.is_loaded
+    assert len(model.dataset) == 744
+    assert model._dataset.is_loaded
+
+
+def test_lazy_dataset_path(tmp_path, testdata):
+    shutil.copy2(testdata / 'nonmem' / 'pheno.mod', tmp_path / 'pheno.mod')
+    shutil.copy2(testdata / 'nonmem' / 'pheno.dta', tmp_path / 'pheno.dta')
+    code = (tmp_path / 'pheno.mod').read_text()
+    with chdir(tmp_path):
+        model = read_model_from_string(code)
+        other = read_model_from_string(code)
+    with chdir(testdata):
+        assert len(model.dataset) == 744
+
+    (tmp_path / 'pheno.dta').unlink()
+    with pytest.warns(UserWarning, match='existed when the model was parsed'):
+        assert other.dataset is None
+
+    model = read_model(tmp_path / 'pheno.mod')
+    assert model.dataset is None
+
+
+def test_update_source_unchanged_records(pheno):
+    cs = pheno.internals.control_stream
+    model = set_initial_estimates(pheno, {'PTVCL': 0.01})
+    new_cs = model.internals.control_stream
+    assert new_cs.get_records('THETA')[0] is not cs.get_records('THETA')[0]
+    for rec in ('PK', 'ERROR', 'OMEGA', 'SIGMA'):
+        assert all(a is b for a, b in zip(new_cs.get_records(rec), cs.get_records(rec)))
+    assert model.update_source().internals.control_stream is new_cs
+
+
 def test_update_inits(load_model_for_test, pheno_path):
     from pharmpy.modeling import update_inits
 
@@ -106,3 +106,57 @@ def test_nonmemtablefile_notitle_github_issues_1251(tmp_path):
 
         assert tuple(df.columns) == ('ID', 'TIME', 'CWRES', 'CIPREDI', 'VC')
         assert len(df) == 2
+
+
+def test_nonmemtablefile_read_columns(tmp_path):
+    filename = 'sdtab'
+    with chdir(tmp_path):
+        with open(filename, 'w') as fd:
+            fd.write(
+                'TABLE NO.     1\n'
+                ' ID          TIME        PRED        RES\n'
+                '  1.0000E+00  0.0000E+00  1.0000E+00  2.0000E+00\n'
+                ' ID          TIME        PRED        RES\n'
+                '  2.0000E+00  1.0000E+00  3.0000E+00  4.0000E+00\n'
+                'TABLE NO.     2\n'
+                ' ID          TIME        PRED        RES\n'
+                '  3.0000E+00  2.0000E+00  5.0000E+00  6.0000E+00\n'
+            )
+
+        table_file = NONMEMTableFile(filename)
+        assert len(table_file) == 2
+        assert table_file[0].number == 1
+        assert table_file[1].number == 2
+
+        df = table_file[0].read_columns(['PRED', 'RES'])
+        assert tuple(df.columns) == ('PRED', 'RES')
+        assert list(df['PRED']) == [1.0, 3.0]
+        df = table_file[1].read_columns([0, 3])
+        assert tuple(df.columns) == ('ID', 'RES')
+        assert list(df['RES']) == [6.0]
+
+        df = table_file[0].data_frame
+        assert tuple(df.columns) == ('ID', 'TIME', 'PRED', 'RES')
+        assert len(df) == 2
+        df = table_file[0].read_columns([1])
+        assert list(df['TIME']) == [0.0, 1.0]
+
+
+def test_nonmemtablefile_removed_file(tmp_path, pheno_ext):
+    path = tmp_path / 'run1.ext'
+    path.write_bytes(pheno_ext.read_bytes())
+    table_file = NONMEMTableFile(path)
+    path.unlink()
+
+    table = table_file.table
+    assert table.final_ofv == pytest.approx(586.27605628188053)
+
+
+def test_nonmemtablefile_rewritten_file(tmp_path, pheno_ext):
+    path = tmp_path / 'run1.ext'
+    path.write_bytes(pheno_ext.read_bytes())
+    table_file = NONMEMTableFile(path)
+    path.write_bytes(b'')
+
+    table = table_file.table
+    assert table.final_ofv == pytest.approx(586.27605628188053)
@@ -151,3 +151,26 @@ def test_nonmem_dataset_with_ignore_accept():
     assert len(df) == 2
     assert list(df.iloc[0]) == [1, 2]
     assert list(df.iloc[1]) == [1, 3]
+
+
+def test_read_nonmem_dataset_fast_path():
+    colnames = ['ID', 'TIME', 'AMT', 'DV']
+    contents = "1,0,100,0\n1 , 1.5,.,2.5D1\n  1\t2\t,1+2\n2 3   0   -99   \n2,4,,+\n"
+    df = read_nonmem_dataset(StringIO(contents), colnames=colnames)
+    assert list(df['ID']) == [1, 1, 1, 2, 2]
+    assert list(df['TIME']) == [0.0, 1.5, 2.0, 3.0, 4.0]
+    assert list(df['AMT']) == [100.0, 0.0, 0.0, 0.0, 0.0]
+    assert list(df['DV'][:3]) == [0.0, 25.0, 100.0]
+    assert pd.isna(df['DV'][3])
+    assert df['DV'][4] == 0.0
+
+    raw = read_nonmem_dataset(StringIO(contents), colnames=colnames, raw=True)
+    assert list(raw.iloc[2]) == ['1', '2', '', '1+2']
+
+    with pytest.raises(DatasetError):
+        read_nonmem_dataset(StringIO("1,2\n1,a"), colnames=['ID', 'DV'])
+    with pytest.raises(DatasetError):
+        read_nonmem_dataset(StringIO("1,2\n1,1234567890123456789012345"), colnames=['ID', 'DV'])
+
+    df = read_nonmem_dataset(StringIO("1,2,3\n1,3"), colnames=['ID', 'DV', 'X'])
+    assert list(df['X']) == [3.0, 0.0]
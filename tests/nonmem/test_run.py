@@ -0,0 +1,118 @@
+import json
+import os
+import time
+
+import pytest
+
+from pharmpy.internals.fs.cwd import chdir
+from pharmpy.tools.external.nonmem import run
+from pharmpy.tools.external.nonmem.monitor import RunMonitor
+from pharmpy.workflows import LocalDirectoryToolDatabase
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason='Stub nmfe is a shell script')
+
+
+def _stub_nmfe(path, script):
+    stub = path / 'nmfe75'
+    stub.write_text('#!/bin/sh\n' + script)
+    stub.chmod(0o755)
+    return str(stub)
+
+
+async def test_run_nmfe(tmp_path):
+    stub = _stub_nmfe(tmp_path, 'echo "$@"\nexit 3\n')
+    returncode = await run.run_nmfe(
+        [stub, 'run1.mod', 'results.lst'], tmp_path, tmp_path / 'stdout', tmp_path / 'stderr'
+    )
+    assert returncode == 3
+    assert (tmp_path / 'stdout').read_text() == 'run1.mod results.lst\n'
+
+
+async def test_run_nmfe_timeout(tmp_path):
+    stub = _stub_nmfe(tmp_path, 'sleep 30\n')
+    start = time.time()
+    with pytest.warns(UserWarning, match='timeout'):
+        returncode = await run.run_nmfe(
+            [stub], tmp_path, tmp_path / 'stdout', tmp_path / 'stderr', timeout=0.5
+        )
+    assert returncode < 0
+    assert time.time() - start < 10
+
+
+def test_execute_models(tmp_path, monkeypatch, load_model_for_test, testdata):
+    datadir = testdata / 'nonmem'
+    running = tmp_path / 'running'
+    running.mkdir()
+    # NOTE The stub records the number of concurrent runs
+    script = (
+        f'touch {running}/$$\n'
+        f'ls {running} | wc -l >> {tmp_path / "concurrency"}\n'
+        'sleep 0.5\n'
+        f'cp {datadir / "pheno_real.lst"} results.lst\n'
+        'for suffix in ext phi cov cor coi; do\n'
+        f'  cp {datadir / "pheno_real"}.$suffix "${{1%.*}}.$suffix"\n'
+        'done\n'
+        f'rm {running}/$$\n'
+    )
+    stub = _stub_nmfe(tmp_path, script)
+    monkeypatch.setattr(run, 'nmfe_path', lambda: stub)
+
+    model = load_model_for_test(datadir / 'pheno_real.mod')
+    models = [model.replace(name=f'run{i}') for i in range(4)]
+
+    with chdir(tmp_path):
+        db = LocalDirectoryToolDatabase('modelfit')
+        completed = []
+        fitted = run.execute_models(models, db, max_concurrency=2, callback=completed.append)
+
+    assert [m.name for m in fitted] == ['run0', 'run1', 'run2', 'run3']
+    assert sorted(m.name for m in completed) == ['run0', 'run1', 'run2', 'run3']
+    assert all(m.modelfit_results.ofv == pytest.approx(586.27605628188053) for m in fitted)
+    concurrency = [int(n) for n in (tmp_path / 'concurrency').read_text().split()]
+    assert max(concurrency) <= 2
+
+
+async def test_run_nmfe_stalled(tmp_path, pheno_ext):
+    lines = pheno_ext.read_text().splitlines(keepends=True)
+    (tmp_path / 'ext').write_text(''.join(lines[:3]))
+    stub = _stub_nmfe(tmp_path, 'cp ext run1.ext\nsleep 30\n')
+    monitor = RunMonitor(tmp_path / 'run1.mod')
+    start = time.time()
+    with pytest.warns(UserWarning, match='no new iteration'):
+        returncode = await run.run_nmfe(
+            [stub],
+            tmp_path,
+            tmp_path / 'stdout',
+            tmp_path / 'stderr',
+            monitor=monitor,
+            stall_timeout=0.5,
+            poll_interval=0.1,
+        )
+    assert returncode < 0
+    assert monitor.ofv == [587.36644134661617]
+    assert time.time() - start < 10
+
+
+def test_execute_models_killed(tmp_path, monkeypatch, load_model_for_test, testdata):
+    datadir = testdata / 'nonmem'
+    script = (
+        f'cp {datadir / "pheno_real.lst"} results.lst\n'
+        'for suffix in ext phi; do\n'
+        f'  cp {datadir / "pheno_real"}.$suffix "${{1%.*}}.$suffix"\n'
+        'done\n'
+        'sleep 30\n'
+    )
+    stub = _stub_nmfe(tmp_path, script)
+    monkeypatch.setattr(run, 'nmfe_path', lambda: stub)
+
+    model = load_model_for_test(datadir / 'pheno_real.mod').replace(name='run1')
+
+    with chdir(tmp_path):
+        db = LocalDirectoryToolDatabase('modelfit')
+        with pytest.warns(UserWarning, match='timeout'):
+            (fitted,) = run.execute_models([model], db, timeout=1)
+
+        messages = [entry.message for entry in fitted.modelfit_results.log.log]
+        assert 'NONMEM run was killed: timeout of 1s' in messages
+        with open(db.model_database.retrieve_file('run1', 'nonmem.json')) as f:
+            assert json.load(f)['commands'][0]['killed'] == 'timeout of 1s'
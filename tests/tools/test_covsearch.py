@@ -1,7 +1,28 @@
+import re
+import warnings
+from dataclasses import astuple
+
 import pytest
 
-from pharmpy.tools.covsearch.tool import create_workflow, validate_input
-from pharmpy.workflows import Workflow
+from pharmpy.internals.fs.cwd import chdir
+from pharmpy.results import ModelfitResults
+from pharmpy.tools.covsearch.tool import (
+    AddEffect,
+    Candidate,
+    ForwardStep,
+    _added_effects,
+    _candidate_name,
+    _greedy_search,
+    _init_search_state,
+    _streaming_greedy_search,
+    create_workflow,
+    init,
+    task_greedy_forward_search,
+    validate_input,
+)
+from pharmpy.tools.modelfit import conf as modelfit_conf
+from pharmpy.tools.modelfit import tool as modelfit_tool
+from pharmpy.workflows import Task, Workflow, WorkflowBuilder, execute_workflow
 
 MINIMAL_INVALID_MFL_STRING = ''
 MINIMAL_VALID_MFL_STRING = 'LET(x, 0)'
@@ -142,3 +163,131 @@ def test_validate_input_raises(
 
     with pytest.raises(exception, match=match):
         validate_input(**kwargs)
+
+
+class _FakeStream:
+    def __init__(self, base_model, ofv, lifo=True):
+        self.base_model = base_model
+        self.ofv = ofv
+        self.lifo = lifo
+        self.pending = []
+        self.cancelled = set()
+        self.rejected = set()
+
+    def submit(self, parent, effect, effect_index):
+        key = _candidate_name(effect_index)
+        effects = {astuple(e) for e in _added_effects(parent.steps)} | {effect}
+        model = self.base_model.replace(
+            name=key, modelfit_results=ModelfitResults(ofv=self.ofv(effects))
+        )
+        self.pending.append((key, model))
+        return key
+
+    def cancel(self, keys):
+        self.cancelled.update(keys)
+        self.pending = [(key, model) for key, model in self.pending if key not in keys]
+
+    def reject(self, models):
+        self.rejected.update(model.name for model in models)
+
+    def __iter__(self):
+        # NOTE The last or the first submitted fit is always the first to complete
+        while self.pending:
+            yield self.pending.pop() if self.lifo else self.pending.pop(0)
+
+
+@pytest.mark.parametrize('lifo, kept', [(True, False), (False, True)])
+def test_streaming_greedy_search(load_model_for_test, testdata, lifo, kept):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno.mod')
+    model = model.replace(modelfit_results=ModelfitResults(ofv=100.0))
+    effects = [
+        ('CL', 'AGE', 'exp', '*'),
+        ('CL', 'WT', 'exp', '*'),
+        ('V', 'AGE', 'exp', '*'),
+        ('V', 'WT', 'exp', '*'),
+    ]
+    gains = {effects[0]: 6.0, effects[1]: 5.0, effects[2]: 4.0, effects[3]: 0.5}
+
+    def ofv(added):
+        return 100.0 - sum(gains[effect] for effect in added)
+
+    def handle_effects(step, parent, candidate_effects, index_offset):
+        stream = _FakeStream(model, ofv)
+        for i, effect in enumerate(candidate_effects, 1):
+            stream.submit(parent, effect, index_offset + i)
+        return [
+            Candidate(m, parent.steps + (ForwardStep(0.05, AddEffect(*effect)),))
+            for (_, m), effect in zip(stream.pending, candidate_effects)
+        ]
+
+    state = _init_search_state(model)
+    expected = _greedy_search(state, handle_effects, effects, 0.05, -1)
+
+    stream = _FakeStream(model, ofv, lifo)
+    res = _streaming_greedy_search(
+        state, stream.submit, stream.cancel, stream.reject, stream, effects, 0.05, -1
+    )
+
+    assert res.best_candidate_so_far.steps == expected.best_candidate_so_far.steps
+    assert len(res.best_candidate_so_far.steps) == 4
+    assert [c.steps for c in res.all_candidates_so_far] == [
+        c.steps for c in expected.all_candidates_so_far
+    ]
+    assert [c.model.modelfit_results.ofv for c in res.all_candidates_so_far[1:]] == [
+        c.model.modelfit_results.ofv for c in expected.all_candidates_so_far[1:]
+    ]
+    names = [c.model.name for c in res.all_candidates_so_far]
+    assert len(set(names)) == len(names)
+    assert not set(names) & (stream.cancelled | stream.rejected)
+    assert stream.rejected <= stream.cancelled
+    if kept:
+        assert names == [c.model.name for c in expected.all_candidates_so_far]
+        assert not stream.cancelled
+    else:
+        assert stream.cancelled and stream.rejected
+
+
+@pytest.mark.xdist_group(name="workflow")
+def test_forward_search_speculative(tmp_path, monkeypatch, load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno.mod')
+    model = model.replace(modelfit_results=ModelfitResults(ofv=100.0))
+    gains = {'CL-WGT': 6.0, 'V-WGT': 5.0, 'V-APGR': 4.0, 'CL-APGR': 0.5}
+
+    def execute_model(model, context):
+        effects = re.findall(r'\((\w+-\w+)-exp\)', model.description)
+        ofv = 100.0 - sum(gains[effect] for effect in effects)
+        return model.replace(modelfit_results=ModelfitResults(ofv=ofv))
+
+    # NOTE The fits are replaced but the workflows run on the real dask dispatcher
+    monkeypatch.setattr(modelfit_conf, 'default_tool', 'nlmixr')
+    monkeypatch.setattr(modelfit_tool, 'get_execute_model', lambda tool: execute_model)
+
+    def forward_search(schedule):
+        wb = WorkflowBuilder(name='covsearch')
+        init_task = init(model)
+        wb.add_task(init_task)
+        effects = 'COVARIATE([CL, V], [WGT, APGR], exp)'
+        task = Task('results', task_greedy_forward_search, effects, 0.05, -1, schedule)
+        wb.add_task(task, predecessors=init_task)
+        with warnings.catch_warnings():
+            warnings.filterwarnings(
+                "ignore",
+                message=".*creating scratch directories is taking a surprisingly long time",
+                category=UserWarning,
+            )
+            return execute_workflow(Workflow(wb))
+
+    with chdir(tmp_path):
+        expected = forward_search('step')
+        res = forward_search('speculative')
+
+    assert res.best_candidate_so_far.steps == expected.best_candidate_so_far.steps
+    assert len(res.best_candidate_so_far.steps) == 3
+    assert [c.steps for c in res.all_candidates_so_far] == [
+        c.steps for c in expected.all_candidates_so_far
+    ]
+    names = [c.model.name for c in res.all_candidates_so_far]
+    assert len(set(names)) == len(names)
+    assert [c.model.modelfit_results.ofv for c in res.all_candidates_so_far] == [
+        c.model.modelfit_results.ofv for c in expected.all_candidates_so_far
+    ]
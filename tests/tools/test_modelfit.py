@@ -0,0 +1,147 @@
+import os
+import time
+
+import numpy as np
+import pytest
+import sympy
+
+from pharmpy.internals.fs.cwd import chdir
+from pharmpy.modeling import set_estimation_step, set_initial_estimates, set_name
+from pharmpy.tools import read_modelfit_results
+from pharmpy.tools.external.nonmem import run
+from pharmpy.tools.modelfit import FitCache, conf, create_fit_workflow, hash_model
+from pharmpy.tools.modelfit.tool import (
+    retrieve_from_database_or_execute_model_with_tool,
+    retrieve_from_database_or_execute_models_with_tool,
+)
+from pharmpy.workflows import LocalDirectoryToolDatabase
+
+
+def test_hash_model(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno.mod')
+    h = hash_model(model, 'nonmem')
+    assert h == hash_model(set_name(model, 'other'), 'nonmem')
+    assert h != hash_model(model, 'nlmixr')
+    assert h != hash_model(set_initial_estimates(model, {'TVCL': 0.01}), 'nonmem')
+    df = model.dataset.copy()
+    df.loc[0, 'WGT'] = 10.0
+    assert h != hash_model(model.replace(dataset=df), 'nonmem')
+
+
+def test_hash_model_tool_options(load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno.mod')
+
+    def with_option(value):
+        return set_estimation_step(model, 'FOCE', tool_options={'x': value})
+
+    # NOTE The string representations of these values are equal
+    h = hash_model(with_option(np.float64(0.1)), 'nonmem')
+    assert h == hash_model(with_option(np.float64(0.1)), 'nonmem')
+    assert h != hash_model(with_option(np.float32(0.1)), 'nonmem')
+    assert hash_model(with_option(sympy.Symbol('CL')), 'nonmem') != hash_model(
+        with_option('CL'), 'nonmem'
+    )
+
+    with pytest.raises(TypeError):
+        hash_model(with_option(object()), 'nonmem')
+
+
+def test_fit_cache(tmp_path, load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno.mod')
+    res = read_modelfit_results(testdata / 'nonmem' / 'pheno.mod')
+    cache = FitCache(tmp_path / 'cache')
+
+    assert cache.retrieve(model, 'nonmem') is None
+    cache.store(model.replace(modelfit_results=res), 'nonmem')
+    other = set_name(model, 'other')
+    cached = cache.retrieve(other, 'nonmem')
+    assert cached.name == 'other'
+    assert cached.ofv == res.ofv
+    assert cached.parameter_estimates.equals(res.parameter_estimates)
+    assert cache.retrieve(other, 'nlmixr') is None
+
+
+def test_fit_cache_evict(tmp_path, load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno.mod')
+    res = read_modelfit_results(testdata / 'nonmem' / 'pheno.mod')
+    model = model.replace(modelfit_results=res)
+    other = set_initial_estimates(model, {'TVCL': 0.01})
+
+    cache = FitCache(tmp_path / 'cache', max_age=3600)
+    cache.store(model)
+    (path,) = (tmp_path / 'cache').glob('*/*.pickle')
+    old = time.time() - 7200
+    os.utime(path, (old, old))
+    cache.store(other)
+    assert cache.retrieve(model) is None
+    assert cache.retrieve(other) is not None
+
+    cache = FitCache(tmp_path / 'cache', max_size=1)
+    cache.store(model)
+    assert not list((tmp_path / 'cache').glob('*/*.pickle'))
+
+
+def test_fit_cache_hit_is_stored(tmp_path, monkeypatch, load_model_for_test, testdata):
+    model = load_model_for_test(testdata / 'nonmem' / 'pheno.mod')
+    res = read_modelfit_results(testdata / 'nonmem' / 'pheno.mod')
+    FitCache(tmp_path / 'cache').store(model.replace(modelfit_results=res), 'nonmem')
+    monkeypatch.setattr(conf, 'fit_cache', str(tmp_path / 'cache'))
+    monkeypatch.setattr(conf, 'default_tool', 'nonmem')
+
+    with chdir(tmp_path):
+        context = LocalDirectoryToolDatabase('modelfit')
+        # NOTE The implicit default tool hits the entry stored for the explicit tool
+        task = retrieve_from_database_or_execute_model_with_tool(None)
+        fitted = task(context, set_name(model, 'other'))
+        assert fitted.modelfit_results.ofv == res.ofv
+
+        db_model = context.model_database.retrieve_model('other')
+        assert db_model.name == 'other'
+        db_results = context.model_database.retrieve_modelfit_results('other')
+        assert db_results.ofv == res.ofv
+
+
+def test_create_fit_workflow_batch():
+    wf = create_fit_workflow(n=3, tool='nonmem')
+    assert [task.name for task in wf.input_tasks] == ['run0', 'run1', 'run2']
+
+    wf = create_fit_workflow(n=3, tool='nonmem', batch=True)
+    assert [task.name for task in wf.input_tasks] == ['fit']
+    assert [task.name for task in wf.output_tasks] == ['run0', 'run1', 'run2']
+
+    wf = create_fit_workflow(n=3, tool='nlmixr', batch=True)
+    assert [task.name for task in wf.input_tasks] == ['run0', 'run1', 'run2']
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='Stub nmfe is a shell script')
+def test_fit_batch(tmp_path, monkeypatch, load_model_for_test, testdata):
+    datadir = testdata / 'nonmem'
+    script = (
+        f'cp {datadir / "pheno_real.lst"} results.lst\n'
+        'for suffix in ext phi cov cor coi; do\n'
+        f'  cp {datadir / "pheno_real"}.$suffix "${{1%.*}}.$suffix"\n'
+        'done\n'
+    )
+    stub = tmp_path / 'nmfe75'
+    stub.write_text('#!/bin/sh\n' + script)
+    stub.chmod(0o755)
+    monkeypatch.setattr(run, 'nmfe_path', lambda: str(stub))
+
+    model = load_model_for_test(datadir / 'pheno_real.mod')
+    res = read_modelfit_results(datadir / 'pheno.mod')
+    models = [set_initial_estimates(model, {'PTVCL': 0.001 * i}) for i in range(1, 4)]
+    models = [set_name(m, f'run{i}') for i, m in enumerate(models)]
+    FitCache(tmp_path / 'cache').store(models[1].replace(modelfit_results=res), 'nonmem')
+    monkeypatch.setattr(conf, 'fit_cache', str(tmp_path / 'cache'))
+
+    with chdir(tmp_path):
+        context = LocalDirectoryToolDatabase('modelfit')
+        task = retrieve_from_database_or_execute_models_with_tool('nonmem')
+        fitted = task(context, *models)
+
+    assert [m.name for m in fitted] == ['run0', 'run1', 'run2']
+    # NOTE The cached results are not from pheno_real
+    assert fitted[1].modelfit_results.ofv == res.ofv
+    assert fitted[0].modelfit_results.ofv == pytest.approx(586.27605628188053)
+    assert fitted[2].modelfit_results.ofv == pytest.approx(586.27605628188053)
+    assert FitCache(tmp_path / 'cache').retrieve(models[0], 'nonmem') is not None
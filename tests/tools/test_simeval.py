@@ -1,7 +1,38 @@
-from pharmpy.tools.simeval.results import psn_simeval_results
+import numpy as np
+import pandas as pd
+import pytest
+
+from pharmpy.tools.simeval.results import SampledIndividualOFV, psn_simeval_results
 
 
 def test_psn_simeval_results(testdata):
     res = psn_simeval_results(testdata / 'psn' / 'simeval_dir1')
     assert len(res.sampled_iofv) == 59
     assert len(res.iofv_summary) == 59
+
+
+def test_sampled_individual_ofv():
+    rng = np.random.default_rng(7)
+    ids = pd.Index([1, 2, 3, 5], name='ID')
+    sims = [pd.Series(rng.uniform(0, 10, 4), index=ids) for _ in range(5)]
+    sims[2] = sims[2].drop(3)
+    original = pd.Series(rng.uniform(0, 10, 4), index=ids)
+
+    # NOTE Too few expected simulations to check that the array grows
+    sampled = SampledIndividualOFV(ids, 2)
+    for iofv in sims:
+        sampled.add(iofv)
+    sampled.add(None)
+    assert len(sampled) == 6
+
+    df = sampled.to_dataframe()
+    assert list(df.columns) == [1, 2, 3, 4, 5, 6]
+    assert np.isnan(df.loc[3, 3])
+    assert df[6].isna().all()
+
+    expected = pd.concat(sims, axis=1, keys=range(1, 6))
+    summary = sampled.summary(original)
+    assert summary['sampled_mean'].tolist() == pytest.approx(expected.T.mean().tolist())
+    assert summary['sampled_stdev'].tolist() == pytest.approx(expected.T.std().tolist())
+    residual_q1 = (original - expected.T.quantile(0.25)) / expected.T.std()
+    assert summary['residual_q1'].tolist() == pytest.approx(residual_q1.tolist())
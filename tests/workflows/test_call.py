@@ -1,3 +1,4 @@
+import os
 import warnings
 from uuid import uuid4
 
@@ -6,7 +7,15 @@ import pytest
 import pharmpy.workflows.dispatchers
 from pharmpy.config import ConfigurationContext
 from pharmpy.internals.fs.cwd import chdir
-from pharmpy.workflows import Task, Workflow, WorkflowBuilder, call_workflow, execute_workflow
+from pharmpy.workflows import (
+    Task,
+    Workflow,
+    WorkflowBuilder,
+    WorkflowStream,
+    call_workflow,
+    execute_workflow,
+    local_pool,
+)
 
 
 def ignore_scratch_warning():
@@ -70,3 +79,45 @@ def test_call_workflow_distributed(tmp_path):
                 res = execute_workflow(wf)
 
     assert res == a + b
+
+
+@pytest.mark.xdist_group(name="workflow")
+def test_call_workflow_local_pool(tmp_path):
+    a, b = 1, 2
+    wf = add(a, b)
+
+    with chdir(tmp_path):
+        res = execute_workflow(wf, dispatcher=local_pool)
+
+    assert res == a + b
+
+
+@pytest.mark.xdist_group(name="workflow")
+def test_local_pool_nested_workers(tmp_path):
+    wb = WorkflowBuilder(tasks=[Task('t1', local_pool.nested_workers)], name='nested')
+    wf = Workflow(wb)
+
+    with ConfigurationContext(pharmpy.workflows.dispatchers.conf, local_pool_workers=2):
+        with chdir(tmp_path):
+            res = execute_workflow(wf, dispatcher=local_pool)
+
+    assert res == max(1, (os.cpu_count() or 1) // 2)
+
+
+def stream_sum(context, a, b):
+    stream = WorkflowStream(context)
+    stream.submit(sub(a, b), 'first')
+    stream.submit(sub(b, b), 'second')
+    stream.cancel([stream.submit(sub(a, a), 'cancelled')])
+    return dict(iter(stream))
+
+
+@pytest.mark.xdist_group(name="workflow")
+def test_workflow_stream_local_pool(tmp_path):
+    wb = WorkflowBuilder(tasks=[Task('t1', stream_sum, 1, 2)], name='stream')
+    wf = Workflow(wb)
+
+    with chdir(tmp_path):
+        res = execute_workflow(wf, dispatcher=local_pool)
+
+    assert res == {'first': 3, 'second': 4}
@@ -16,6 +16,7 @@ from pharmpy.workflows import (
     WorkflowBuilder,
     execute_workflow,
     local_dask,
+    local_pool,
 )
 
 # All workflow tests are run by the same xdist test worker
@@ -222,3 +223,41 @@ def test_local_dispatcher():
     wf = Workflow(wb)
     res = local_dask.run(wf)
     assert res == 'input'
+
+
+@pytest.mark.xdist_group(name="workflow")
+def test_local_pool_dispatcher():
+    wb = WorkflowBuilder(tasks=[Task('results', lambda x: x, 'input')])
+    wf = Workflow(wb)
+    res = local_pool.run(wf)
+    assert res == 'input'
+
+
+@pytest.mark.xdist_group(name="workflow")
+def test_local_pool_dispatcher_map_reduce(tmp_path):
+    n = 10
+    wb = WorkflowBuilder(name='test-workflow')
+    tasks = [Task(f'x{i}', lambda x: x**2, i) for i in range(n)]
+    for task in tasks:
+        wb.add_task(task)
+    wb.add_task(Task('sum', lambda *xs: sum(xs)), predecessors=tasks)
+    wf = Workflow(wb)
+
+    with chdir(tmp_path):
+        res = execute_workflow(wf, dispatcher=local_pool)
+
+    assert res == sum(i**2 for i in range(n))
+
+
+@pytest.mark.xdist_group(name="workflow")
+def test_local_pool_dispatcher_error(tmp_path):
+    def fail(x):
+        raise ValueError(x)
+
+    wb = WorkflowBuilder(tasks=[Task('t1', lambda: 'message')], name='test-workflow')
+    wb.add_task(Task('results', fail), predecessors=wb.tasks)
+    wf = Workflow(wb)
+
+    with chdir(tmp_path):
+        with pytest.raises(ValueError, match='message'):
+            execute_workflow(wf, dispatcher=local_pool)
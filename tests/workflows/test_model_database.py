@@ -2,18 +2,21 @@ import json
 import os
 import os.path
 import shutil
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
 
 from pharmpy.internals.fs.cwd import chdir
 from pharmpy.modeling import add_time_after_dose
+from pharmpy.tools import read_modelfit_results
 from pharmpy.workflows import (
     LocalDirectoryDatabase,
     LocalModelDirectoryDatabase,
     ModelDatabase,
     NullModelDatabase,
 )
+from pharmpy.workflows.model_database import baseclass
 
 
 def test_base_class():
@@ -96,3 +99,107 @@ def test_store_model(tmp_path, load_model_for_test, testdata):
             assert line == "$PROBLEM PHENOBARB SIMPLE MODEL\n"
             line = fh.readline()
             assert line == f'$DATA ..{sep}.datasets{sep}run2.csv IGNORE=@\n'
+
+
+@pytest.mark.parametrize('verify_datasets', [False, True])
+def test_store_model_reuses_dataset(tmp_path, load_model_for_test, testdata, verify_datasets):
+    with chdir(tmp_path):
+        model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+        db = LocalModelDirectoryDatabase("database", verify_datasets=verify_datasets)
+        db.store_model(model)
+        db.store_model(model.replace(name="run1", dataset=model.dataset.copy()))
+
+        datasets = sorted(p.name for p in (Path("database") / ".datasets").glob('*.csv'))
+        assert datasets == ['pheno_real.csv']
+        with open("database/run1/run1.mod", "r") as fh:
+            fh.readline()
+            assert 'pheno_real.csv' in fh.readline()
+
+
+def test_store_models(tmp_path, load_model_for_test, testdata):
+    with chdir(tmp_path):
+        model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+        models = [model.replace(name=f'run{i}') for i in (3, 1, 2)]
+        db = LocalModelDirectoryDatabase("database")
+        db.store_models(models)
+
+        assert db.list_models() == ['run1', 'run2', 'run3']
+        datasets = sorted(p.name for p in (Path("database") / ".datasets").glob('*.csv'))
+        assert datasets == ['run3.csv']
+        assert not any(Path("database").glob('*/.pharmpy/PENDING'))
+
+        retrieved = db.retrieve_models(['run2', 'run3'])
+        assert [m.name for m in retrieved] == ['run2', 'run3']
+
+
+def test_snapshots_order(tmp_path, monkeypatch, load_model_for_test, testdata):
+    with chdir(tmp_path):
+        model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+        res = read_modelfit_results(testdata / 'nonmem' / 'pheno_real.mod')
+        model = model.replace(modelfit_results=res)
+        db = LocalModelDirectoryDatabase("database")
+        db.store_models([model.replace(name=f'run{i}') for i in range(1, 6)], modelfit_results=True)
+
+        entered = []
+        held = []
+        max_held = []
+        snapshot = db.snapshot
+
+        @contextmanager
+        def recording_snapshot(model_name):
+            entered.append(model_name)
+            held.append(model_name)
+            max_held.append(len(held))
+            with snapshot(model_name) as sn:
+                yield sn
+            held.remove(model_name)
+
+        monkeypatch.setattr(db, 'snapshot', recording_snapshot)
+
+        with db.snapshots(['run3', 'run1', 'run2']) as sns:
+            assert [sn.retrieve_model().name for sn in sns] == ['run3', 'run1', 'run2']
+        assert entered == ['run1', 'run2', 'run3']
+
+        monkeypatch.setattr(baseclass, 'SNAPSHOT_CHUNK_SIZE', 2)
+        names = ['run5', 'run2', 'run4', 'run1', 'run3']
+        assert [m.name for m in db.retrieve_models(names)] == names
+        assert max(max_held) == 3
+        max_held.clear()
+        assert len(db.retrieve_all_modelfit_results(names)) == 5
+        assert max(max_held) == 2
+
+
+def test_store_local_files_link(tmp_path, load_model_for_test, testdata):
+    with chdir(tmp_path):
+        model = load_model_for_test(testdata / 'nonmem' / 'pheno_real.mod')
+        db = LocalModelDirectoryDatabase("database")
+        with open("file.txt", "w") as fh:
+            print("Hello!", file=fh)
+
+        with db.transaction(model) as txn:
+            txn.store_local_files([Path("file.txt"), Path("missing.txt")], link=True)
+
+        path = Path("database") / "pheno_real" / "file.txt"
+        assert path.read_text() == "Hello!\n"
+        assert os.stat(path).st_ino == os.stat("file.txt").st_ino
+        assert not (Path("database") / "pheno_real" / "missing.txt").exists()
+
+
+def test_read_leaves_tree_unchanged(tmp_path, testdata):
+    path = tmp_path / 'models'
+    shutil.copytree(testdata / 'results' / 'tool_databases' / 'modelsearch' / 'models', path)
+
+    def tree():
+        return sorted(
+            (str(p.relative_to(path)), p.stat().st_size, p.stat().st_mtime_ns)
+            for p in path.rglob('*')
+        )
+
+    before = tree()
+    db = LocalModelDirectoryDatabase(path)
+    names = db.list_models()
+    assert len(db.retrieve_models(names)) == len(names)
+    runs = [name for name in names if name.startswith('modelsearch_run')]
+    assert len(db.retrieve_all_modelfit_results(runs)) == len(runs)
+    assert db.retrieve_file('modelsearch_run1', 'modelsearch_run1.lst').exists()
+    assert tree() == before